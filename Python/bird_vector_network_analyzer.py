@@ -32,77 +32,897 @@ SOFTWARE.
 @file bird_vector_network_analyzer.py
  
 """
-import pyvisa as visa
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from functools import cached_property
 
+import numpy as np
 
-class BirdVectorNetworkAnalyzer():
+# pyvisa is imported when the first VISA resource is opened. Until then no VISA
+# error can be raised, so the empty tuple catches nothing.
+_VISA_ERRORS = ()
+
+
+def _import_pyvisa():
+    """Imports pyvisa and registers its error types with the driver's error handling.
+
+    Returns:
+        module: The pyvisa module.
     """
-    This is a driver. 
+    global _VISA_ERRORS
+    import pyvisa
+    _VISA_ERRORS = (pyvisa.VisaIOError,)
+    return pyvisa
+
+
+_RESOURCE_MANAGER = None
+_RESOURCE_MANAGER_LOCK = threading.Lock()
+
+
+def shared_resource_manager():
+    """Returns the process-wide pyvisa ResourceManager, creating it on first use. Every driver
+    instance and session pool opens its VISA resources through this one manager.
+
+    Returns:
+        pyvisa.ResourceManager: The shared resource manager.
+    """
+    global _RESOURCE_MANAGER
+    with _RESOURCE_MANAGER_LOCK:
+        if _RESOURCE_MANAGER is None:
+            _RESOURCE_MANAGER = _import_pyvisa().ResourceManager()
+        return _RESOURCE_MANAGER
+
+
+def _open_resource(instrument_resource_string:str):
+    """Opens a new session to an instrument.
+
+    Args:
+        instrument_resource_string (str): A VISA resource string or "SIM::<dut>::INSTR".
+
+    Returns:
+        The opened resource.
+    """
+    if instrument_resource_string.upper().startswith("SIM"):
+        from bird_vna_simulator import SimulatedInstrument
+        return SimulatedInstrument(instrument_resource_string)
+    return shared_resource_manager().open_resource(instrument_resource_string)
+
+
+class _DataFormat():
+    """
+    Tracks the FORMat:DATA and FORMat:BORDer settings of the session so that
+    every subsystem moving numeric arrays decodes them the same way.
     """
     def __init__(self):
-        self.__resource_manager = None
-        self.__instr_obj = None
-        self.__channel = None
-        self.__trace = None
-        self.__port = None
-        self.__marker = None
-        self.__parameter = None
-        self.__standard = None
-        self.__cal_kit = None
-
-        self.calculate = None
-        self.display = None
-        self.format = None
-        self.hardcopy = None
-        self.initiate = None
-        self.mmemory = None
-        self.sense = None
-        self.service = None
-        self.source = None
-        self.status = None
-        self.system = None
-        self.trigger = None
+        self.data = "ASC"
+        self.border = "NORM"
+
+    def update(self, data:str, border:str):
+        """Records the settings read back with FORM:DATA? and FORM:BORD?.
+
+        Args:
+            data (str): Response to FORM:DATA?, e.g. ASC, REAL or REAL32.
+            border (str): Response to FORM:BORD?, NORM or SWAP.
+        """
+        data = data.strip().upper()
+        self.data = "REAL32" if "32" in data else "REAL" if "REAL" in data else "ASC"
+        self.border = "SWAP" if "SWAP" in border.strip().upper() else "NORM"
+
+    def dtype(self) -> np.dtype:
+        """Returns the NumPy element type of a binary block in the current format.
+
+        Returns:
+            np.dtype: float32 for REAL32 and float64 for REAL, in the negotiated byte order.
+        """
+        byte_order = ">" if self.border == "NORM" else "<"
+        if self.data == "REAL32":
+            return np.dtype(f"{byte_order}f4")
+        return np.dtype(f"{byte_order}f8")
+
+
+def _read_definite_length_block(instr_obj) -> memoryview:
+    """Reads an IEEE 488.2 definite-length arbitrary block (#<n><length><data>) from
+    the instrument and returns the data bytes without copying them.
+
+    Args:
+        instr_obj: The open instrument resource the query was written to.
+
+    Returns:
+        memoryview: The payload of the block.
+    """
+    raw = instr_obj.read_raw()
+    start = raw.find(b"#")
+    if start < 0 or len(raw) < start + 2:
+        raise ValueError("The response is not an IEEE 488.2 definite-length block.")
+    digit_count = int(raw[start + 1:start + 2])
+    if digit_count == 0:
+        raise ValueError("Indefinite-length blocks are not supported.")
+    offset = start + 2 + digit_count
+    length = int(raw[start + 2:offset])
+    if len(raw) < offset + length:
+        buffer = bytearray(raw)
+        while len(buffer) < offset + length:
+            buffer.extend(instr_obj.read_raw())
+        raw = buffer
+    return memoryview(raw)[offset:offset + length]
+
+
+def _query_numeric_array(instr_obj, command:str, data_format:_DataFormat) -> np.ndarray:
+    """Sends a query for a numeric array and decodes the response according to the
+    active data transfer format.
+
+    Args:
+        instr_obj: The open instrument resource.
+        command (str): The query to send.
+        data_format (_DataFormat): The transfer format shared by the session.
+
+    Returns:
+        np.ndarray: The values of the array. Binary transfers return a read-only
+        view of the received block.
+    """
+    if data_format.data == "ASC":
+        return np.array(instr_obj.query(command).rstrip().split(','), dtype=np.float64)
+    instr_obj.write(command)
+    return np.frombuffer(_read_definite_length_block(instr_obj), dtype=data_format.dtype())
+
+
+def _as_complex(values:np.ndarray) -> np.ndarray:
+    """Reinterprets an array of interleaved real and imaginary values as complex values
+    without copying the underlying buffer.
+
+    Args:
+        values (np.ndarray): Interleaved re,im values of float32 or float64 type.
+
+    Returns:
+        np.ndarray: A complex64 or complex128 view of the same memory.
+    """
+    return values.view(np.dtype(f"{values.dtype.str[0]}c{values.dtype.itemsize * 2}"))
+
+
+def _write_numeric_array(instr_obj, command:str, values:np.ndarray, data_format:_DataFormat):
+    """Sends a numeric array to the instrument in a single message, either as a comma separated
+    ASCII list or as an IEEE 488.2 definite-length block depending on the active data transfer format.
+
+    Args:
+        instr_obj: The open instrument resource.
+        command (str): The command header the array is the parameter of.
+        values (np.ndarray): Real values, or complex values which are sent as interleaved re,im pairs.
+        data_format (_DataFormat): The transfer format shared by the session.
+    """
+    values = np.asarray(values)
+    if data_format.data == "ASC":
+        if np.iscomplexobj(values):
+            values = np.ascontiguousarray(values, dtype=np.complex128).view(np.float64)
+        instr_obj.write(f"{command} {','.join(map(str, values.ravel().tolist()))}")
+        return
+    dtype = data_format.dtype()
+    if np.iscomplexobj(values):
+        values = np.ascontiguousarray(values, dtype=np.dtype(f"{dtype.str[0]}c{dtype.itemsize * 2}")).view(dtype)
+    else:
+        values = np.ascontiguousarray(values, dtype=dtype)
+    length = str(values.nbytes)
+    instr_obj.write_raw(f"{command} #{len(length)}{length}".encode() + values.tobytes() + b"\n")
+
+
+# Row layout of Calculate.Marker.readout().
+_MARKER_READOUT_DTYPE = np.dtype([("trace", "i4"), ("marker", "i4"), ("x", "f8"), ("y1", "f8"), ("y2", "f8")])
+
+
+def _is_query(message:str) -> bool:
+    """Returns True when the last program message unit of a message is a query."""
+    units = message.strip().split(";")
+    return units[-1].strip().split(" ")[0].endswith("?")
+
+
+def _compound_unit(message:bytes) -> bytes:
+    """Prepares a program message for joining into a compound message. The write termination
+    is removed and a leading ':' is added so the header is not resolved relative to the
+    previous command in the same message. Only the termination and leading whitespace are
+    removed; the bytes of a binary block may end in any value, including a space.
+    """
+    if message.endswith(b"\n"):
+        message = message[:-1]
+    message = message.lstrip(b" ")
+    if not message.startswith((b":", b"*")):
+        message = b":" + message
+    return message
+
+
+def _read_response_units(instr_obj, count:int) -> list[bytes]:
+    """Reads a response message holding count ';' separated response units, any of which may be
+    an IEEE 488.2 definite-length block, reading again until every unit has arrived.
+
+    Args:
+        instr_obj: The open instrument resource the compound query was written to.
+        count (int): The number of queries in the compound message.
 
+    Returns:
+        list[bytes]: One entry per query, without separators or termination.
+    """
+    buffer = bytearray(instr_obj.read_raw())
+    units = []
+    position = 0
+    while len(units) < count:
+        while len(buffer) <= position:
+            buffer.extend(instr_obj.read_raw())
+        if buffer[position:position + 1] == b"#":
+            while len(buffer) < position + 2:
+                buffer.extend(instr_obj.read_raw())
+            digit_count = int(buffer[position + 1:position + 2])
+            while len(buffer) < position + 2 + digit_count:
+                buffer.extend(instr_obj.read_raw())
+            end = position + 2 + digit_count + int(buffer[position + 2:position + 2 + digit_count])
+            while len(buffer) < end:
+                buffer.extend(instr_obj.read_raw())
+        else:
+            # A unit ends at a ';' or the terminator outside a quoted string; an empty unit ends at once.
+            end = position
+            quote = None
+            while True:
+                if end == len(buffer):
+                    buffer.extend(instr_obj.read_raw())
+                    continue
+                character = buffer[end:end + 1]
+                if quote is not None:
+                    if character == quote:
+                        quote = None
+                elif character in (b'"', b"'"):
+                    quote = character
+                elif character in (b";", b"\n"):
+                    break
+                end += 1
+        units.append(bytes(buffer[position:end]))
+        position = end + 1
+    return units
+
+
+class _Captured(Exception):
+    """Stops a getter run by Transaction.query() at the query it would send."""
+    def __init__(self, command:str):
+        super().__init__(command)
+        self.command = command
+
+
+class _Context():
+    """
+    The channel, trace, marker, port, parameter, standard and calibration kit
+    that commands are addressed to. One instance is shared by every subsystem of
+    a driver and read when a command is built, so changing the addressing is a
+    single attribute assignment however large the command tree is.
+    """
+    def __init__(self):
+        self.channel = None
+        self.trace = None
+        self.marker = None
+        self.port = None
+        self.parameter = None
+        self.standard = None
+        self.cal_kit = None
+
+
+class _StateCache():
+    """
+    A write-through cache of instrument settings keyed by the canonical command
+    header, so each channel, trace and marker has its own entries. Writes that
+    would not change a cached value are skipped and queries for cached settings
+    are answered locally. Only the headers in CACHEABLE are held; commands that
+    replace the whole state clear the cache and commands with side effects on
+    other settings drop the entries they affect.
+    """
+    CACHEABLE = {"CALC:FORM", "CALC:PAR:DEF", "CALC:PAR:COUN",
+                 "CALC:MARK", "CALC:MARK:X", "CALC:MARK:FUNC:TYPE", "CALC:MARK:FUNC:TARG",
+                 "CALC:MARK:BWID", "CALC:MARK:BWID:REF", "CALC:MARK:BWID:TYPE", "CALC:MARK:BWID:THR",
+                 "CALC:LIM", "CALC:LIM:DISP",
+                 "CALC:CORR:EDEL:TIME", "CALC:CORR:EDEL:MED", "CALC:CORR:EDEL:DIST", "CALC:CORR:OFFS:PHAS",
+                 "CALC:FILT:TIME:TYPE", "CALC:FILT:TIME:CENT", "CALC:FILT:TIME:STAR", "CALC:FILT:TIME:SHAP",
+                 "CALC:FILT:TIME:STAT",
+                 "SENS:FREQ", "SENS:FREQ:STAR", "SENS:FREQ:STOP", "SENS:FREQ:CENT", "SENS:FREQ:SPAN",
+                 "SENS:SWE:POIN", "SENS:SWE:TYPE", "SENS:SWE:POIN:TIME", "SENS:CORR:IMP", "SENS:CORR:COLL:CKIT",
+                 "SENS:CORR:STAT", "INIT:CONT", "TRIG:SOUR", "TRIG:SCOP",
+                 "DISP:ENAB", "DISP:WIND:MAX", "DISP:WIND:SPL", "DISP:WIND:TRAC:Y:PDIV",
+                 "MMEM:STOR:STYP", "FORM:DATA", "FORM:BORD"}
+
+    # Commands that replace the instrument state.
+    CLEARS = {"*RST", "SYST:PRES", "MMEM:LOAD", "ABOR"}
+
+    # Settings that a command changes as a side effect, in any channel, trace or marker.
+    COUPLED = {"SENS:FREQ:STAR": ("SENS:FREQ:STOP", "SENS:FREQ:CENT", "SENS:FREQ:SPAN"),
+               "SENS:FREQ:STOP": ("SENS:FREQ:STAR", "SENS:FREQ:CENT", "SENS:FREQ:SPAN"),
+               "SENS:FREQ:CENT": ("SENS:FREQ:STAR", "SENS:FREQ:STOP"),
+               "SENS:FREQ:SPAN": ("SENS:FREQ:STAR", "SENS:FREQ:STOP"),
+               "SENS:SWE:TYPE": ("SENS:SWE:POIN",),
+               "SENS:SEGM:DATA": ("SENS:SWE:POIN",),
+               "MMEM:LOAD:SEGM": ("SENS:SWE:POIN",),
+               "CALC:MARK:SET": ("CALC:MARK:X",),
+               "CALC:MARK:FUNC:EXEC": ("CALC:MARK:X",),
+               "DISP:WIND:TRAC:Y:AUTO": ("DISP:WIND:TRAC:Y:PDIV",),
+               "SENS:CORR:COLL:SAVE": ("SENS:CORR:STAT",),
+               "SENS:CORR:COLL:ECAL:SOLT": ("SENS:CORR:STAT",),
+               }
+
+    def __init__(self):
+        self.enabled = False
+        self.__entries = {}
+        self.__active_traces = {}
+        # Whether trace 1 is known to be active in channels without a recorded PAR:SEL; only after
+        # *RST or a preset, since the cache may be enabled on a session whose active trace is unknown.
+        self.__active_known = False
+        self.hits = 0
+        self.misses = 0
+        self.writes_skipped = 0
+        self.writes = 0
+        self.invalidations = 0
+
+    def statistics(self) -> dict:
+        """Reports how the cache has been used.
+
+        Returns:
+            dict: hits and misses of queries, writes sent and skipped, invalidations, and the bus
+            transactions saved (hits plus skipped writes).
+        """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "writes_skipped": self.writes_skipped,
+                "invalidations": self.invalidations,
+                "transactions_saved": self.hits + self.writes_skipped,
+                "entries": len(self.__entries),
+                }
+
+    def clear(self):
+        """Forgets every cached setting."""
+        self.__entries.clear()
+        self.__active_traces.clear()
+        self.__active_known = False
+        self.invalidations += 1
+
+    def lookup(self, message:str) -> str:
+        """Answers a query from the cache.
+
+        Args:
+            message (str): The query.
+
+        Returns:
+            str: The cached response, or None when the setting is not cached.
+        """
+        key = self.__key(message)
+        if key is None:
+            return None
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def store(self, message:str, response:str):
+        """Records the response of a query that was sent to the instrument."""
+        key = self.__key(message)
+        if key is not None:
+            value = response.strip()
+            self.__entries[key] = (key[0], value, _normalize_value(value))
+
+    def redundant(self, message:str) -> bool:
+        """Tests whether a write would leave the cached state unchanged.
+
+        Args:
+            message (str): The command about to be written.
+
+        Returns:
+            bool: True when the write can be skipped.
+        """
+        key = self.__key(message)
+        if key is None:
+            return False
+        entry = self.__entries.get(key)
+        if entry is not None and entry[2] == _normalize_value(_parameter_text(message)):
+            self.writes_skipped += 1
+            return True
+        return False
+
+    def record_write(self, message:str):
+        """Updates the cache after a command has been sent (or queued in a transaction).
+
+        Args:
+            message (str): The command written.
+        """
+        self.writes += 1
+        if ";" in message:
+            self.clear()
+            return
+        header, suffixes = _canonical_header(message.strip().split(" ")[0])
+        if header in self.CLEARS:
+            self.clear()
+            self.__active_known = header == "*RST" or header == "SYST:PRES"
+            return
+        for coupled in self.COUPLED.get(header, ()):
+            for key in [key for key, entry in self.__entries.items() if entry[0] == coupled]:
+                del self.__entries[key]
+        if header == "CALC:PAR:SEL":
+            self.__active_traces[suffixes.get("CALC", 1)] = suffixes.get("PAR", 1)
+        elif header == "CALC:PAR:COUN":
+            self.__active_traces.pop(suffixes.get("CALC", 1), None)
+        key = self.__key(message)
+        if key is not None:
+            value = _parameter_text(message)
+            self.__entries[key] = (key[0], _answer_value(value), _normalize_value(value))
+
+    def __key(self, message:str) -> tuple:
+        if ";" in message:
+            return None
+        header, suffixes = _canonical_header(message.strip().split(" ")[0].rstrip("?"))
+        if header not in self.CACHEABLE:
+            return None
+        scope = tuple(sorted(suffixes.items()))
+        if header.startswith("CALC:") and "TRAC" not in suffixes and "PAR" not in suffixes and header != "CALC:PAR:COUN":
+            # Commands without a trace node act on the active trace of the channel.
+            channel = suffixes.get("CALC", 1)
+            if channel not in self.__active_traces and not self.__active_known:
+                return None
+            scope += (("ACTIVE", self.__active_traces.get(channel, 1)),)
+        return (header, scope)
+
+
+def _short_form(mnemonic:str) -> str:
+    """Reduces a SCPI mnemonic to its short form, e.g. FORMAT to FORM and PARAMETER to PAR."""
+    if len(mnemonic) <= 4 or mnemonic.startswith("*"):
+        return mnemonic
+    return mnemonic[:3] if mnemonic[3] in "AEIOU" else mnemonic[:4]
+
+
+def _canonical_header(header:str) -> tuple[str, dict]:
+    """Reduces a command header to its short form without numeric suffixes, e.g.
+    "CALC1:TRAC2:FORMat" to ("CALC:TRAC:FORM", {"CALC": 1, "TRAC": 2}). The TRAC node of
+    CALCulate commands is dropped from the header since it only selects the trace.
+
+    Returns:
+        tuple[str, dict]: The header and its suffixes by node.
+    """
+    nodes = []
+    suffixes = {}
+    for node in header.strip().lstrip(":").upper().split(":"):
+        mnemonic = node.rstrip("0123456789")
+        name = _short_form(mnemonic)
+        if len(mnemonic) < len(node):
+            suffixes[name] = int(node[len(mnemonic):])
+        nodes.append(name)
+    if nodes[0] == "CALC" and "TRAC" in nodes:
+        nodes.remove("TRAC")
+    return ":".join(nodes), suffixes
+
+
+def _parameter_text(message:str) -> str:
+    parts = message.strip().split(" ", 1)
+    return parts[1].strip() if len(parts) > 1 else ""
+
+
+def _answer_value(value:str) -> str:
+    value = value.strip().strip("\"'").upper()
+    return {"ON": "1", "OFF": "0"}.get(value, value)
+
+
+def _normalize_value(value:str) -> str:
+    value = _answer_value(value)
+    try:
+        return repr(float(value))
+    except ValueError:
+        return value
+
+
+class _Session():
+    """
+    Wraps the open instrument resource that every subsystem talks to. Outside of
+    a transaction each call is passed straight through. Inside one, program
+    messages are held by the transaction and getters deferred with
+    Transaction.query() are captured and later replayed against their response.
+    """
+    def __init__(self, resource):
+        self.resource = resource
+        self.transaction = None
+        self.capturing = False
+        self.replay = None
+        self.cache = _StateCache()
+
+    def __getattr__(self, name):
+        return getattr(self.resource, name)
+
+    def write(self, message:str):
+        if self.replay is not None:
+            return 0
+        if self.capturing and _is_query(message):
+            raise _Captured(message)
+        if self.transaction is not None:
+            # The cache is updated once the transaction has actually sent the write.
+            self.transaction._append(message.encode(), written=message)
+            return 0
+        if self.cache.enabled and self.cache.redundant(message):
+            return 0
+        count = self.resource.write(message)
+        if self.cache.enabled:
+            self.cache.record_write(message)
+        return count
+
+    def write_raw(self, message:bytes):
+        if self.replay is not None:
+            return 0
+        if self.transaction is not None:
+            self.transaction._append(message)
+            return 0
+        return self.resource.write_raw(message)
+
+    def query(self, message:str) -> str:
+        # Inside a transaction the cache may already hold writes queued after this query, so
+        # deferred getters are always sent and answered by the instrument.
+        cached = self.cache.enabled and self.transaction is None and self.replay is None
+        if cached:
+            response = self.cache.lookup(message)
+            if response is not None:
+                return response
+        if self.capturing:
+            raise _Captured(message)
+        if self.replay is not None:
+            response = self.__take_replay().decode("latin-1")
+        elif self.transaction is not None:
+            raise RuntimeError("Queries inside a transaction must be made through Transaction.query().")
+        else:
+            response = self.resource.query(message)
+        if cached:
+            self.cache.store(message, response)
+        return response
+
+    def read_raw(self, *args) -> bytes:
+        if self.replay is not None:
+            return self.__take_replay() + b"\n"
+        if self.transaction is not None:
+            raise RuntimeError("Queries inside a transaction must be made through Transaction.query().")
+        return self.resource.read_raw(*args)
+
+    def __take_replay(self) -> bytes:
+        if not self.replay:
+            raise RuntimeError("The deferred getter sends more than one query.")
+        return self.replay.pop()
+
+
+class Transaction():
+    """
+    Collects the writes and queries made while it is open and sends them as
+    ';' joined compound messages when it closes, so that a block of settings
+    and readings costs a few bus round trips instead of one each. Use through
+    BirdVectorNetworkAnalyzer.transaction():
+
+        with bna1k.transaction() as txn:
+            bna1k.calculate.format.type = "mlog"
+            y = txn.query(lambda: bna1k.calculate.marker.y())
+        val1, val2 = y.result()
+
+    Writes are deferred; reads are requested with query(), which returns a
+    concurrent.futures.Future that resolves to the value the getter would have
+    returned once the transaction has been sent.
+    """
+    def __init__(self, session:_Session, max_message_length:int=4096):
+        self.__session = session
+        self.__max_message_length = max_message_length
+        self.__pending = []
+
+    def __enter__(self):
+        if self.__session.transaction is not None:
+            raise RuntimeError("A transaction is already open on this session.")
+        self.__session.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__session.transaction = None
+        if exc_type is None:
+            self.flush()
+        else:
+            for _, future, _, _ in self.__pending:
+                if future is not None:
+                    future.cancel()
+            self.__pending = []
+        return False
+
+    def _append(self, message:bytes, future:Future=None, getter=None, written:str=None):
+        self.__pending.append((_compound_unit(message), future, getter, written))
+
+    def query(self, request) -> Future:
+        """Defers a query until the transaction is sent.
+
+        Args:
+            request: A driver getter wrapped in a callable, e.g. lambda: bna1k.calculate.marker.x,
+                or a raw SCPI query string.
+
+        Returns:
+            Future: Resolves to the getter's return value, or to the stripped response string for a raw query.
+        """
+        future = Future()
+        if isinstance(request, str):
+            self._append(request.encode(), future)
+            return future
+        self.__session.capturing = True
         try:
-            if self.__resource_manager is None:
-                self.__resource_manager = visa.ResourceManager()
-        except visa.VisaIOError as visaerror:
-            print(f"{visaerror}")
-        except visa.VisaIOWarning as visawarning:
-            print(f"{visawarning}")
+            # A getter that completes here sent no query.
+            future.set_result(request())
+        except _Captured as captured:
+            self._append(captured.command.encode(), future, request)
+        finally:
+            self.__session.capturing = False
+        return future
+
+    def flush(self):
+        """Sends everything collected so far; deferred results are resolved before returning.
+        """
+        pending, self.__pending = self.__pending, []
+        message = []
+        length = 0
+        for item in pending:
+            if message and length + len(item[0]) + 1 > self.__max_message_length:
+                self.__send(message)
+                message, length = [], 0
+            message.append(item)
+            length += len(item[0]) + 1
+        if message:
+            self.__send(message)
+
+    def __send(self, items:list):
+        resource = self.__session.resource
+        resource.write_raw(b";".join(unit for unit, _, _, _ in items) + b"\n")
+        cache = self.__session.cache
+        if cache.enabled:
+            for _, _, _, written in items:
+                if written is not None:
+                    cache.record_write(written)
+        futures = [(future, getter) for _, future, getter, _ in items if future is not None]
+        if not futures:
+            return
+        units = _read_response_units(resource, len(futures))
+        for (future, getter), unit in zip(futures, units):
+            if getter is None:
+                future.set_result(unit.decode("latin-1").strip())
+                continue
+            self.__session.replay = [unit]
+            try:
+                future.set_result(getter())
+            except Exception as error:
+                future.set_exception(error)
+            finally:
+                self.__session.replay = None
+
+
+class SessionPool():
+    """
+    Keeps instrument sessions open between uses, keyed by resource string, so
+    that short-lived driver instances do not reconnect to the instrument each
+    time. A driver created with BirdVectorNetworkAnalyzer(session_pool=pool)
+    checks a session out in initialize() and back in on close(). An idle
+    session is health-checked (device clear and a query) before it is handed
+    out again; one that fails is closed and replaced by a new session.
+    """
+    def __init__(self, max_idle:int=4, health_check:str="*IDN?"):
+        """
+        Args:
+            max_idle (int, optional): Idle sessions kept open per resource string; further sessions
+                checked in are closed. Defaults to 4.
+            health_check (str, optional): Query that must be answered for an idle session to be
+                reused. Defaults to "*IDN?".
+        """
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self.__lock = threading.Lock()
+        self.__idle = {}
+        self.opened = 0
+        self.reused = 0
+        self.health_failures = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    @staticmethod
+    def __key(instrument_resource_string:str) -> str:
+        return instrument_resource_string.strip().upper()
+
+    def statistics(self) -> dict:
+        """Reports how the pool has been used.
+
+        Returns:
+            dict: Sessions opened, sessions reused, failed health checks and idle sessions held.
+        """
+        with self.__lock:
+            idle = sum(len(sessions) for sessions in self.__idle.values())
+            return {"opened": self.opened, "reused": self.reused, "health_failures": self.health_failures, "idle": idle}
 
-    def initialize(self, instrument_resource_string, *args):
+    def checkout(self, instrument_resource_string:str):
+        """Returns an open session to an instrument, reusing an idle one if it passes the health
+        check and opening a new one otherwise.
+
+        Args:
+            instrument_resource_string (str): A VISA resource string or "SIM::<dut>::INSTR".
+
+        Returns:
+            The open resource, for use by one caller until it is checked back in.
         """
-        Temporary, provisional docstring
+        key = self.__key(instrument_resource_string)
+        while True:
+            with self.__lock:
+                sessions = self.__idle.get(key)
+                resource = sessions.pop()[0] if sessions else None
+            if resource is None:
+                break
+            healthy = self.__healthy(resource)
+            # Counters are updated under the lock since several threads may check sessions out at once.
+            with self.__lock:
+                if healthy:
+                    self.reused += 1
+                else:
+                    self.health_failures += 1
+            if healthy:
+                return resource
+            self.discard(resource)
+        resource = _open_resource(instrument_resource_string)
+        with self.__lock:
+            self.opened += 1
+        return resource
+
+    def checkin(self, instrument_resource_string:str, resource):
+        """Returns a session to the pool for reuse.
+
+        Args:
+            instrument_resource_string (str): The resource string the session was checked out with.
+            resource: The session.
+        """
+        key = self.__key(instrument_resource_string)
+        with self.__lock:
+            sessions = self.__idle.setdefault(key, [])
+            if len(sessions) < self.max_idle:
+                sessions.append((resource, time.monotonic()))
+                return
+        self.discard(resource)
+
+    def discard(self, resource):
+        """Closes a session instead of returning it to the pool.
+
+        Args:
+            resource: The session.
         """
         try:
-            self.__instr_obj = self.__resource_manager.open_resource(
-                instrument_resource_string)
-            
-            self.calculate = self.Calculate(self.__instr_obj)
-            self.display = self.Display(self.__instr_obj)
-            self.format = self.Format(self.__instr_obj)
-            self.hardcopy = self.HardCopy(self.__instr_obj)
-            self.initiate = self.Initiate(self.__instr_obj)
-            self.mmemory = self.Mmemory(self.__instr_obj)
-            self.sense = self.Sense(self.__instr_obj)
-            self.service = self.Service(self.__instr_obj)
-            self.source = self.Source(self.__instr_obj)
-            self.status = self.Status(self.__instr_obj)
-            self.system = self.System(self.__instr_obj)
-            self.trigger = self.Trigger(self.__instr_obj)
-
-        except visa.VisaIOError as visaerr:
+            resource.close()
+        except Exception:
+            # The session is being dropped because it may be broken; closing it is best effort.
+            pass
+
+    def close(self):
+        """Closes every idle session held by the pool."""
+        with self.__lock:
+            idle, self.__idle = self.__idle, {}
+        for sessions in idle.values():
+            for resource, _ in sessions:
+                self.discard(resource)
+
+    def __healthy(self, resource) -> bool:
+        try:
+            resource.clear()
+            return bool(resource.query(self.health_check).strip())
+        except Exception:
+            # A stale LAN session can fail in many ways (VISA, socket or invalid-session errors);
+            # any of them means the session is replaced.
+            return False
+
+
+class BirdVectorNetworkAnalyzer():
+    """
+    This is a driver. 
+    """
+    def __init__(self, session_pool:SessionPool=None):
+        """
+        Args:
+            session_pool (SessionPool, optional): Pool that sessions opened from resource strings are
+                checked out of and returned to on close(). Defaults to None, opening a new session
+                in every initialize() and closing it in close().
+        """
+        self.__session_pool = session_pool
+        self.__pooled = None
+        self.__instr_obj = _Session(None)
+        self.__context = _Context()
+        self.__data_format = _DataFormat()
+
+    def initialize(self, instrument_resource_string, *args):
+        """Opens the instrument session. Subsystems such as calculate or sense are built the
+        first time they are used, and pyvisa is only imported when a VISA resource is opened.
+        VISA resources are opened through the process-wide shared_resource_manager().
+
+        Args:
+            instrument_resource_string: A VISA resource string, a string of the form "SIM::<dut>::INSTR"
+                to use the offline simulator in bird_vna_simulator.py (dut is antenna or filter), or an
+                already opened resource object such as a SimulatedInstrument.
+        """
+        try:
+            self.__release()
+            if not isinstance(instrument_resource_string, str):
+                resource = instrument_resource_string
+            elif self.__session_pool is not None:
+                resource = self.__session_pool.checkout(instrument_resource_string)
+                self.__pooled = instrument_resource_string
+            else:
+                resource = _open_resource(instrument_resource_string)
+            self.__instr_obj.resource = resource
+            self.__instr_obj.cache.clear()
+            # The session may have been configured by another driver or program (e.g. a session
+            # reused from a SessionPool), so the transfer format is read back rather than assumed.
+            self.__data_format.update(*self.__instr_obj.query(":FORM:DATA?;:FORM:BORD?").split(";"))
+
+        except _VISA_ERRORS as visaerr:
             print(f"{visaerr}")
         return
 
+    def __release(self):
+        """Returns a session checked out of the session pool, leaving the driver unconnected."""
+        if self.__pooled is not None:
+            self.__session_pool.checkin(self.__pooled, self.__instr_obj.resource)
+            self.__instr_obj.resource = None
+            self.__pooled = None
+
+    @cached_property
+    def calculate(self):
+        return self.Calculate(self.__instr_obj, self.__context, self.__data_format)
+
+    @cached_property
+    def display(self):
+        return self.Display(self.__instr_obj, self.__context)
+
+    @cached_property
+    def format(self):
+        return self.Format(self.__instr_obj, self.__context, self.__data_format)
+
+    @cached_property
+    def hardcopy(self):
+        return self.HardCopy(self.__instr_obj, self.__context)
+
+    @cached_property
+    def initiate(self):
+        return self.Initiate(self.__instr_obj, self.__context)
+
+    @cached_property
+    def mmemory(self):
+        return self.Mmemory(self.__instr_obj, self.__context)
+
+    @cached_property
+    def sense(self):
+        return self.Sense(self.__instr_obj, self.__context, self.__data_format)
+
+    @cached_property
+    def service(self):
+        return self.Service(self.__instr_obj, self.__context)
+
+    @cached_property
+    def source(self):
+        return self.Source(self.__instr_obj, self.__context)
+
+    @cached_property
+    def status(self):
+        return self.Status(self.__instr_obj, self.__context)
+
+    @cached_property
+    def system(self):
+        return self.System(self.__instr_obj, self.__context)
+
+    @cached_property
+    def trigger(self):
+        return self.Trigger(self.__instr_obj, self.__context)
+
     def close(self):
-        """
-        Temporary, provisional docstring
+        """Closes the instrument session, or returns it to the session pool if it was checked out of one.
         """
         try:
+            if self.__pooled is not None:
+                self.__release()
+                return
             self.__instr_obj.close()
-        except visa.VisaIOError as visaerr:
+        except _VISA_ERRORS as visaerr:
             print(f"{visaerr}")
         return
 
@@ -112,7 +932,7 @@ class BirdVectorNetworkAnalyzer():
         """
         try:
             self.__instr_obj.write(command)
-        except visa.VisaIOError as visaerr:
+        except _VISA_ERRORS as visaerr:
             print(f"{visaerr}")
         return
 
@@ -123,7 +943,7 @@ class BirdVectorNetworkAnalyzer():
         response = ""
         try:
             response = self.__instr_obj.query(command).rstrip()
-        except visa.VisaIOError as visaerr:
+        except _VISA_ERRORS as visaerr:
             print(f"{visaerr}")
 
         return response
@@ -140,12 +960,79 @@ class BirdVectorNetworkAnalyzer():
 
     def opc_query(self):
         """Reads out the OPC bit (bit 0) of the Standard Event Status Register at the completion of all pending operations.
+
+        Returns:
+            str: "1" once all pending operations are complete.
         """
-        self.query("*OPC?")
+        return self.query("*OPC?")
     
     def reset(self):
         self.write("*RST")
 
+    @property
+    def cache_enabled(self) -> bool:
+        """Gets/Sets whether settings are cached on the client. While enabled, writes that would not
+        change a cached setting are skipped and queries of cached settings are answered without a bus
+        transaction. The cache is scoped per channel, trace and marker and is cleared by reset(),
+        system.preset(), mmemory.load.state() and abort(). Settings of commands that act on the active
+        trace are cached only once the active trace is known, after a trace selection, reset() or
+        system.preset().
+
+        Returns:
+            bool: True when the cache is enabled.
+        """
+        return self.__instr_obj.cache.enabled
+
+    @cache_enabled.setter
+    def cache_enabled(self, state:bool=True):
+        self.__instr_obj.cache.clear()
+        self.__instr_obj.cache.enabled = state
+
+    def cache_statistics(self) -> dict:
+        """Reports the use of the state cache.
+
+        Returns:
+            dict: hits, misses, writes, writes_skipped, invalidations, transactions_saved and entries.
+        """
+        return self.__instr_obj.cache.statistics()
+
+    def clear_cache(self):
+        """Forgets every cached setting, e.g. after the instrument was changed from its front panel."""
+        self.__instr_obj.cache.clear()
+
+    def transaction(self, max_message_length:int=4096) -> Transaction:
+        """Opens a transaction that sends the writes and queries made inside a with block as
+        compound messages when the block exits. See Transaction for an example.
+
+        Args:
+            max_message_length (int, optional): Largest compound message sent, in bytes. Defaults to 4096.
+
+        Returns:
+            Transaction: The context manager; use its query() method to defer reads.
+        """
+        return Transaction(self.__instr_obj, max_message_length)
+
+    def stream(self, channel:int=1, traces:tuple=(1,), data:str="formatted", count:int=None, data_format:str="real64"):
+        """Streams sweeps: each iteration bus-triggers one sweep of the channel, waits for it to
+        complete and reads the traces in one binary transfer. See bird_vna_stream.py.
+
+            with bna1k.stream(channel=1, traces=(1, 2)) as sweeps:
+                for sweep in sweeps:
+                    log(sweep.timestamp, sweep[1], sweep[2])
+
+        Args:
+            channel (int, optional): The channel to sweep. Defaults to 1.
+            traces (tuple, optional): The trace numbers to read after each sweep. Defaults to (1,).
+            data (str, optional): "formatted" or "corrected". Defaults to "formatted".
+            count (int, optional): Number of sweeps to deliver. Defaults to None, streaming until closed.
+            data_format (str, optional): "real64", "real32" or "ascii". Defaults to "real64".
+
+        Returns:
+            SweepStream: Iterator of SweepRecords; its rate property reports the achieved sweep rate.
+        """
+        from bird_vna_stream import SweepStream
+        return SweepStream(self, channel, traces, data, count, data_format)
+
     def get_error_list(self) -> list[str]:
         fnclst = []
         while True:
@@ -158,365 +1045,174 @@ class BirdVectorNetworkAnalyzer():
 
     @property
     def cal_kit(self):
-        return self.__cal_kit
+        return self.__context.cal_kit
     
     @cal_kit.setter
     def cal_kit(self, kit_number):
-        self.__cal_kit = kit_number
-        self.calculate._set_cal_kit(self.__cal_kit)
-        self.display._set_cal_kit(self.__cal_kit)
-        self.format._set_cal_kit(self.__cal_kit)
-        self.hardcopy._set_cal_kit(self.__cal_kit)
-        self.initiate._set_cal_kit(self.__cal_kit)
-        self.mmemory._set_cal_kit(self.__cal_kit)
-        self.sense._set_cal_kit(self.__cal_kit)
-        self.service._set_cal_kit(self.__cal_kit)
-        self.source._set_cal_kit(self.__cal_kit)
-        self.status._set_cal_kit(self.__cal_kit)
-        self.system._set_cal_kit(self.__cal_kit)
-        self.trigger._set_cal_kit(self.__cal_kit)
+        self.__context.cal_kit = kit_number
 
     @property
     def channel(self):
-        return self.__instr_obj
+        return self.__context.channel
     
     @channel.setter
     def channel(self, channel):
-        self.__channel = channel
-        self.calculate._set_channel(self.__channel)
-        self.display._set_channel(self.__channel)
-        self.format._set_channel(self.__channel)
-        self.hardcopy._set_channel(self.__channel)
-        self.initiate._set_channel(self.__channel)
-        self.mmemory._set_channel(self.__channel)
-        self.sense._set_channel(self.__channel)
-        self.service._set_channel(self.__channel)
-        self.source._set_channel(self.__channel)
-        self.status._set_channel(self.__channel)
-        self.system._set_channel(self.__channel)
-        self.trigger._set_channel(self.__channel)
-    
+        self.__context.channel = channel
+
     @property
     def marker(self):
-        return self.__marker
+        return self.__context.marker
     
     @marker.setter
     def marker(self, marker):
-        self.__marker = marker
-        self.calculate._set_marker(self.__marker)
-        self.display._set_marker(self.__marker)
-        self.format._set_marker(self.__marker)
-        self.hardcopy._set_marker(self.__marker)
-        self.initiate._set_marker(self.__marker)
-        self.mmemory._set_marker(self.__marker)
-        self.sense._set_marker(self.__marker)
-        self.service._set_marker(self.__marker)
-        self.source._set_marker(self.__marker)
-        self.status._set_marker(self.__marker)
-        self.system._set_marker(self.__marker)
-        self.trigger._set_marker(self.__marker)
+        self.__context.marker = marker
 
     @property
     def parameter(self):
-        return self.__parameter
+        return self.__context.parameter
     
     @parameter.setter
     def parameter(self, parameter):
-        self.__parameter = parameter
-        self.calculate._set_parameter(self.__parameter)
-        self.display._set_parameter(self.__parameter)
-        self.format._set_parameter(self.__parameter)
-        self.hardcopy._set_parameter(self.__parameter)
-        self.initiate._set_parameter(self.__parameter)
-        self.mmemory._set_parameter(self.__parameter)
-        self.sense._set_parameter(self.__parameter)
-        self.service._set_parameter(self.__parameter)
-        self.source._set_parameter(self.__parameter)
-        self.status._set_parameter(self.__parameter)
-        self.system._set_parameter(self.__parameter)
-        self.trigger._set_parameter(self.__parameter)
+        self.__context.parameter = parameter
 
     @property
     def port(self):
-        return self.__port
+        return self.__context.port
     
     @port.setter
     def port(self, port):
-        self.__port = port
-        self.calculate._set_port(self.__port)
-        self.display._set_port(self.__port)
-        self.format._set_port(self.__port)
-        self.hardcopy._set_port(self.__port)
-        self.initiate._set_port(self.__port)
-        self.mmemory._set_port(self.__port)
-        self.sense._set_port(self.__port)
-        self.service._set_port(self.__port)
-        self.source._set_port(self.__port)
-        self.status._set_port(self.__port)
-        self.system._set_port(self.__port)
-        self.trigger._set_port(self.__port)
-    
+        self.__context.port = port
+
     @property
     def standard(self):
-        return self.__standard
+        return self.__context.standard
     
     @standard.setter
     def standard(self, standard):
-        self.__standard = standard
-        self.calculate._set_standard(self.__standard)
-        self.display._set_standard(self.__standard)
-        self.format._set_standard(self.__standard)
-        self.hardcopy._set_standard(self.__standard)
-        self.initiate._set_standard(self.__standard)
-        self.mmemory._set_standard(self.__standard)
-        self.sense._set_standard(self.__standard)
-        self.service._set_standard(self.__standard)
-        self.source._set_standard(self.__standard)
-        self.status._set_standard(self.__standard)
-        self.system._set_standard(self.__standard)
-        self.trigger._set_standard(self.__standard)
+        self.__context.standard = standard
 
     @property
     def trace(self):
-        return self.__trace 
+        return self.__context.trace
     
     @trace.setter
     def trace(self, trace):
-        self.__trace = trace
-        self.calculate._set_trace(self.__trace)
-        self.display._set_trace(self.__trace)
-        self.format._set_trace(self.__trace)
-        self.hardcopy._set_trace(self.__trace)
-        self.initiate._set_trace(self.__trace)
-        self.mmemory._set_trace(self.__trace)
-        self.sense._set_trace(self.__trace)
-        self.service._set_trace(self.__trace)
-        self.source._set_trace(self.__trace)
-        self.status._set_trace(self.__trace)
-        self.system._set_trace(self.__trace)
-        self.trigger._set_trace(self.__trace)
+        self.__context.trace = trace
 
     class Calculate():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context, data_format):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-            self.conversion     = self.Conversion(self.__instr_obj)
-            self.correction     = self.Correction(self.__instr_obj)
-            self.data           = self.Data(self.__instr_obj)
-            self.format         = self.Format(self.__instr_obj)
-            self.fixturesimulate= self.FixtureSimulate(self.__instr_obj)
-            self.function       = self.Function(self.__instr_obj)
-            self.hold           = self.Hold(self.__instr_obj)
-            self.limit          = self.Limit(self.__instr_obj)
-            self.marker         = self.Marker(self.__instr_obj)
-            self.math           = self.Math(self.__instr_obj)
-            self.mathstatistics = self.MathStatistics(self.__instr_obj)
-            self.parameter      = self.Parameter(self.__instr_obj)
-            self.ripplelimit    = self.RippleLimit(self.__instr_obj)
-            self.smoothing      = self.Smoothing(self.__instr_obj)
-            self.transform      = self.Transform(self.__instr_obj)
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-            self.conversion._set_channel(self.__channel)
-            self.correction._set_channel(self.__channel)
-            self.data._set_channel(self.__channel)
-            self.format._set_channel(self.__channel)
-            self.fixturesimulate._set_channel(self.__channel)
-            self.function._set_channel(self.__channel)
-            self.hold._set_channel(self.__channel)
-            self.limit._set_channel(self.__channel)
-            self.marker._set_channel(self.__channel)
-            self.math._set_channel(self.__channel)
-            self.mathstatistics._set_channel(self.__channel)
-            self.parameter._set_channel(self.__channel)
-            self.ripplelimit._set_channel(self.__channel)
-            self.smoothing._set_channel(self.__channel)
-            self.transform._set_channel(self.__channel)
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-            self.conversion._set_trace(self.__trace)
-            self.data._set_trace(self.__trace)
-            self.format._set_trace(self.__trace)
-            self.fixturesimulate._set_trace(self.__trace)
-            self.function._set_trace(self.__trace)
-            self.hold._set_trace(self.__trace)
-            self.limit._set_trace(self.__trace)
-            self.marker._set_trace(self.__trace)
-            self.math._set_trace(self.__trace)
-            self.mathstatistics._set_trace(self.__trace)
-            self.parameter._set_trace(self.__trace)
-            self.ripplelimit._set_trace(self.__trace)
-            self.smoothing._set_trace(self.__trace)
-            self.transform._set_trace(self.__trace)
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-            self.conversion._set_marker(self.__marker)
-            self.data._set_marker(self.__marker)
-            self.format._set_marker(self.__marker)
-            self.fixturesimulate._set_marker(self.__marker)
-            self.function._set_marker(self.__marker)
-            self.hold._set_marker(self.__marker)
-            self.limit._set_marker(self.__marker)
-            self.marker._set_marker(self.__marker)
-            self.math._set_marker(self.__marker)
-            self.mathstatistics._set_marker(self.__marker)
-            self.parameter._set_marker(self.__marker)
-            self.ripplelimit._set_marker(self.__marker)
-            self.smoothing._set_marker(self.__marker)
-            self.transform._set_marker(self.__marker)
-
-        def _set_port(self, port):
-            self.__port = port
-            self.conversion._set_port(self.__port)
-
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-            self.conversion._set_parameter(self.__parameter)
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-            self.conversion._set_standard(self.__standard)
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-            self.conversion._set_cal_kit(self.__cal_kit)
+            self.__context = context
+            self.__data_format = data_format
+
+        @cached_property
+        def conversion(self):
+            return self.Conversion(self.__instr_obj, self.__context)
+
+        @cached_property
+        def correction(self):
+            return self.Correction(self.__instr_obj, self.__context)
+
+        @cached_property
+        def data(self):
+            return self.Data(self.__instr_obj, self.__context, self.__data_format)
+
+        @cached_property
+        def format(self):
+            return self.Format(self.__instr_obj, self.__context)
+
+        @cached_property
+        def fixturesimulate(self):
+            return self.FixtureSimulate(self.__instr_obj, self.__context)
+
+        @cached_property
+        def function(self):
+            return self.Function(self.__instr_obj, self.__context)
+
+        @cached_property
+        def hold(self):
+            return self.Hold(self.__instr_obj, self.__context)
+
+        @cached_property
+        def limit(self):
+            return self.Limit(self.__instr_obj, self.__context)
+
+        @cached_property
+        def marker(self):
+            return self.Marker(self.__instr_obj, self.__context)
+
+        @cached_property
+        def math(self):
+            return self.Math(self.__instr_obj, self.__context)
+
+        @cached_property
+        def mathstatistics(self):
+            return self.MathStatistics(self.__instr_obj, self.__context)
+
+        @cached_property
+        def parameter(self):
+            return self.Parameter(self.__instr_obj, self.__context)
+
+        @cached_property
+        def ripplelimit(self):
+            return self.RippleLimit(self.__instr_obj, self.__context)
+
+        @cached_property
+        def smoothing(self):
+            return self.Smoothing(self.__instr_obj, self.__context)
+
+        @cached_property
+        def transform(self):
+            return self.Transform(self.__instr_obj, self.__context)
 
         class Conversion():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
             @property
             def conversion(self):
-                return f"CALC{self.__channel}:CONV?"
+                return f"CALC{self.__context.channel}:CONV?"
             
             @conversion.setter
             def conversion(self, state):
-                val = f"CALC{self.__channel}:CONV {state}"
+                val = f"CALC{self.__context.channel}:CONV {state}"
                 print(val)
 
             @property
             def function(self):
-                return f"CALC{self.__channel}:CONV:FUNC?"
+                return f"CALC{self.__context.channel}:CONV:FUNC?"
             
             @function.setter
             def conversion_function(self, function):
-                val = f"CALC{self.__channel}:CONV:FUNC {function}"
+                val = f"CALC{self.__context.channel}:CONV:FUNC {function}"
 
             @property
             def state(self):
-                return f"CALC{self.__channel}:CONV:FUNC?"
+                return f"CALC{self.__context.channel}:CONV:FUNC?"
             
             @state.setter
             def state(self, state):
                 val = state
 
         class Correction():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.electrical_delay   = self.ElectricalDelay(self.__instr_obj)
-                self.offset             = self.Offset(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.electrical_delay._set_channel(self.__channel)
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.electrical_delay._set_trace(self.__trace)
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
+
+            @cached_property
+            def electrical_delay(self):
+                return self.ElectricalDelay(self.__instr_obj, self.__context)
+
+            @cached_property
+            def offset(self):
+                return self.Offset(self.__instr_obj, self.__context)
 
             class ElectricalDelay():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                
                 @property
                 def media(self) -> str:
                     """This command gets the type of media in the electrical delay function.
@@ -524,7 +1220,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: COAXial or WAVEguide
                     """
-                    return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:MED?").rstrip()
+                    return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:MED?").rstrip()
                 
                 @media.setter
                 def media(self, type:str):
@@ -533,7 +1229,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         type (str): COAXial or WAVEguide
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:MED {type}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:MED {type}")
                 
                 @property
                 def time(self) -> float:
@@ -542,7 +1238,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: Electrical time delay from -10.0 to 10.0
                     """
-                    return float(self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:TIME?").rstrip())
+                    return float(self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:TIME?").rstrip())
                 
                 @time.setter
                 def time(self, value:float):
@@ -551,24 +1247,12 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         value (float): Electrical time delay from -10.0 to 10.0
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:TIME {value}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:TIME {value}")
             
                 class Distance():
                     def __init(self, instrobj):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                    
-                    def _set_channel(self, channel):
-                        self.__channel = channel
                     
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-
                     @property
                     def distance(self):
                         """Reads out the value of the equivalent distance in the electrical delay function. 
@@ -576,7 +1260,7 @@ class BirdVectorNetworkAnalyzer():
                         Returns:
                             float: The distance value.
                         """
-                        return float(self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:DIST?").rstrip())
+                        return float(self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:DIST?").rstrip())
                     
                     @distance.setter
                     def distance(self, dist:float=0.1):
@@ -585,7 +1269,7 @@ class BirdVectorNetworkAnalyzer():
                         Args:
                             dist (float): The distance value.
                         """
-                        self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:DIST {dist}")
+                        self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:DIST {dist}")
                     
                     @property
                     def units(self):
@@ -602,7 +1286,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: Return COAX for coaxial or WAVE for waveguide. 
                     """
-                    return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:MED?").rstrip()
+                    return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:MED?").rstrip()
                 
                 @media.setter
                 def media(self, type):
@@ -611,39 +1295,12 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         type (str): Pass COAX for coaxial or WAVE for waveguide.
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:EDEL:MED {type}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:EDEL:MED {type}")
 
             class Offset():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
+                    self.__context = context
 
                 @property
                 def phase(self) -> float:
@@ -652,7 +1309,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: Phase in degrees. 
                     """
-                    return float(self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:OFFS:PHAS?").rstrip())
+                    return float(self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:OFFS:PHAS?").rstrip())
                 
                 @phase.setter
                 def phase(self, value:float):
@@ -661,219 +1318,162 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         value (float): Phase in degrees, -360.0 to 360.0.
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:CORR:OFFS:PHAS {value}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:CORR:OFFS:PHAS {value}")
 
         class Data():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context, data_format):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
+                self.__data_format = data_format
 
             @property
-            def format_data(self) -> list[float]:
+            def format_data(self) -> np.ndarray:
                 """For the active or selected trace of a given channel, this command returns the formatted data array.
 
                 Returns:
-                    list[float]: Formatted data array as a list. 
+                    np.ndarray: Formatted data array of primary and secondary value pairs. 
                 """
-                strlist = self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:FDAT?").rstrip().split(',')
-                return strlist
+                return _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:FDAT?", self.__data_format)
             
             @format_data.setter
-            def format_data(self, numeric_list:list[float]):
+            def format_data(self, values:np.ndarray):
                 """For the active or selected trace of a given channel, this command writes out the formatted data array.
+                The array is sent in one message using the active data transfer format.
 
                 Args:
-                    numeric_list (list[float]): Formatted data array as a list.
+                    values (np.ndarray): Formatted data as primary and secondary value pairs, or complex values whose real and imaginary parts are the primary and secondary values.
                 """
-                strlist = ""
-                for val in numeric_list:
-                    strlist = strlist + str(val) + ","
-                self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:FDAT {strlist}")
+                _write_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:FDAT", values, self.__data_format)
             
             @property
-            def mult_trace_format_data(self) -> list[float]:
+            def mult_trace_format_data(self) -> np.ndarray:
                 """This command gets the formatted data array of multiple traces (traces n, m, .... to l) of the selected channel
 
                 Returns:
-                    list[float]: Formatted data array of multiple traces as a list. 
+                    np.ndarray: Formatted data array of multiple traces. 
                 """
-                strlist = self.__instr_obj.query(f"CALC{self.__channel}:DATA:MDAT?").rstrip().split(',')
-                return strlist
+                return _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:DATA:MDAT?", self.__data_format)
             
             @property
-            def mult_trace_corrected_data(self) -> list[float]:
+            def mult_trace_corrected_data(self) -> np.ndarray:
                 """This command gets the corrected data array of multiple traces (traces n, m, .... to l) of the selected channel
 
                 Returns:
-                    list[float]: Corrected data array of multiple traces as a list. 
+                    np.ndarray: Corrected data array of multiple traces as complex values. 
                 """
-                strlist = self.__instr_obj.query(f"CALC{self.__channel}:DATA:SDAT?").rstrip().split(',')
-                return strlist
+                return _as_complex(_query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:DATA:SDAT?", self.__data_format))
             
+            def format_data_traces(self, traces:tuple=(1,)) -> tuple[np.ndarray, np.ndarray]:
+                """Gets the formatted data arrays of several traces of the selected channel in a single transfer.
+
+                Args:
+                    traces (tuple, optional): The trace numbers to read out. Defaults to (1,).
+
+                Returns:
+                    tuple[np.ndarray, np.ndarray]: (traces, points) arrays of the primary and secondary values,
+                        where row i holds trace traces[i]. The secondary values are the phase or imaginary part
+                        in the Smith chart and polar formats and 0 in the others.
+                """
+                trace_list = ",".join(str(trace) for trace in traces)
+                values = _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:DATA:MDAT? \"{trace_list}\"", self.__data_format)
+                pairs = values.reshape(len(traces), -1, 2)
+                return pairs[:, :, 0], pairs[:, :, 1]
+
+            def corrected_data_traces(self, traces:tuple=(1,)) -> np.ndarray:
+                """Gets the corrected data arrays of several traces of the selected channel in a single transfer.
+
+                Args:
+                    traces (tuple, optional): The trace numbers to read out. Defaults to (1,).
+
+                Returns:
+                    np.ndarray: A (traces, points) complex array where row i holds trace traces[i].
+                """
+                trace_list = ",".join(str(trace) for trace in traces)
+                values = _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:DATA:SDAT? \"{trace_list}\"", self.__data_format)
+                return _as_complex(values).reshape(len(traces), -1)
+
             @property
-            def formatted_memory(self) -> list[float]:
+            def formatted_memory(self) -> np.ndarray:
                 """This command gets the formatted memory array of the active or selected channel and trace. 
 
                 Returns:
-                    list[float]: 
+                    np.ndarray: Formatted memory array of primary and secondary value pairs.
                 """
-                return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:FMEM?").rstrip().split(',')
+                return _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:FMEM?", self.__data_format)
             
             @formatted_memory.setter
-            def formatted_memory(self, numeric_list:list[float]):
+            def formatted_memory(self, values:np.ndarray):
                 """This command sets the formatted memory array of the active or selected channel and trace. 
+                The array is sent in one message using the active data transfer format.
 
                 Args:
-                    numeric_list (list[float]): Values of formatted memory. 
+                    values (np.ndarray): Values of formatted memory as primary and secondary value pairs, or complex values.
                 """
-                strlist = ""
-                for val in numeric_list:
-                    strlist = strlist + str(val) + ","
-                self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:FMEM {numeric_list}")
+                _write_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:FMEM", values, self.__data_format)
             
             @property
-            def corrected_data(self) -> list[float]:
+            def corrected_data(self) -> np.ndarray:
                 """This command gets the corrected data array of the active or selected channel and trace. 
+                The array is a view over the received buffer, complex128 for ASCII and REAL64 transfers or
+                complex64 for REAL32 transfers. Binary transfers give a read-only view; use copy() to modify it.
 
                 Returns:
-                    list[float]: Values of corrected data. 
+                    np.ndarray: Complex values of corrected data, one per measurement point. 
                 """
-                return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:SDAT?").rstrip().split(',')
+                return _as_complex(_query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:SDAT?", self.__data_format))
             
             @corrected_data.setter
-            def corrected_data(self, numeric_list:list[float]):
+            def corrected_data(self, values:np.ndarray):
                 """This command sets the corrected data array of the active or selected channel and trace. 
+                The array is sent in one message using the active data transfer format.
 
                 Args:
-                    numeric_list (list[float]): Values of corrected data.
+                    values (np.ndarray): Complex values of corrected data, or interleaved real and imaginary values.
                 """
-                strlist = ""
-                for val in numeric_list:
-                    strlist = strlist + str(val) + ","
-                self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:SDAT {numeric_list}")
+                _write_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:SDAT", values, self.__data_format)
             
             @property
-            def corrected_memory(self) -> list[float]:
+            def corrected_memory(self) -> np.ndarray:
                 """This command gets the corrected memory array of the active or selected channel and trace. 
+                The array is a complex view over the received buffer in the same way as corrected_data.
 
                 Returns:
-                    list[float]: Values of corrected memory. 
+                    np.ndarray: Complex values of corrected memory, one per measurement point. 
                 """
-                return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:SMEM?").rstrip().split(',')
+                return _as_complex(_query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:SMEM?", self.__data_format))
             
             @corrected_memory.setter
-            def corrected_memory(self, numeric_list:list[float]):
+            def corrected_memory(self, values:np.ndarray):
                 """This command sets the corrected memory array of the active or selected channel and trace. 
+                The array is sent in one message using the active data transfer format.
 
                 Args:
-                    numeric_list (list[float]): Values of corrected memory.
+                    values (np.ndarray): Complex values of corrected memory, or interleaved real and imaginary values.
                 """
-                strlist = ""
-                for val in numeric_list:
-                    strlist = strlist + str(val) + ","
-                self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:SMEM {numeric_list}")
+                _write_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:SMEM", values, self.__data_format)
             
             @property
-            def x_axis(self) -> list[float]:
+            def x_axis(self) -> np.ndarray:
                 """This command reads the data of measurement points of X axis of the active or selected channel and trace.
 
                 Returns:
-                    list[float]: Values of x-axis measurement points.
+                    np.ndarray: Values of x-axis measurement points.
                 """
-                return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:DATA:XAX?").rstrip().split(',')
+                return _query_numeric_array(self.__instr_obj, f"CALC{self.__context.channel}:TRAC{self.__context.trace}:DATA:XAX?", self.__data_format)
 
         class Filter():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.time = self.Time(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
+
+            @cached_property
+            def time(self):
+                return self.Time(self.__instr_obj, self.__context)
 
             class Time():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-                
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
+                    self.__context = context
                 
                 @property
                 def type(self) -> str:
@@ -882,7 +1482,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: Responds with BPASs or NOTCh.
                     """
-                    return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:TYPE?")
+                    return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:TYPE?")
                 
                 @type.setter
                 def type(self, type:str=""):
@@ -891,7 +1491,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         type (str, optional): BPASs or NOTCh. Defaults to "BPAS".
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:TYPE {type}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:TYPE {type}")
 
                 @property
                 def center(self) -> float:
@@ -900,7 +1500,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: The center value from -66.73E9 to +66.73E9.
                     """
-                    return float(self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:CENT?").rstrip())
+                    return float(self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:CENT?").rstrip())
                 
                 @center.setter
                 def center(self, value:float):
@@ -909,7 +1509,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         value (float): The center value -66.73E9 to +66.73E9.
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:CENT {value}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:CENT {value}")
 
                 @property
                 def shape(self) -> str:
@@ -918,7 +1518,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: Either MAXimum, MINimum, NORMal, or WIDE
                     """
-                    return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:SHAP?").rstrip()
+                    return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:SHAP?").rstrip()
                 
                 @shape.setter
                 def shape(self, shape:str="NORM"):
@@ -927,7 +1527,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         shape (str, optional): Pass MAXimum, MINimum, NORMal, or WIDE. Defaults to "NORM".
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:SHAP {shape}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:SHAP {shape}")
 
                 @property
                 def start(self) -> float:
@@ -936,7 +1536,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: The start value for the gating function. 
                     """
-                    return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:STAR?")
+                    return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:STAR?")
                 
                 @start.setter
                 def start(self, value:float):
@@ -945,7 +1545,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         value (float): The start value for the gating function. 
                     """
-                    self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:FILT:TIME:STAR {value}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:STAR {value}")
                 
                 @property
                 def state(self) -> bool:
@@ -954,7 +1554,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         bool: _description_
                     """
-                    valstr = self.__instr_obj.query(f"CALC{self.__trace}:TRAC{self.__trace}:FILT:TIME:STAT?").rstrip()
+                    valstr = self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:STAT?").rstrip()
                     if "0" in valstr:
                         retval = False
                     else:
@@ -973,39 +1573,12 @@ class BirdVectorNetworkAnalyzer():
                         altstr = "OFF"
                     else:
                         altstr = "ON"
-                    self.__instr_obj.write(f"CALC{self.__trace}:TRAC{self.__trace}:FILT:TIME:STATe {altstr}")
+                    self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FILT:TIME:STATe {altstr}")
 
         class Format():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
             @property
             def type(self) -> str:
@@ -1014,7 +1587,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     str: Returned format type of MLOG, PHAS, GDEL, SLIN, SLOG, SCOM, SMIT, SADM, PLIN, PLOG, POL, MLIN, SWR, REAL, IMAG or UPH.
                 """
-                return self.__instr_obj.query(f"CALC{self.__channel}:TRAC{self.__trace}>:FORMat?").rstrip().lower()
+                return self.__instr_obj.query(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FORMat?").rstrip().lower()
             
             @type.setter
             def type(self, type:str="mlog"):
@@ -1023,147 +1596,63 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     type (str, optional): Use one of the following - MLOGarithmic, PHASe, GDELay, SLINear, SLOGarithmic, SCOMplex, SMITh, SADMittance, PLINear, PLOGarithmic, POLar, MLINear, SWR, REAL, IMAGinary, UPHase. Defaults to "MLOG".
                 """
-                self.__instr_obj.write(f"CALC{self.__channel}:TRAC{self.__trace}:FORMat {type.upper()}")
+                self.__instr_obj.write(f"CALC{self.__context.channel}:TRAC{self.__context.trace}:FORMat {type.upper()}")
 
         class FixtureSimulate():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-                
-                self.balance = self.Balance(self.__instr_obj)
-                self.embed = self.Embed(self.__instr_obj)
-                self.send = self.Send(self.__instr_obj)
+                self.__context = context
 
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+            @cached_property
+            def balance(self):
+                return self.Balance(self.__instr_obj, self.__context)
+
+            @cached_property
+            def embed(self):
+                return self.Embed(self.__instr_obj, self.__context)
+
+            @cached_property
+            def send(self):
+                return self.Send(self.__instr_obj, self.__context)
 
             class Balance():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    self.czconversion = self.CZConversion(self.__instr_obj)
-                    self.diff_matching_circuit = self.DifferentialMatchingCircuit(self.__instr_obj)
-                    self.diffzconversion = self.DifferentialImpedanceConversion(self.__instr_obj)
-                    self.parameter = self.Parameter(self.__instr_obj)
-                    self.top = self.Top(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
+                    self.__context = context
+
+                @cached_property
+                def czconversion(self):
+                    return self.CZConversion(self.__instr_obj, self.__context)
+
+                @cached_property
+                def diff_matching_circuit(self):
+                    return self.DifferentialMatchingCircuit(self.__instr_obj, self.__context)
+
+                @cached_property
+                def diffzconversion(self):
+                    return self.DifferentialImpedanceConversion(self.__instr_obj, self.__context)
+
+                @cached_property
+                def parameter(self):
+                    return self.Parameter(self.__instr_obj, self.__context)
+
+                @cached_property
+                def top(self):
+                    return self.Top(self.__instr_obj, self.__context)
 
                 class CZConversion():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                        self.balance_port = self.BalancePort(self.__instr_obj)
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
+                        self.__context = context
 
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                    @cached_property
+                    def balance_port(self):
+                        return self.BalancePort(self.__instr_obj, self.__context)
 
                     class BalancePort():
-                        def __init__(self, instrobj):
+                        def __init__(self, instrobj, context):
                             self.__instr_obj = instrobj
-                            self.__channel = None
-                            self.__trace = None
-                            self.__marker = None
-                            self.__port = None
-                            self.__parameter = None
-                            self.__standard = None
-                            self.__cal_kit = None
-
-                        def _set_channel(self, channel):
-                            self.__channel = channel
-                        
-                        def _set_trace(self, trace):
-                            self.__trace = trace
-
-                        def _set_marker(self, marker):
-                            self.__marker = marker
-                        
-                        def _set_port(self, port):
-                            self.__port = port
-                        
-                        def _set_parameter(self, parameter):
-                            self.__parameter = parameter
-                        
-                        def _set_standard(self, standard):
-                            self.__standard = standard
-                        
-                        def _set_cal_kit(self, kit):
-                            self.__cal_kit = kit
+                            self.__context = context
 
                     @property
                     def state(self):
@@ -1182,70 +1671,18 @@ class BirdVectorNetworkAnalyzer():
                     val = type
                 
                 class DifferentialMatchingCircuit():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                    
-                        self.balance_port = self.BalancePort(self.__instr_obj)
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
+                        self.__context = context
 
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                    @cached_property
+                    def balance_port(self):
+                        return self.BalancePort(self.__instr_obj, self.__context)
 
                     class BalancePort():
-                        def __init__(self, instrobj):
+                        def __init__(self, instrobj, context):
                             self.__instr_obj = instrobj
-                            self.__channel = None
-                            self.__trace = None
-                            self.__marker = None
-                            self.__port = None
-                            self.__parameter = None
-                            self.__standard = None
-                            self.__cal_kit = None
-
-                        def _set_channel(self, channel):
-                            self.__channel = channel
-                        
-                        def _set_trace(self, trace):
-                            self.__trace = trace
-
-                        def _set_marker(self, marker):
-                            self.__marker = marker
-                        
-                        def _set_port(self, port):
-                            self.__port = port
-                        
-                        def _set_parameter(self, parameter):
-                            self.__parameter = parameter
-                        
-                        def _set_standard(self, standard):
-                            self.__standard = standard
-                        
-                        def _set_cal_kit(self, kit):
-                            self.__cal_kit = kit
+                            self.__context = context
 
                     @property
                     def state(self):
@@ -1256,70 +1693,18 @@ class BirdVectorNetworkAnalyzer():
                         v = state
 
                 class DifferentialImpedanceConversion():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                        self.balance_port = self.BalancePort(self.__instr_obj)
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
+                        self.__context = context
 
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                    @cached_property
+                    def balance_port(self):
+                        return self.BalancePort(self.__instr_obj, self.__context)
 
                     class BalancePort():
-                        def __init__(self, instrobj):
+                        def __init__(self, instrobj, context):
                             self.__instr_obj = instrobj
-                            self.__channel = None
-                            self.__trace = None
-                            self.__marker = None
-                            self.__port = None
-                            self.__parameter = None
-                            self.__standard = None
-                            self.__cal_kit = None
-
-                        def _set_channel(self, channel):
-                            self.__channel = channel
-                        
-                        def _set_trace(self, trace):
-                            self.__trace = trace
-
-                        def _set_marker(self, marker):
-                            self.__marker = marker
-                        
-                        def _set_port(self, port):
-                            self.__port = port
-                        
-                        def _set_parameter(self, parameter):
-                            self.__parameter = parameter
-                        
-                        def _set_standard(self, standard):
-                            self.__standard = standard
-                        
-                        def _set_cal_kit(self, kit):
-                            self.__cal_kit = kit
+                            self.__context = context
 
                     @property
                     def state(self):
@@ -1330,135 +1715,32 @@ class BirdVectorNetworkAnalyzer():
                         v = state
 
                 class Parameter():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
                 class Top():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
             class Embed():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    self.network = self.Network(self.__instr_obj)
-                    self.topology = self.Topology(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
+                @cached_property
+                def network(self):
+                    return self.Network(self.__instr_obj, self.__context)
+
+                @cached_property
+                def topology(self):
+                    return self.Topology(self.__instr_obj, self.__context)
 
                 class Network():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
                 @property
                 def state(self):
@@ -1469,36 +1751,9 @@ class BirdVectorNetworkAnalyzer():
                     val = state
 
                 class Topology():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
                 @property
                 def type(self):
@@ -1509,123 +1764,37 @@ class BirdVectorNetworkAnalyzer():
                     val = 1
 
             class Send():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-
-                    self.deembed = self.Deembed(self.__instr_obj)
-                    self.port_match_ckt = self.PortMatchCircuit(self.__instr_obj)
-                    self.z_conversion = self.ZConversion(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    self.deembed._set_channel(self.__channel)
-                    self.port_match_ckt._set_channel(self.__channel)
-                    self.z_conversion._set_channel(self.__channel)
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    self.deembed._set_trace(self.__trace)
-                    self.port_match_ckt._set_trace(self.__trace)
-                    self.z_conversion._set_trace(self.__trace)
+                    self.__context = context
+
+                @cached_property
+                def deembed(self):
+                    return self.Deembed(self.__instr_obj, self.__context)
+
+                @cached_property
+                def port_match_ckt(self):
+                    return self.PortMatchCircuit(self.__instr_obj, self.__context)
+
+                @cached_property
+                def z_conversion(self):
+                    return self.ZConversion(self.__instr_obj, self.__context)
 
                 class Deembed():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
+                        self.__context = context
 
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
-                
                 class PortMatchCircuit():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
                 class ZConversion():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                    
-                    def _set_trace(self, trace):
-                        self.__trace = trace
+                        self.__context = context
 
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
-            
             @property
             def state(self):
                 return 1
@@ -1635,149 +1804,41 @@ class BirdVectorNetworkAnalyzer():
                 val = 1
         
         class Function():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.domain = self.Domain(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.domain._set_channel(self.__channel)
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.domain._set_trace(self.__trace)
+                self.__context = context
 
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.domain._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.domain._set_port(self.__port)
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-                self.domain._set_parameter(self.__parameter)
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-                self.domain._set_standard(self.__standard)
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-                self.domain._set_cal_kit(self.__cal_kit)
+            @cached_property
+            def domain(self):
+                return self.Domain(self.__instr_obj, self.__context)
 
             class Domain():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-
+                    self.__context = context
 
         class Hold():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-            
-            def _set_channel(self, channel):
-                self.__channel = channel
-                #self.report._set_channel = self.__channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
+                self.__context = context
             
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-
         class Limit():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-                self.report = self.Report(self.__instr_obj)
-                self.offset = self.Offset(self.__instr_obj)
-            
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.report._set_channel = self.__channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
+                self.__context = context
 
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+            @cached_property
+            def report(self):
+                return self.Report(self.__instr_obj, self.__context)
 
+            @cached_property
+            def offset(self):
+                return self.Offset(self.__instr_obj, self.__context)
+            
             def addline(self, line:int=1, setting:str='off', startfreq:float=423e6, stopfreq:float=443e6, startlevel:float=-10.0, stoplevel:float=-10.0):
                 """For the active trace of the select channel, configures a limit line in the table for the limit test.
+                The table is read back, the line replaced (or added, with any lines before it added as off)
+                and the whole table sent again, since LIM:DATA always sets the complete table.
 
                 Args:
                     line (int, optional): Defines the limit line number. Defaults to 1.
@@ -1787,24 +1848,57 @@ class BirdVectorNetworkAnalyzer():
                     startlevel (float, optional): The start level of the limit line. Defaults to -10.0.
                     stoplevel (float, optional): The stop level of the limit line. Defaults to -10.0.
                 """
-                setting_dict = {'off': "0",
-                                'maximum': "1",
-                                'minimum': "2",
-                                'single': "3"}
-                self.__instr_obj.write(f":CALC{self.__channel}:LIM:DATA {line},{setting_dict[setting]},{startfreq},{stopfreq},{startlevel},{stoplevel}")
+                table = self.table
+                table.lines.extend([(0, 0.0, 0.0, 0.0, 0.0)] * (line - len(table)))
+                table.lines[line - 1] = (setting, startfreq, stopfreq, startlevel, stoplevel)
+                self.table = type(table)(table.lines)
             
             def clearlines(self):
                 """Clears all limit lines present configured in the table.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:LIM:DATA 0")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:LIM:DATA 0")
+
+            @property
+            def table(self):
+                """Reads back the limit table of the select channel.
+
+                Returns:
+                    LimitTable: The lines held by the analyzer, see bird_vna_limits.py.
+                """
+                from bird_vna_limits import LimitTable
+                return LimitTable.from_response(self.__instr_obj.query(f":CALC{self.__context.channel}:LIM:DATA?"))
+
+            @table.setter
+            def table(self, table):
+                """Replaces the limit table of the select channel, sending every line in a single command.
+
+                Args:
+                    table (LimitTable): The limit lines.
+                """
+                self.__instr_obj.write(f":CALC{self.__context.channel}:LIM:DATA {table.parameters()}")
+
+            def sync(self, table) -> bool:
+                """Makes the limit table of the select channel match a local table, reading the table back
+                and uploading only when its content hash differs.
+
+                Args:
+                    table (LimitTable): The limit lines.
+
+                Returns:
+                    bool: True if the table was uploaded, False if the analyzer already held it.
+                """
+                if self.table.content_hash == table.content_hash:
+                    return False
+                self.table = table
+                return True
 
             @property
             def lineenable(self) -> int:
-                return self.__instr_obj.query(f":CALC{self.__channel}:LIM:DISP?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:LIM:DISP?")
             
             @lineenable.setter
             def lineenable(self, state:int=1):
-                self.__instr_obj.write(f":CALC{self.__channel}:LIM:DISP {state}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:LIM:DISP {state}")
 
             @property
             def teststate(self) -> int:
@@ -1813,7 +1907,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: 1 for ON, 0 for OFF.
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:LIM?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:LIM?")
             
             @teststate.setter
             def teststate(self, state:int=0):
@@ -1822,162 +1916,51 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     state (int, optional): 1 for ON, 0 for OFF. Defaults to 0.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:LIM {state}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:LIM {state}")
             
             def failstatus(self):
                 """For the active trace of a select channel, reads out the limit test result.
 
                 Returns:
-                    _type_: 0 for FAIL, 1 for PASS.
+                    str: "1" for FAIL, "0" for PASS.
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:LIM:FAIL?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:LIM:FAIL?")
 
             class Report():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-            
             class Offset():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
+                    self.__context = context
 
         class Marker():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.bandwidth = self.Bandwidth(self.__instr_obj)
-                self.function = self.Function(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.bandwidth._set_channel(self.__channel)
-                self.function._set_channel(self.__channel)
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.bandwidth._set_trace(self.__trace)
-                self.function._set_trace(self.__trace)
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.bandwidth._set_marker(self.__marker)
-                self.function._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.bandwidth._set_port(self.__port)
-                self.function._set_port(self.__port)
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-                self.bandwidth._set_parameter(self.__parameter)
-                self.function._set_parameter(self.__parameter)
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-                self.bandwidth._set_standard(self.__standard)
-                self.function._set_standard(self.__standard)
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-            
+                self.__context = context
+
+            @cached_property
+            def bandwidth(self):
+                return self.Bandwidth(self.__instr_obj, self.__context)
+
+            @cached_property
+            def function(self):
+                return self.Function(self.__instr_obj, self.__context)
+
             class Bandwidth():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
                 def searchdata(self) -> tuple[float, float, float, float, float, float]:
                     """For the active trace of a select channel, reads out the bandwidth search result of marker 1 to marker 15, and reference marker(Mk:16).
 
                     Returns:
                         tuple[float, float, float, float, float, float]: Six values that represent bandwidth, center, min, max, q, and loss
                     """
-                    data0, data1, data2, data3, data4, data5 = self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:BWID:DATA?").rstrip().split(',')
+                    data0, data1, data2, data3, data4, data5 = self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:BWID:DATA?").rstrip().split(',')
                     return float(data0), float(data1), float(data2), float(data3), float(data4), float(data5)
                 
                 @property
@@ -1987,7 +1970,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: Will report as 'mark', 'max', or 'min'.
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK:BWID:REF?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK:BWID:REF?")
                 
                 @searchreference.setter
                 def searchreference(self, ref:str='marker'):
@@ -2000,7 +1983,7 @@ class BirdVectorNetworkAnalyzer():
                                 'maximum': "MAX",
                                 'minimum': "MIN",
                                 }
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK:BWID:REF {ref_dict[ref]}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK:BWID:REF {ref_dict[ref]}")
 
                 @property
                 def searchstate(self) -> int:
@@ -2009,7 +1992,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         int: 1 for ON, 0 for OFF.
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK:BWID?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK:BWID?")
                 
                 @searchstate.setter
                 def searchstate(self, state:int=0):
@@ -2018,7 +2001,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         state (int, optional): 1 for ON, 0 for OFF. Defaults to 0.
                     """
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK:BWID {state}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK:BWID {state}")
                 
                 @property
                 def searchtype(self) -> str:
@@ -2027,7 +2010,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: Reports 'bandpass' or 'notch'.
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:BWID:TYPE?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:BWID:TYPE?")
 
                 @searchtype.setter
                 def searchtype(self, setting:str='bandpass'):
@@ -2039,7 +2022,7 @@ class BirdVectorNetworkAnalyzer():
                     bwtype_dict = {'bandpass': "BPAS",
                                    'notch': "NOTC",
                                    }
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:BWID:TYPE {bwtype_dict[setting]}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:BWID:TYPE {bwtype_dict[setting]}")
 
                 @property
                 def searchvalue(self) -> float:
@@ -2048,7 +2031,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: The reference value.
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:BWID:THR?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:BWID:THR?")
                 
                 @searchvalue.setter
                 def searchvalue(self, value:float=-1.0):
@@ -2057,40 +2040,17 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         value (float, optional): The reference value. Defaults to -1.0.
                     """
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:BWID:THR {value}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:BWID:THR {value}")
 
             class Function():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                
                 def seachexecute(self):
                     """Executes the marker search defined by the set parameters. 
                     """
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:FUNC:EXEC")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:FUNC:EXEC")
 
                 @property
                 def searchtarget(self) -> float:
@@ -2099,7 +2059,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         float: The target value. 
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:FUNC:TARG?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:FUNC:TARG?")
 
                 @searchtarget.setter
                 def searchtarget(self, target:float=-10.0):
@@ -2108,7 +2068,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         target (float, optional): The target value. Defaults to -10.0.
                     """
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:FUNC:TARG {target}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:FUNC:TARG {target}")
 
                 @property
                 def searchtype(self) -> str:
@@ -2117,7 +2077,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: May be 'max', 'min', 'peak', 'lpe', 'rpe', 'targ', 'ltar', or 'rtar'. Consult the programmer's manual for details.
                     """
-                    return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:FUNC:TYPE?")
+                    return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:FUNC:TYPE?")
                 
                 @searchtype.setter
                 def searchtype(self, search:str='maximum'):
@@ -2135,7 +2095,7 @@ class BirdVectorNetworkAnalyzer():
                                 'leftarget': "LTAR",
                                 'righttarget': "RTAR",
                                 }
-                    self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:FUNC:TYPE {search_dict[search]}")
+                    self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:FUNC:TYPE {search_dict[search]}")
             
             def set(self, location:str="center"):
                 """For the active trace of a select channel, sets the position value of the marker to the x-axis location specified. These are the quick options when a specific frequency is not applied.
@@ -2151,7 +2111,7 @@ class BirdVectorNetworkAnalyzer():
                                  "ref_marker": "RMAR",
                                  "span": "SPAN",
                                 }
-                self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:SET {location_dict[location]}") 
+                self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:SET {location_dict[location]}") 
 
             @property
             def state(self) -> int:
@@ -2160,7 +2120,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: Either 1 for ON or 0 for OFF.
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}?")
             
             @state.setter
             def state(self, state:int=1):
@@ -2169,7 +2129,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     state (int, optional): Either 1 for ON or 0 for OFF. Defaults to 1.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker} {state}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker} {state}")
 
             @property
             def x(self) -> float:
@@ -2178,7 +2138,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: Frequency of the active marker in Hz. 
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:X?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:X?")
             
             @x.setter
             def x(self, frequency:float=500e6):
@@ -2187,112 +2147,59 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     frequency (float, optional): Frequency of the active marker in Hz. Defaults to 500e6.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:MARK{self.__marker}:X {frequency}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:MARK{self.__context.marker}:X {frequency}")
 
             def y(self) -> tuple[float, float]:
                 """For the active trace of a select channel, reads out the response value of marker 1 to marker 15 or reference marker.
 
                 Returns:
-                    tuple[float, float]: Two values may be given. The primary response value and the secondary value at the marker position. The secondary value is always 0 when the data format is not set to Smith chart or the polar.
+                    tuple[float, float]: Two values may be given. The primary response value and the secondary value at the marker position. The secondary value is always 0 when the data format is not set to Smith chart or the polar.
+                """
+                temp1, temp2 = self.__instr_obj.query(f":CALC{self.__context.channel}:MARK{self.__context.marker}:Y?").rstrip().split(',')
+                return float(temp1), float(temp2)
+
+            def readout(self, traces:tuple=None, markers:tuple=(1,)) -> np.ndarray:
+                """Reads the position and response of several markers on several traces of a select channel
+                in one compound query rather than two queries per marker. Tables whose queries do not fit
+                in one 4096 byte message are split over several messages. The readout is sent as a transaction
+                of its own and returns the finished table, so it cannot be called inside transaction().
+
+                Args:
+                    traces (tuple, optional): The trace numbers to read. Defaults to the active trace.
+                    markers (tuple, optional): The marker numbers (1 to 15, 16 for the reference marker) read on every trace. Defaults to (1,).
+
+                Returns:
+                    np.ndarray: Structured array with one row per trace and marker and the fields trace, marker,
+                    x (stimulus value), y1 (primary response) and y2 (secondary response).
                 """
-                temp1, temp2 = self.__instr_obj.query(f":CALC{self.__channel}:MARK{self.__marker}:Y?").rstrip().split(',')
-                return float(temp1), float(temp2)
+                if self.__instr_obj.transaction is not None:
+                    raise RuntimeError("marker.readout() sends its own transaction; call it outside transaction().")
+                traces = (self.__context.trace,) if traces is None else traces
+                rows = [(trace, marker) for trace in traces for marker in markers]
+                with Transaction(self.__instr_obj) as txn:
+                    readings = [(txn.query(f":CALC{self.__context.channel}:TRAC{trace}:MARK{marker}:X?"),
+                                 txn.query(f":CALC{self.__context.channel}:TRAC{trace}:MARK{marker}:Y?"))
+                                for trace, marker in rows]
+                table = np.zeros(len(rows), dtype=_MARKER_READOUT_DTYPE)
+                for row, ((trace, marker), (x, y)) in enumerate(zip(rows, readings)):
+                    y1, y2 = y.result().split(',')
+                    table[row] = (trace, marker, float(x.result()), float(y1), float(y2))
+                return table
 
         class Math():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
         class MathStatistics():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
         class Parameter():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
             @property
             def tracecount(self) -> int:
@@ -2301,7 +2208,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: Number of traces.
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:PAR:COUN?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:PAR:COUN?")
 
             @tracecount.setter
             def tracecount(self, count:int=1):
@@ -2310,7 +2217,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     count (int, optional): The number of traces for the channel to use. Defaults to 1.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:PAR:COUN {count}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:PAR:COUN {count}")
 
             @property
             def traceselect(self) -> int:
@@ -2319,7 +2226,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: The trace number of interest.
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:PAR{self.__trace}:SEL?")
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:PAR{self.__context.trace}:SEL?")
             
             @traceselect.setter
             def traceselect(self, activetrace:int=1):
@@ -2328,7 +2235,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     activetrace (int, optional): _description_. Defaults to 1.
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:PAR{activetrace}:SEL")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:PAR{activetrace}:SEL")
 
             @property
             def trace_sparam(self) -> str:
@@ -2337,7 +2244,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     str: Model/port count depended. Examples: "s11", "s22", "s12", "s21", "s13", etc. 
                 """
-                return self.__instr_obj.query(f":CALC{self.__channel}:PAR{self.__trace}:DEF?").rstrip()
+                return self.__instr_obj.query(f":CALC{self.__context.channel}:PAR{self.__context.trace}:DEF?").rstrip()
             
             @trace_sparam.setter
             def trace_sparam(self, sparam:str="s11"):
@@ -2346,175 +2253,44 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     sparam (str, optional): Model, port count dependent. Options include "s11", "s22", "s12", "s21", "s13", etc.  Defaults to "s11".
                 """
-                self.__instr_obj.write(f":CALC{self.__channel}:PAR{self.__trace}:DEF {sparam.upper()}")
+                self.__instr_obj.write(f":CALC{self.__context.channel}:PAR{self.__context.trace}:DEF {sparam.upper()}")
 
         class RippleLimit():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                #self.report._set_channel = self.__channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
         class Smoothing():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
         class Transform():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-            
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
 
     class Display():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-            self.color = self.Color(self.__instr_obj)
-            self.window = self.Window(self.__instr_obj)
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-            self.color._set_channel(self.__channel)
-            self.window._set_channel(self.__channel)
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-            self.color._set_trace(self.__trace)
-            self.window._set_trace(self.__trace)
-        
-        def _set_marker(self, marker):
-            self.__marker = marker
-            self.color._set_marker(self.__marker)
-            self.window._set_marker(self.__marker)
-        
-        def _set_port(self, port):
-            self.__port = port
-            self.color._set_port(self.__port)
-            self.window._set_port(self.__port)
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
+
+        @cached_property
+        def color(self):
+            return self.Color(self.__instr_obj, self.__context)
+
+        @cached_property
+        def window(self):
+            return self.Window(self.__instr_obj, self.__context)
 
         class Color():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-
-                self.trace = self.Trace(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.trace._set_channel(self.__channel)
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.trace._set_trace(self.__trace)
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.trace._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.trace._set_port(self.__port)
+                self.__context = context
+
+            @cached_property
+            def trace(self):
+                return self.Trace(self.__instr_obj, self.__context)
 
             def reset(self):
                 """
@@ -2523,25 +2299,10 @@ class BirdVectorNetworkAnalyzer():
                 self.__instr_obj.write(f":DISP:COL:RES")
 
             class Trace():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                
-                def _set_channel(self, channel):
-                    self.__channel = channel
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                
-                def _set_marker(self, marker):
-                    self.__marker = marker
+                    self.__context = context
                 
-                def _set_port(self, port):
-                    self.__port = port
-
                 def data(self, red:int=128, green:int=128, blue:int=128):
                     self.__instr_obj.write(f":DISP:COL:TRAC:DATA {red},{green},{blue}")  
 
@@ -2557,30 +2318,13 @@ class BirdVectorNetworkAnalyzer():
             self.__instr_obj.write(f":DISP:FSIG {state}")
             
         class Window():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-
-                self.trace = self.Trace(self.__instr_obj)
-            
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.trace._set_channel(self.__channel)
+                self.__context = context
 
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.trace._set_trace(self.__trace)
-            
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.trace._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.trace._set_port(self.__port)
+            @cached_property
+            def trace(self):
+                return self.Trace(self.__instr_obj, self.__context)
             
             @property
             def layout(self) -> int:
@@ -2606,7 +2350,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: Channel layout pattern.
                 """
-                return self.__instr_obj.query(f":DISP:WIND{self.__channel}:SPL?")
+                return self.__instr_obj.query(f":DISP:WIND{self.__context.channel}:SPL?")
 
             @layout.setter
             def layout(self, arrangement:int=1):
@@ -2649,73 +2393,41 @@ class BirdVectorNetworkAnalyzer():
                                '15': "D1234__CDEF",
                             }
                 
-                self.__instr_obj.write(f":DISP:WIND{self.__channel}:SPL {layout_dict[str(arrangement)]}")
+                self.__instr_obj.write(f":DISP:WIND{self.__context.channel}:SPL {layout_dict[str(arrangement)]}")
 
             @property
             def maximize(self) -> int:
-                return self.__instr_obj.query(f":DISP:WIND{self.__channel}:MAX?")
+                return self.__instr_obj.query(f":DISP:WIND{self.__context.channel}:MAX?")
             
             @maximize.setter
             def maximize(self, state:int=0):
-                self.__instr_obj.write(f":DISP:WIND{self.__channel}:MAX {state}")
+                self.__instr_obj.write(f":DISP:WIND{self.__context.channel}:MAX {state}")
 
             class Trace():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-
-                    self.y = self.Y(self.__instr_obj)
-                
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    self.y._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    self.y._set_trace(self.__trace)
+                    self.__context = context
 
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    self.y._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    self.y._set_port(self.__port)
+                @cached_property
+                def y(self):
+                    return self.Y(self.__instr_obj, self.__context)
                 
                 class Y():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                    
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-                    
-                    def _set_marker(self, marker):
-                        self.__marker = marker
+                        self.__context = context
                     
-                    def _set_port(self, port):
-                        self.__port = port
-
                     def autoscale(self):
                         """
                         For a select trace of a select channel, executes the auto scale (function to
                         automatically adjust the value of the reference graticule and the scale per
                         division to display t he trace appropriately).
                         """
-                        self.__instr_obj.write(f"DISP:WIND{self.__channel}:TRAC{self.__trace}:Y:AUTO")
+                        self.__instr_obj.write(f"DISP:WIND{self.__context.channel}:TRAC{self.__context.trace}:Y:AUTO")
                     
                     @property
                     def scale(self) -> float:
-                       strval = self.__instr_obj.query(f"DISP:WIND{self.__channel}:TRAC{self.__trace}:Y:PDIV?").rstrip()
+                       strval = self.__instr_obj.query(f"DISP:WIND{self.__context.channel}:TRAC{self.__context.trace}:Y:PDIV?").rstrip()
                        return float(strval)
                 
                     @scale.setter
@@ -2728,114 +2440,103 @@ class BirdVectorNetworkAnalyzer():
                         Args:
                             per_division (float, optional): _description_. Defaults to 10.0.
                         """
-                        self.__instr_obj.write(f"DISP:WIND{self.__channel}:TRAC{self.__trace}:Y:PDIV {per_division}")
+                        self.__instr_obj.write(f"DISP:WIND{self.__context.channel}:TRAC{self.__context.trace}:Y:PDIV {per_division}")
 
         @property
         def enable(self) -> int:
-            self.__instr_obj.write(f":DISP:ENAB?")  
+            return int(self.__instr_obj.query(f":DISP:ENAB?"))
         
         @enable.setter
         def enable(self, state:str="on"):
             self.__instr_obj.write(f":DISP:ENAB {state}")
 
     class Format():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context, data_format):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
+            self.__data_format = data_format
+
+        @property
+        def data(self) -> str:
+            """Gets the format used to transfer numeric data arrays such as trace data, memory and the x-axis.
+
+            Returns:
+                str: 'ascii', 'real32' or 'real64'.
+            """
+            temp = self.__instr_obj.query(f":FORM:DATA?").rstrip().upper()
+            if "32" in temp:
+                self.__data_format.data = "REAL32"
+                retval = "real32"
+            elif "REAL" in temp:
+                self.__data_format.data = "REAL"
+                retval = "real64"
+            else:
+                self.__data_format.data = "ASC"
+                retval = "ascii"
+            return retval
+
+        @data.setter
+        def data(self, data_format:str="ascii"):
+            """Sets the format used to transfer numeric data arrays. The binary formats use IEEE 488.2
+            definite-length blocks and, when selected, the byte order is set to match this computer so
+            that the received blocks can be used without swapping.
+
+            Args:
+                data_format (str, optional): 'ascii', 'real32' or 'real64'. Defaults to "ascii".
+            """
+            data_dict = {'ascii': "ASC",
+                         'real32': "REAL32",
+                         'real64': "REAL",
+                         }
+            self.__instr_obj.write(f":FORM:DATA {data_dict[data_format]}")
+            self.__data_format.data = data_dict[data_format]
+            if data_format != 'ascii':
+                if sys.byteorder == "little":
+                    self.border = 'swapped'
+                else:
+                    self.border = 'normal'
+
+        @property
+        def border(self) -> str:
+            """Gets the byte order used for binary data transfers.
+
+            Returns:
+                str: 'normal' for big-endian or 'swapped' for little-endian.
+            """
+            temp = self.__instr_obj.query(f":FORM:BORD?").rstrip().upper()
+            if "SWAP" in temp:
+                self.__data_format.border = "SWAP"
+                retval = "swapped"
+            else:
+                self.__data_format.border = "NORM"
+                retval = "normal"
+            return retval
+
+        @border.setter
+        def border(self, order:str="normal"):
+            """Sets the byte order used for binary data transfers.
+
+            Args:
+                order (str, optional): 'normal' for big-endian or 'swapped' for little-endian. Defaults to "normal".
+            """
+            border_dict = {'normal': "NORM",
+                           'swapped': "SWAP",
+                           }
+            self.__instr_obj.write(f":FORM:BORD {border_dict[order]}")
+            self.__data_format.border = border_dict[order]
 
     class HardCopy():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-        
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-    
+            self.__context = context
+
     class Initiate():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-        
+            self.__context = context
+
         def once(self):
-            self.__instr_obj.write(f":INIT{self.__channel}")
+            self.__instr_obj.write(f":INIT{self.__context.channel}")
         
         @property
         def continuous(self) -> int:
@@ -2844,97 +2545,35 @@ class BirdVectorNetworkAnalyzer():
             Returns:
                 int: 1 for ON, 0 for OFF
             """
-            self.__instr_obj.query(f":INIT{self.__channel}:CONT?")
+            return int(self.__instr_obj.query(f":INIT{self.__context.channel}:CONT?"))
 
+        @continuous.setter
         def continuous(self, state:int=1):
             """Sets the state of continuous initiation mode for a select channel in the trigger system.
 
             Args:
                 state (int, optional): 1 for ON, 0 for OFF. Defaults to 1.
             """
-            self.__instr_obj.write(f":INIT{self.__channel}:CONT {state}")
+            self.__instr_obj.write(f":INIT{self.__context.channel}:CONT {state}")
 
     class Mmemory():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-            self.load = self.Load(self.__instr_obj)
-            self.store = self.Store(self.__instr_obj)
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-            self.load._set_channel(self.__channel)
-            self.store._set_channel(self.__channel)
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-            self.load._set_trace(self.__trace)
-            self.store._set_trace(self.__trace)
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-            self.load._set_marker(self.__marker)
-            self.store._set_marker(self.__marker)
-        
-        def _set_port(self, port):
-            self.__port = port
-            self.load._set_port(self.__port)
-            self.store._set_port(self.__port)
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-            self.load._set_parameter(self.__parameter)
-            self.store._set_parameter(self.__parameter)
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-            self.load._set_standard(self.__standard)
-            self.store._set_standard(self.__standard)
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-            self.load._set_cal_kit(self.__cal_kit)
-            self.store._set_cal_kit(self.__cal_kit)
-        
+            self.__context = context
+
+        @cached_property
+        def load(self):
+            return self.Load(self.__instr_obj, self.__context)
+
+        @cached_property
+        def store(self):
+            return self.Store(self.__instr_obj, self.__context)
+
         class Load():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-            
+                self.__context = context
+
             def segment_table(self, filename:str="seg_table.seg"):
                 """Description: Recalls the specified segment sweep table file.
 
@@ -2955,37 +2594,10 @@ class BirdVectorNetworkAnalyzer():
                 self.__instr_obj.write(f":MMEM:LOAD {filename}")
 
         class Store():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-            
+                self.__context = context
+
             def segment_table(self, filename:str="seg_table.seg"):
                 """Description: Save the segment sweep table for the active channel into a file in the SEG format.
 
@@ -3012,7 +2624,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     str: "STAT" for state only, "CST" for calibration+state, "DST" for data+state, or "CDST" for calibration+data+state
                 """
-                return self.__instr_obj.write(f":MMEM:STOR:STYP?")
+                return self.__instr_obj.query(f":MMEM:STOR:STYP?").rstrip()
 
             @statetype.setter
             def statetype(self, select:str='state'):
@@ -3037,142 +2649,45 @@ class BirdVectorNetworkAnalyzer():
         val = 1
 
     class Sense():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context, data_format):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-            self.correction = self.Correction(self.__instr_obj)
-            self.frequency  = self.Frequency(self.__instr_obj)
-            self.sweep      = self.Sweep(self.__instr_obj)
-            self.segment    = self.Segment(self.__instr_obj)
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-            self.correction._set_channel(self.__channel)
-            self.frequency._set_channel(self.__channel)
-            self.sweep._set_channel(self.__channel)
-            self.segment._set_channel(self.__channel)
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-            self.correction._set_trace(self.__trace)
-            self.frequency._set_trace(self.__trace)
-            self.sweep._set_trace(self.__trace)
-            self.segment._set_trace(self.__trace)
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-            self.correction._set_marker(self.__marker)
-            self.frequency._set_marker(self.__marker)
-            self.sweep._set_marker(self.__marker)
-            self.segment._set_marker(self.__marker)
-        
-        def _set_port(self, port):
-            self.__port = port
-            self.correction._set_port(self.__port)
-            self.frequency._set_port(self.__port)
-            self.segment._set_port(self.__port)
-            self.sweep._set_port(self.__port)
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-            self.correction._set_parameter(self.__parameter)
-            self.frequency._set_parameter(self.__parameter)
-            self.segment._set_parameter(self.__parameter)
-            self.sweep._set_parameter(self.__parameter)
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-            self.correction._set_standard(self.__standard)
-            self.frequency._set_standard(self.__parameter)
-            self.segment._set_standard(self.__parameter)
-            self.sweep._set_standard(self.__parameter)
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-            self.correction._set_cal_kit(self.__cal_kit)
-            self.frequency._set_cal_kit(self.__cal_kit)
-            self.segment._set_cal_kit(self.__cal_kit)
-            self.sweep._set_cal_kit(self.__cal_kit)
-        
+            self.__context = context
+            self.__data_format = data_format
+
+        @cached_property
+        def correction(self):
+            return self.Correction(self.__instr_obj, self.__context)
+
+        @cached_property
+        def frequency(self):
+            return self.Frequency(self.__instr_obj, self.__context, self.__data_format)
+
+        @cached_property
+        def sweep(self):
+            return self.Sweep(self.__instr_obj, self.__context)
+
+        @cached_property
+        def segment(self):
+            return self.Segment(self.__instr_obj, self.__context)
+
         class Segment():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.list = self.List(self.__instr_obj)
-                self.sweep = self.Sweep(self.__instr_obj)
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.list._set_channel(self.__channel)
-                self.sweep._set_channel(self.__channel)
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.list._set_trace(self.__trace)
-                self.sweep._set_trace(self.__trace)
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.list._set_marker(self.__marker)
-                self.sweep._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.list._set_port(self.__port)
-                self.sweep._set_port(self.__port)
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-                self.list._set_parameter(self.__parameter)
-                self.sweep._set_parameter(self.__parameter)
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-                self.list._set_standard(self.__standard)
-                self.sweep._set_standard(self.__standard)
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-                self.list._set_cal_kit(self.__cal_kit)
-                self.sweep._set_cal_kit(self.__cal_kit)
-            
+                self.__context = context
+
+            @cached_property
+            def list(self):
+                return self.List(self.__instr_obj, self.__context)
+
+            @cached_property
+            def sweep(self):
+                return self.Sweep(self.__instr_obj, self.__context)
+
             class List():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-                
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
+                    self.__context = context
                 
-                def _set_port(self, port):
-                    self.__port = port
-
                 @property
                 def controldata(self) -> str:
                     """This command gets the state of each segment in the segment sweep table of selected channel
@@ -3180,7 +2695,7 @@ class BirdVectorNetworkAnalyzer():
                     Returns:
                         str: A string list of 1's or 0's indicating the enabled state of an individual segment in a segmented sweep.
                     """
-                    return self.__instr_obj.query(f":SENS{self.__channel}:SEGM:LIST:CONT:DATA?")
+                    return self.__instr_obj.query(f":SENS{self.__context.channel}:SEGM:LIST:CONT:DATA?")
                 
                 @controldata.setter
                 def controldata(self, settingstuple:tuple):
@@ -3199,13 +2714,13 @@ class BirdVectorNetworkAnalyzer():
                             strlist = strlist + "," + str(j)
                     
                     k = 0
-                    self.__instr_obj.write(f":SENS{self.__channel}:SEGM:LIST:CONT:DATA {strlist}")
+                    self.__instr_obj.write(f":SENS{self.__context.channel}:SEGM:LIST:CONT:DATA {strlist}")
             
             def create_segment_table(self, mode:int=0, ifbw_en:int=1, pwr_en:int=0, del_en:int=0, swp_en:int=0, time_en:int=0, segment_count:int=1, 
                                      start_n:tuple=(300e3), stop_n:tuple=(300e3), pts_n:tuple=(2), ifbw_n:tuple=(70e3), pow_n:tuple=(0.0), del_n:tuple=(0.0),
                                      swp_n:tuple=("LIN"), time_n:tuple=(0)):
                 status = 0
-                cmd_str = f":SENS{self.__channel}:SEGM:DATA 5,{mode},{ifbw_en},{pwr_en},{del_en},{swp_en},{time_en},{segment_count}"
+                cmd_str = f":SENS{self.__context.channel}:SEGM:DATA 5,{mode},{ifbw_en},{pwr_en},{del_en},{swp_en},{time_en},{segment_count}"
                 print(cmd_str)
 
                 # verify that all required segment inputs have the same index count
@@ -3242,7 +2757,7 @@ class BirdVectorNetworkAnalyzer():
                         cmd_add += f",{pts_n[j]}"
                         if ifbw_en == 1:
                             cmd_add += f",{ifbw_n[j]}"
-                        if pow_n == 1:
+                        if pwr_en == 1:
                             cmd_add += f",{pow_n[j]}"
                         if del_en == 1:
                             cmd_add += f",{del_n[j]}"
@@ -3255,96 +2770,63 @@ class BirdVectorNetworkAnalyzer():
                 return status
             
             def retrieve_segment_table(self):
-                self.__instr_obj.write(f":SENS{self.__channel}:SEGM:LIST:CONT:DATA?")
+                self.__instr_obj.write(f":SENS{self.__context.channel}:SEGM:LIST:CONT:DATA?")
                 return 0
             
             class Sweep():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
+                    self.__context = context
                                 
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                
-                def _set_trace(self, trace):
-                    self.__trace = trace
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                
-                def _set_port(self, port):
-                    self.__port = port
-
                 def points(self) -> int:
-                    count = int(self.__instr_obj.query(f":SENS{self.__channel}:SEGM:SWE:POIN?").rstrip())
+                    count = int(self.__instr_obj.query(f":SENS{self.__context.channel}:SEGM:SWE:POIN?").rstrip())
                     return count
                 
                 def time(self) -> float:
-                    summedtime = float(self.__instr_obj.query(f":SENS{self.__channel}:SEGM:SWE:TIME?").rstrip())
+                    summedtime = float(self.__instr_obj.query(f":SENS{self.__context.channel}:SEGM:SWE:TIME?").rstrip())
                     return summedtime
 
         class Correction():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-                self.collection = self.Collection(self.__instr_obj)
-                self.extension   = self.Extension(self.__instr_obj)
-                self.impedance  = self.Impedance(self.__instr_obj)
-                self.offset     = self.Offset(self.__instr_obj)
-                self.port       = self.Port(self.__instr_obj)
-                self.receiver   = self.Receiver(self.__instr_obj)
-                self.transform  = self.Transform(self.__instr_obj)
-                self.trigger    = self.Trigger(self.__instr_obj)
-                self.vmc        = self.VMC(self.__instr_obj)
+                self.__context = context
+
+            @cached_property
+            def collection(self):
+                return self.Collection(self.__instr_obj, self.__context)
+
+            @cached_property
+            def extension(self):
+                return self.Extension(self.__instr_obj, self.__context)
+
+            @cached_property
+            def impedance(self):
+                return self.Impedance(self.__instr_obj, self.__context)
+
+            @cached_property
+            def offset(self):
+                return self.Offset(self.__instr_obj, self.__context)
+
+            @cached_property
+            def port(self):
+                return self.Port(self.__instr_obj, self.__context)
+
+            @cached_property
+            def receiver(self):
+                return self.Receiver(self.__instr_obj, self.__context)
+
+            @cached_property
+            def transform(self):
+                return self.Transform(self.__instr_obj, self.__context)
+
+            @cached_property
+            def trigger(self):
+                return self.Trigger(self.__instr_obj, self.__context)
+
+            @cached_property
+            def vmc(self):
+                return self.VMC(self.__instr_obj, self.__context)
                 
-            def _set_channel(self, channel):
-                self.__channel = channel
-                self.collection._set_channel(self.__channel)
-                self.extension._set_channel(self.__channel)
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-                self.collection._set_trace(self.__trace)
-                self.extension._set_trace(self.__trace)
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-                self.collection._set_marker(self.__marker)
-                self.extension._set_marker(self.__marker)
-            
-            def _set_port(self, port):
-                self.__port = port
-                self.collection._set_port(self.__port)
-                self.extension._set_port(self.__port)
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-                self.collection._set_parameter(self.__parameter)
-                self.extension._set_parameter(self.__parameter)
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-                self.collection._set_standard(self.__standard)
-                self.extension._set_standard(self.__standard)
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
-                self.collection._set_cal_kit(self.__cal_kit)
-                self.extension._set_cal_kit(self.__cal_kit)
-            
             @property
             def characteristic_impedance(self) -> float:
                 """This command gets the system characteristic impedance (Z0) value
@@ -3352,7 +2834,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: _description_
                 """
-                return self.__instr_obj.query(f":SENS{self.__channel}:CORR:IMP?")
+                return self.__instr_obj.query(f":SENS{self.__context.channel}:CORR:IMP?")
             
             @characteristic_impedance.setter
             def characteristic_impedance(self, value:float=50.0):
@@ -3361,7 +2843,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     value (float, optional): The characteristic impedance value. Defaults to 50.0.
                 """
-                self.__instr_obj.write(f":SENS{self.__channel}:CORR:IMP {value}")
+                self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:IMP {value}")
             
             @property
             def state(self):
@@ -3370,7 +2852,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     state (int, optional): 0 for OFF; 1 for ON. Defaults to 0.
                 """
-                self.__instr_obj.write(f":SENS{self.__channel}:CORR:STAT?")
+                return int(self.__instr_obj.query(f":SENS{self.__context.channel}:CORR:STAT?"))
 
             @state.setter
             def state(self, state:int=0):
@@ -3379,49 +2861,16 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     state (int, optional): 0 for OFF; 1 for ON. Defaults to 0.
                 """
-                self.__instr_obj.write(f":SENS{self.__channel}:CORR:STAT {state}")
-            
+                self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:STAT {state}")
             
             class Collection():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    self.calkit     = self.CalKit(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    self.calkit._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    self.calkit._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    self.calkit._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    self.calkit._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    self.calkit._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    self.calkit._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    self.calkit._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                @cached_property
+                def calkit(self):
+                    return self.CalKit(self.__instr_obj, self.__context)
 
                 def calibrate_load(self, port:int=1):
                     """Measures the calibration data of the load standard for the specified port.
@@ -3429,7 +2878,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         port (int, optional): The number of port 1 to 4 (model dependent). Defaults to 1.
                     """
-                    self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:LOAD {port}")
+                    self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:LOAD {port}")
 
                 def calibrate_open(self, port:int=1):
                     """Measures the calibration data of the open standard for the specified port.
@@ -3437,13 +2886,13 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         port (int, optional): The number of port 1 to 4 (model dependent). Defaults to 1.
                     """
-                    self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:OPEN {port}")
+                    self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:OPEN {port}")
                 
                 def calibrate_save(self):
                     """From the measured calibration data, calculates the calibration coefficients
                     depending on the selected calibration type.
                     """
-                    self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:SAVE")
+                    self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:SAVE")
                 
                 def calibrate_short(self, port:int=1):
                     """Measures the calibration data of the short standard for the specified port.
@@ -3451,7 +2900,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         port (int, optional): The number of port 1 to 4 (model dependent). Defaults to 1.
                     """
-                    self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:SHOR {port}")
+                    self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:SHOR {port}")
 
                 def calibrate_through(self, porta:int=1, portb:int=2):
                     """Measures the calibration data of the through standard for the specified port.
@@ -3459,7 +2908,7 @@ class BirdVectorNetworkAnalyzer():
                     Args:
                         port (int, optional): The number of port 1 to 4 (model dependent). Defaults to 1.
                     """
-                    self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:THRU {porta},{portb}")
+                    self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:THRU {porta},{portb}")
 
                 def electronic_calibration(self, caltype:str='solt1', porta:int=1, portb:int=2, portc:int=3, portd:int=4):
                     """This method executes a 1-, 2-, 3-, or 4-port calibration of the specified port(s) of the active channel using the ECal (Electronic Calibration) module.
@@ -3472,13 +2921,13 @@ class BirdVectorNetworkAnalyzer():
                         portd (int, optional): Defines the port on the VNA which will be calibrated. Defaults to 4.
                     """
                     if caltype == "solt1":
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:ECAL:SOLT1 {porta}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:ECAL:SOLT1 {porta}")
                     elif caltype == "solt2":
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:ECAL:SOLT2 {porta},{portb}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:ECAL:SOLT2 {porta},{portb}")
                     elif caltype == "solt3":
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:ECAL:SOLT3 {porta},{portb},{portc}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:ECAL:SOLT3 {porta},{portb},{portc}")
                     elif caltype == "solt4":
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:ECAL:SOLT4 {porta},{portb},{portc},{portd}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:ECAL:SOLT4 {porta},{portb},{portc},{portd}")
                     
                 def method(self, method:str='open', porta:int=1, portb:int=2, portc:int=3, portd:int=4):
                     """Sets the calibration method to be applied upon successful calibration measurements.
@@ -3509,45 +2958,18 @@ class BirdVectorNetworkAnalyzer():
                                    }
                     
                     if (method == "thru") or (method == "2port") or (method == "eres"):
-                        self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb}")
+                        self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb}")
                     elif method == "3port":
-                        self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb},{portc}")
+                        self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb},{portc}")
                     elif method == "4port":
-                        self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb},{portc},{portd}")
+                        self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:METH:{method_dict[method]} {porta},{portb},{portc},{portd}")
                     else:
-                        self.__instr_obj.write(f"SENS{self.__channel}:CORR:COLL:METH:{method_dict[method]} {porta}")
+                        self.__instr_obj.write(f"SENS{self.__context.channel}:CORR:COLL:METH:{method_dict[method]} {porta}")
 
                 class CalKit():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
                     @property
                     def select(self) -> int:
@@ -3558,7 +2980,7 @@ class BirdVectorNetworkAnalyzer():
                         Returns:
                             int: Value associated with a defined calibration kit. 
                         """
-                        return self.__instr_obj.query(f":SENS{self.__channel}:CORR:COLL:CKIT?")
+                        return self.__instr_obj.query(f":SENS{self.__context.channel}:CORR:COLL:CKIT?")
                     
                     @select.setter
                     def select(self, kit_number:int=31):
@@ -3570,96 +2992,33 @@ class BirdVectorNetworkAnalyzer():
                             kit_number (int, optional): Value associated with a defined calibration
                             kit. Defaults to 31, 'SK-CAL-NSet-90'.
                         """
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:COLL:CKIT {kit_number}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:COLL:CKIT {kit_number}")
 
             class Extension():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    self.auto   = self.Auto(self.__instr_obj)
-                    self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    self.auto._set_channel(self.__channel)
-                    self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    self.auto._set_trace(self.__trace)
-                    self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    self.auto._set_marker(self.__marker)
-                    self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    self.auto._set_port(self.__port)
-                    self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    self.auto._set_parameter(self.__parameter)
-                    self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    self.auto._set_standard(self.__standard)
-                    self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    self.auto._set_cal_kit(self.__cal_kit)
-                    self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                @cached_property
+                def auto(self):
+                    return self.Auto(self.__instr_obj, self.__context)
+
+                @cached_property
+                def port(self):
+                    return self.Port(self.__instr_obj, self.__context)
 
                 class Auto():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-                        
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
-                    
+                        self.__context = context
+
                     def measure(self, meastype:str="open"):
                         """Performs the port extention auto measurement for the 
 
                         Args:
                             meastype (str, optional): _description_. Defaults to "open".
                         """
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:EXT:AUTO:MEAS {meastype.upper()}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:EXT:AUTO:MEAS {meastype.upper()}")
 
                     @property
                     def port(self) -> str:
@@ -3668,7 +3027,7 @@ class BirdVectorNetworkAnalyzer():
                         Returns:
                             str: Enabled (ON|1), or disabled (OFF|0).
                         """
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:EXT:AUTO:PORT{self.__port}?")
+                        return self.__instr_obj.query(f":SENS{self.__context.channel}:CORR:EXT:AUTO:PORT{self.__context.port}?").rstrip()
 
                     @port.setter
                     def port(self, state:str="off"):
@@ -3677,382 +3036,68 @@ class BirdVectorNetworkAnalyzer():
                         Args:
                             state (str, optional): Pass "on" to enable or "off" to disable. Defaults to "off".
                         """
-                        self.__instr_obj.write(f":SENS{self.__channel}:CORR:EXT:AUTO:PORT{self.__port} {state.upper()}")
+                        self.__instr_obj.write(f":SENS{self.__context.channel}:CORR:EXT:AUTO:PORT{self.__context.port} {state.upper()}")
 
                 class Port():
-                    def __init__(self, instrobj):
+                    def __init__(self, instrobj, context):
                         self.__instr_obj = instrobj
-                        self.__channel = None
-                        self.__trace = None
-                        self.__marker = None
-                        self.__port = None
-                        self.__parameter = None
-                        self.__standard = None
-                        self.__cal_kit = None
-
-                    def _set_channel(self, channel):
-                        self.__channel = channel
-
-                    def _set_trace(self, trace):
-                        self.__trace = trace
-
-                    def _set_marker(self, marker):
-                        self.__marker = marker
-                    
-                    def _set_port(self, port):
-                        self.__port = port
-                    
-                    def _set_parameter(self, parameter):
-                        self.__parameter = parameter
-                    
-                    def _set_standard(self, standard):
-                        self.__standard = standard
-                    
-                    def _set_cal_kit(self, kit):
-                        self.__cal_kit = kit
+                        self.__context = context
 
             class Impedance():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    self.auto._set_channel(self.__channel)
-                    self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    self.auto._set_trace(self.__trace)
-                    self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    self.auto._set_marker(self.__marker)
-                    self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    self.auto._set_port(self.__port)
-                    self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    self.auto._set_parameter(self.__parameter)
-                    self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    self.auto._set_standard(self.__standard)
-                    self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    self.auto._set_cal_kit(self.__cal_kit)
-                    self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class Offset():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class Port():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class Receiver():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class Transform():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class Trigger():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
             class VMC():
-                def __init__(self, instrobj):
+                def __init__(self, instrobj, context):
                     self.__instr_obj = instrobj
-                    self.__channel = None
-                    self.__trace = None
-                    self.__marker = None
-                    self.__port = None
-                    self.__parameter = None
-                    self.__standard = None
-                    self.__cal_kit = None
-
-                    #self.auto   = self.Auto(self.__instr_obj)
-                    #self.port   = self.Port(self.__instr_obj)
-
-                def _set_channel(self, channel):
-                    self.__channel = channel
-                    #self.auto._set_channel(self.__channel)
-                    #self.port._set_channel(self.__channel)
-
-                def _set_trace(self, trace):
-                    self.__trace = trace
-                    #self.auto._set_trace(self.__trace)
-                    #self.port._set_trace(self.__trace)
-
-                def _set_marker(self, marker):
-                    self.__marker = marker
-                    #self.auto._set_marker(self.__marker)
-                    #self.port._set_marker(self.__marker)
-                
-                def _set_port(self, port):
-                    self.__port = port
-                    #self.auto._set_port(self.__port)
-                    #self.port._set_port(self.__port)
-                
-                def _set_parameter(self, parameter):
-                    self.__parameter = parameter
-                    #self.auto._set_parameter(self.__parameter)
-                    #self.port._set_parameter(self.__parameter)
-                
-                def _set_standard(self, standard):
-                    self.__standard = standard
-                    #self.auto._set_standard(self.__standard)
-                    #self.port._set_standard(self.__standard)
-                
-                def _set_cal_kit(self, kit):
-                    self.__cal_kit = kit
-                    #self.auto._set_cal_kit(self.__cal_kit)
-                    #self.port._set_cal_kit(self.__cal_kit)
+                    self.__context = context
+
+                    #self.auto   = self.Auto(self.__instr_obj, self.__context)
+                    #self.port   = self.Port(self.__instr_obj, self.__context)
 
         class Frequency():
             """The frequency menu of commands is inclusive of the following:
@@ -4063,36 +3108,10 @@ class BirdVectorNetworkAnalyzer():
                 * start
                 * stop
             """
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context, data_format):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit
+                self.__context = context
+                self.__data_format = data_format
 
             @property
             def frequency(self):
@@ -4101,7 +3120,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: The frequency value within the frequency limits of the analyzer.
                 """
-                return float(self.__instr_obj.query(f"SENS{self.__channel}:FREQ?").rstrip())
+                return float(self.__instr_obj.query(f"SENS{self.__context.channel}:FREQ?").rstrip())
             
             @frequency.setter
             def frequency(self, value:float):
@@ -4110,21 +3129,19 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     value (float): The frequency value within the frequency limits of the analyzer.
                 """
-                self.__instr_obj.write(f"SENS{self.__channel}:FREQ {value}")
+                self.__instr_obj.write(f"SENS{self.__context.channel}:FREQ {value}")
             
             @property
-            def data(self) -> list[int]:
+            def data(self) -> np.ndarray:
                 """ Reads out the frequency array of the measurement points.
                     The array size is N, where N is the number of measurement points.
                     For the n–th point, where n from 1 to N:
                     <numeric n> the frequency value at the n–th measurement point
 
                 Returns:
-                    list[int]: <numeric 1>, <numeric 2>, …<numeric N>
+                    np.ndarray: <numeric 1>, <numeric 2>, …<numeric N>
                 """
-                mystr = self.__instr_obj.query(f":SENS{self.__channel}:FREQ:DATA?").rstrip()
-                my_list = mystr.split(',')
-                return my_list
+                return _query_numeric_array(self.__instr_obj, f":SENS{self.__context.channel}:FREQ:DATA?", self.__data_format)
             
             @property
             def center(self) -> float:
@@ -4133,7 +3150,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: The center frequency in Hertz (Hz).
                 """
-                return float(self.__instr_obj.query(f":SENS{self.__channel}:FREQ:CENT?").rstrip())
+                return float(self.__instr_obj.query(f":SENS{self.__context.channel}:FREQ:CENT?").rstrip())
             
             @center.setter
             def center(self, frequency:float):
@@ -4142,7 +3159,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     frequency (float): The center frequency in Hertz (Hz).
                 """
-                self.__instr_obj.write(f":SENS{self.__channel}:FREQ:CENT {frequency}")
+                self.__instr_obj.write(f":SENS{self.__context.channel}:FREQ:CENT {frequency}")
 
             @property
             def span(self) -> float:
@@ -4151,7 +3168,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: The frequency span in Hertz (Hz).
                 """
-                return float(self.__instr_obj.query(f":SENS{self.__channel}:FREQ:SPAN?").rstrip())
+                return float(self.__instr_obj.query(f":SENS{self.__context.channel}:FREQ:SPAN?").rstrip())
             
             @span.setter
             def span(self, frequency:float):
@@ -4160,7 +3177,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     frequency (float): The frequency span in Hertz (Hz).
                 """
-                self.__instr_obj.write(f"SENS{self.__channel}:FREQ:SPAN {frequency}")
+                self.__instr_obj.write(f"SENS{self.__context.channel}:FREQ:SPAN {frequency}")
 
             @property
             def start(self) -> float:
@@ -4169,7 +3186,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: The start frequency in Hertz (Hz).
                 """
-                return float(self.__instr_obj.query(f"SENS{self.__channel}:FREQ:STAR?").rstrip())
+                return float(self.__instr_obj.query(f"SENS{self.__context.channel}:FREQ:STAR?").rstrip())
             
             @start.setter
             def start(self, frequency:float):
@@ -4178,7 +3195,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     frequency (_type_): The start frequency in Hertz (Hz).
                 """
-                self.__instr_obj.write(f"SENS{self.__channel}:FREQ:STAR {frequency}")
+                self.__instr_obj.write(f"SENS{self.__context.channel}:FREQ:STAR {frequency}")
 
             @property
             def stop(self) -> float:
@@ -4187,7 +3204,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: _description_
                 """
-                return float(self.__instr_obj.query(f"SENS{self.__channel}:FREQ:STOP?").rstrip())
+                return float(self.__instr_obj.query(f"SENS{self.__context.channel}:FREQ:STOP?").rstrip())
             
             @stop.setter
             def stop(self, frequency:float):
@@ -4196,39 +3213,12 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     frequency (float): _description_
                 """
-                self.__instr_obj.write(f"SENS{self.__channel}:FREQ:STOP {frequency}")
+                self.__instr_obj.write(f"SENS{self.__context.channel}:FREQ:STOP {frequency}")
 
         class Sweep():
-            def __init__(self, instrobj):
+            def __init__(self, instrobj, context):
                 self.__instr_obj = instrobj
-                self.__channel = None
-                self.__trace = None
-                self.__marker = None
-                self.__port = None
-                self.__parameter = None
-                self.__standard = None
-                self.__cal_kit = None
-
-            def _set_channel(self, channel):
-                self.__channel = channel
-
-            def _set_trace(self, trace):
-                self.__trace = trace
-
-            def _set_marker(self, marker):
-                self.__marker = marker
-            
-            def _set_port(self, port):
-                self.__port = port
-            
-            def _set_parameter(self, parameter):
-                self.__parameter = parameter
-            
-            def _set_standard(self, standard):
-                self.__standard = standard
-            
-            def _set_cal_kit(self, kit):
-                self.__cal_kit = kit 
+                self.__context = context
 
             @property
             def points(self) -> int:
@@ -4237,7 +3227,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     int: Number of measurement points.
                 """
-                return int(self.__instr_obj.query(f":SENS{self.__channel}:SWE:POIN?").rstrip())
+                return int(self.__instr_obj.query(f":SENS{self.__context.channel}:SWE:POIN?").rstrip())
 
             @points.setter
             def points(self, count:int):
@@ -4246,7 +3236,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     count (int): Number of measurement points. 
                 """
-                self.__instr_obj.write(f":SENS{self.__channel}:SWE:POIN {count}")  
+                self.__instr_obj.write(f":SENS{self.__context.channel}:SWE:POIN {count}")  
 
             @property
             def point_time(self) -> float:
@@ -4255,7 +3245,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     float: Time before each measurement point.
                 """
-                return float(self.__instr_obj.query(f"SENS{self.__channel}:SWE:POIN:TIME?").rstrip())
+                return float(self.__instr_obj.query(f"SENS{self.__context.channel}:SWE:POIN:TIME?").rstrip())
 
             @point_time.setter
             def point_time(self, time:float):
@@ -4264,7 +3254,7 @@ class BirdVectorNetworkAnalyzer():
                 Args:
                     time (float): Time before each measurement point.
                 """
-                self.__instr_obj.write(f"SENS{self.__channel}:SWE:POIN:TIME {time}")  
+                self.__instr_obj.write(f"SENS{self.__context.channel}:SWE:POIN:TIME {time}")  
             
             @property
             def sweeptype(self)->str:
@@ -4273,7 +3263,7 @@ class BirdVectorNetworkAnalyzer():
                 Returns:
                     str: Returns linear, logarithmic, segment, or power. 
                 """
-                temp = self.__instr_obj.query(f"SENS{self.__channel}:SWE:TYPE?").rstrip()
+                temp = self.__instr_obj.query(f"SENS{self.__context.channel}:SWE:TYPE?").rstrip()
                 if "LIN" in temp:
                     swtp = "linear"
                 elif "LOG" in temp:
@@ -4297,135 +3287,27 @@ class BirdVectorNetworkAnalyzer():
                            'power': "POW",
                            }
                 
-                self.__instr_obj.write(f"SENS{self.__channel}:SWE:TYPE {sweep_dict[sweep_type]}")
+                self.__instr_obj.write(f"SENS{self.__context.channel}:SWE:TYPE {sweep_dict[sweep_type]}")
 
     class Service():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
 
     class Source():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace    
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
 
     class Status():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace 
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
 
     class System():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace   
-
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
+            self.__context = context
 
         def preset(self):
             """
@@ -4434,37 +3316,10 @@ class BirdVectorNetworkAnalyzer():
             self.__instr_obj.write("SYST:PRES\n")
 
     class Trigger():
-        def __init__(self, instrobj):
+        def __init__(self, instrobj, context):
             self.__instr_obj = instrobj
-            self.__channel = None
-            self.__trace = None
-            self.__marker = None
-            self.__port = None
-            self.__parameter = None
-            self.__standard = None
-            self.__cal_kit = None
-
-        def _set_channel(self, channel):
-            self.__channel = channel
-
-        def _set_trace(self, trace):
-            self.__trace = trace  
-        
-        def _set_marker(self, marker):
-            self.__marker = marker
-        
-        def _set_port(self, port):
-            self.__port = port
-        
-        def _set_parameter(self, parameter):
-            self.__parameter = parameter
-        
-        def _set_standard(self, standard):
-            self.__standard = standard
-        
-        def _set_cal_kit(self, kit):
-            self.__cal_kit = kit
-        
+            self.__context = context
+
         def immediate(self):
             """Regardless of the setting of the trigger mode, generates a trigger immediately and executes a measurement.
             """
@@ -4482,7 +3337,7 @@ class BirdVectorNetworkAnalyzer():
             Returns:
                 str: May be int for internal, ext for external, man for manual, or bus for bus. 
             """
-            return self.__instr_obj.write(f":TRIG:SOUR?").rstrip().lower()
+            return self.__instr_obj.query(f":TRIG:SOUR?").rstrip().lower()
         
         @source.setter
         def source(self, source:str="internal"):
@@ -4505,13 +3360,12 @@ class BirdVectorNetworkAnalyzer():
             Returns:
                 _type_: _description_
             """
-            return self.__instr_obj.write(f":TRIG:SCOPE?").rstrip().lower()
+            return self.__instr_obj.query(f":TRIG:SCOPE?").rstrip().lower()
         
         @scope.setter
         def scope(self, selection:str="active"):
             """This command sets the effective scope of triggering. When this property is enabled with a value of "active", only active channel is triggered. When this property is enabled with a value of "all", all channels are triggered.
 
-
             Args:
                 selection (str, optional): _description_. Defaults to "active".
             """
@@ -0,0 +1,326 @@
+"""
+Example Description:
+        This module stores full sweeps for long campaigns (a day of ex09 is
+        8640 sweeps) in an append-only archive directory:
+
+            archive.json        trace numbers, point count, data type, chunk size
+            frequency.npy       the frequency axis shared by every sweep
+            index.dat           sweep number and timestamp of every stored sweep, followed
+                                by unused slots (sweep -1) the index grows into
+            chunk_000000.dat    fixed-width records, chunk_records sweeps per file
+
+        Chunks are written and read through NumPy memory maps, and the index
+        is searched by timestamp, so a time range and frequency range of a
+        month of data can be read without touching the rest of the files:
+
+            archive = SweepArchive("lab3_antenna", frequency=sweep.frequency, traces=(1, 2))
+            for sweep in bna1k.stream(traces=(1, 2)):
+                archive.append(sweep)
+
+            archive = SweepArchive("lab3_antenna", mode="r")
+            timestamps, frequency, data = archive.select(start_time=t0, stop_time=t0 + 3600,
+                                                         start_frequency=800e6, stop_frequency=900e6)
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_archive.py
+
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+_INDEX_DTYPE = np.dtype([("sweep", "<i8"), ("timestamp", "<f8")])
+_INDEX_UNUSED = np.array([(-1, np.nan)], dtype=_INDEX_DTYPE)
+
+
+class SweepArchive():
+    """
+    An append-only archive of sweeps. Each record holds the sweep number,
+    the timestamp and a (traces, points) data array. Records are appended in
+    timestamp order; a record becomes visible once its index entry is written.
+    """
+    def __init__(self, path:str, frequency:np.ndarray=None, traces:tuple=None, dtype:str=None,
+                 chunk_records:int=None, mode:str="a"):
+        """
+        Args:
+            path (str): The archive directory. It is created if it does not exist.
+            frequency (np.ndarray, optional): Frequency of each point; required to create an archive.
+                Defaults to None.
+            traces (tuple, optional): Trace numbers stored in each record, for a new archive. Defaults to (1,).
+            dtype (str, optional): Element type of the data for a new archive, "float64" for formatted
+                values or "complex128" for corrected data. Defaults to "float64".
+            chunk_records (int, optional): Records per chunk file, for a new archive. Defaults to 8640.
+
+            When an existing archive is opened, frequency, traces, dtype and chunk_records may be
+            left out; any that are given must match the archive, or ValueError is raised.
+            mode (str, optional): "a" to open for appending or "r" to open read-only. Defaults to "a".
+        """
+        self.path = path
+        self.mode = mode
+        meta_path = os.path.join(path, "archive.json")
+        if not os.path.exists(meta_path):
+            if mode == "r":
+                raise FileNotFoundError(f"{path}: no sweep archive found.")
+            if frequency is None:
+                raise ValueError(f"{path}: a frequency axis is needed to create a sweep archive.")
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, "frequency.npy"), np.asarray(frequency, dtype=np.float64))
+            with open(meta_path, "w") as meta_file:
+                json.dump({"version": 1,
+                           "traces": [int(trace) for trace in (traces or (1,))],
+                           "points": len(frequency),
+                           "dtype": np.dtype(dtype or "float64").str,
+                           "chunk_records": chunk_records or 8640,
+                           }, meta_file)
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        stored_frequency = np.load(os.path.join(path, "frequency.npy"))
+        if frequency is not None and not np.array_equal(np.asarray(frequency, dtype=np.float64), stored_frequency):
+            raise ValueError(f"{path}: the frequency axis differs from that of the archive.")
+        if traces is not None and [int(trace) for trace in traces] != meta["traces"]:
+            raise ValueError(f"{path}: the archive stores traces {tuple(meta['traces'])}, not {tuple(traces)}.")
+        if dtype is not None and np.dtype(dtype).str != meta["dtype"]:
+            raise ValueError(f"{path}: the archive stores {np.dtype(meta['dtype'])} data, not {np.dtype(dtype)}.")
+        if chunk_records is not None and chunk_records != meta["chunk_records"]:
+            raise ValueError(f"{path}: the archive has {meta['chunk_records']} records per chunk, not {chunk_records}.")
+        self.traces = tuple(meta["traces"])
+        self.points = meta["points"]
+        self.chunk_records = meta["chunk_records"]
+        self.frequency = stored_frequency
+        self.record_dtype = np.dtype([("sweep", "<i8"),
+                                      ("timestamp", "<f8"),
+                                      ("data", np.dtype(meta["dtype"]), (len(self.traces), self.points)),
+                                      ])
+        self.__index_path = os.path.join(path, "index.dat")
+        self.__index = None
+        self.__count = 0
+        self.__chunks = {}
+        self.__map_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __map_index(self, capacity:int=0):
+        # The index file is mapped whole, unused slots included. A writer grows it geometrically,
+        # as the chunk files are allocated ahead of their records, so that appends write into the
+        # open map instead of extending the file and mapping it again for every sweep.
+        size = os.path.getsize(self.__index_path) if os.path.exists(self.__index_path) else 0
+        if capacity * _INDEX_DTYPE.itemsize > size:
+            with open(self.__index_path, "ab") as index_file:
+                index_file.write(np.repeat(_INDEX_UNUSED, capacity - size // _INDEX_DTYPE.itemsize).tobytes())
+            size = capacity * _INDEX_DTYPE.itemsize
+        if size < _INDEX_DTYPE.itemsize:
+            self.__index = None
+            return
+        self.__index = np.memmap(self.__index_path, dtype=_INDEX_DTYPE, mode="r" if self.mode == "r" else "r+",
+                                 shape=(size // _INDEX_DTYPE.itemsize,))
+        self.__count_entries()
+
+    def __count_entries(self):
+        # Entries fill the index from the start; the first unused slot ends them.
+        sweeps = self.__index["sweep"]
+        if self.__count < len(sweeps) and sweeps[self.__count] >= 0:
+            unused = np.flatnonzero(sweeps[self.__count:] < 0)
+            self.__count += int(unused[0]) if len(unused) else len(sweeps) - self.__count
+
+    def __len__(self) -> int:
+        if self.mode == "r":
+            # Pick up sweeps appended by a writer since the index was mapped.
+            size = os.path.getsize(self.__index_path) if os.path.exists(self.__index_path) else 0
+            if self.__index is None or size != self.__index.nbytes:
+                self.__map_index()
+            else:
+                self.__count_entries()
+        return self.__count
+
+    @property
+    def index(self) -> np.ndarray:
+        """Structured array of the sweep number and timestamp of every stored sweep, memory-mapped
+        from the index file."""
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=_INDEX_DTYPE)
+        return self.__index[:count]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp of every stored sweep."""
+        return self.index["timestamp"]
+
+    def __chunk(self, number:int, writable:bool=False) -> np.memmap:
+        chunk = self.__chunks.get(number)
+        if chunk is not None and (not writable or chunk.mode != "r"):
+            return chunk
+        chunk_path = os.path.join(self.path, f"chunk_{number:06d}.dat")
+        if writable:
+            mode = "r+" if os.path.exists(chunk_path) else "w+"
+        else:
+            mode = "r"
+        chunk = np.memmap(chunk_path, dtype=self.record_dtype, mode=mode, shape=(self.chunk_records,))
+        self.__chunks[number] = chunk
+        return chunk
+
+    def append(self, data, timestamp:float=None) -> int:
+        """Appends a sweep.
+
+        Args:
+            data: A (traces, points) array, or a SweepRecord from BirdVectorNetworkAnalyzer.stream(),
+                whose data and timestamp are used.
+            timestamp (float, optional): Time of the sweep in seconds since the epoch. Defaults to the
+                record's timestamp, or the current time.
+
+        Returns:
+            int: The sweep number of the stored record.
+        """
+        if self.mode == "r":
+            raise ValueError(f"{self.path}: the archive is open read-only.")
+        if hasattr(data, "timestamp") and hasattr(data, "data"):
+            timestamp = data.timestamp if timestamp is None else timestamp
+            data = data.data
+        timestamp = time.time() if timestamp is None else timestamp
+        sweep = self.__count
+        if sweep and timestamp < self.__index[sweep - 1]["timestamp"]:
+            raise ValueError(f"{timestamp}: sweeps must be appended in timestamp order.")
+        chunk_number, slot = divmod(sweep, self.chunk_records)
+        if chunk_number - 1 in self.__chunks and self.__chunks[chunk_number - 1].mode != "r":
+            # The previous chunk is complete; write it out and release its map.
+            self.__chunks.pop(chunk_number - 1).flush()
+        chunk = self.__chunk(chunk_number, writable=True)
+        record = chunk[slot]
+        record["sweep"] = sweep
+        record["timestamp"] = timestamp
+        record["data"] = np.reshape(data, (len(self.traces), self.points))
+        # The record is written to disk before its index entry, so a sweep interrupted part way, or
+        # lost in a crash, is never indexed.
+        chunk.flush()
+        if self.__index is None or sweep == len(self.__index):
+            self.__map_index(max(2 * sweep, 1024))
+        # The sweep number marks the slot as used, so it is written after the timestamp.
+        entry = self.__index[sweep]
+        entry["timestamp"] = timestamp
+        entry["sweep"] = sweep
+        self.__count = sweep + 1
+        return sweep
+
+    def flush(self):
+        """Writes the memory-mapped chunks and the index to disk."""
+        for chunk in self.__chunks.values():
+            if chunk.mode != "r":
+                chunk.flush()
+        if self.mode != "r" and self.__index is not None:
+            self.__index.flush()
+
+    def close(self):
+        """Flushes and closes the archive."""
+        self.flush()
+        self.__chunks.clear()
+        self.__index = None
+
+    def sweep_range(self, start_time:float=None, stop_time:float=None) -> tuple[int, int]:
+        """Finds the sweeps taken in a time range using the index.
+
+        Args:
+            start_time (float, optional): First timestamp included. Defaults to the first sweep.
+            stop_time (float, optional): Timestamp at which the range ends (excluded). Defaults to the last sweep.
+
+        Returns:
+            tuple[int, int]: The first sweep number in the range and the sweep number after the last.
+        """
+        timestamps = self.timestamps
+        first = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, side="left"))
+        last = len(timestamps) if stop_time is None else int(np.searchsorted(timestamps, stop_time, side="left"))
+        return first, max(first, last)
+
+    def point_range(self, start_frequency:float=None, stop_frequency:float=None) -> tuple[int, int]:
+        """Finds the points of an ascending frequency axis within a frequency range.
+
+        Args:
+            start_frequency (float, optional): Lowest frequency included. Defaults to the first point.
+            stop_frequency (float, optional): Highest frequency included. Defaults to the last point.
+
+        Returns:
+            tuple[int, int]: The first point index in the range and the index after the last.
+        """
+        first = 0 if start_frequency is None else int(np.searchsorted(self.frequency, start_frequency, side="left"))
+        last = self.points if stop_frequency is None else int(np.searchsorted(self.frequency, stop_frequency, side="right"))
+        return first, max(first, last)
+
+    def read(self, first:int, last:int, points:slice=slice(None), traces:tuple=None) -> np.ndarray:
+        """Reads the data of a range of sweep numbers, touching only the chunks that hold them.
+
+        Args:
+            first (int): First sweep number.
+            last (int): Sweep number after the last one read.
+            points (slice, optional): Points to read. Defaults to all points.
+            traces (tuple, optional): Trace numbers to read. Defaults to all stored traces.
+
+        Returns:
+            np.ndarray: (sweeps, traces, points) array.
+        """
+        rows = slice(None) if traces is None else [self.traces.index(trace) for trace in traces]
+        last = min(last, len(self))
+        parts = []
+        sweep = first
+        while sweep < last:
+            chunk_number, slot = divmod(sweep, self.chunk_records)
+            count = min(last - sweep, self.chunk_records - slot)
+            chunk = self.__chunk(chunk_number)
+            parts.append(np.array(chunk["data"][slot:slot + count][:, rows, points]))
+            sweep += count
+        if not parts:
+            columns = len(self.traces) if traces is None else len(traces)
+            width = len(range(self.points)[points])
+            return np.zeros((0, columns, width), dtype=self.record_dtype["data"].base)
+        return np.concatenate(parts)
+
+    def select(self, start_time:float=None, stop_time:float=None, start_frequency:float=None,
+               stop_frequency:float=None, traces:tuple=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reads the sweeps in a time range, restricted to a frequency range.
+
+        Args:
+            start_time (float, optional): First timestamp included. Defaults to the first sweep.
+            stop_time (float, optional): Timestamp at which the range ends (excluded). Defaults to the last sweep.
+            start_frequency (float, optional): Lowest frequency included. Defaults to the first point.
+            stop_frequency (float, optional): Highest frequency included. Defaults to the last point.
+            traces (tuple, optional): Trace numbers to read. Defaults to all stored traces.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The timestamps, the frequencies and the
+                (sweeps, traces, points) data.
+        """
+        first, last = self.sweep_range(start_time, stop_time)
+        low, high = self.point_range(start_frequency, stop_frequency)
+        data = self.read(first, last, slice(low, high), traces)
+        return np.array(self.timestamps[first:last]), self.frequency[low:high], data
@@ -0,0 +1,405 @@
+"""
+Example Description:
+        This module provides an asyncio variant of the driver in
+        bird_vector_network_analyzer.py so that a single event loop can drive
+        several analyzers at once, overlapping their sweeps and transfers.
+        The subsystem tree is the same as the synchronous driver; every
+        command is awaited and properties are read by calling them with no
+        argument and set by calling them with one:
+
+            vna = AsyncBirdVectorNetworkAnalyzer()
+            await vna.initialize("TCPIP0::192.168.1.10::5025::SOCKET")
+            vna.channel = 1
+            vna.trace = 1
+            await vna.sense.sweep.points(401)
+            await vna.trigger.immediate()
+            await vna.opc_query()
+            data = await vna.calculate.data.format_data()
+
+        Commands are sent over a raw SCPI socket with asyncio streams (or to
+        the simulator in bird_vna_simulator.py), so no thread is held while
+        an instrument works through a sweep.
+
+@verbatim
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_async.py
+
+"""
+import asyncio
+import functools
+
+from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer
+
+# Addressing attributes of the driver that commands are built from.
+_ADDRESSING = ("channel", "trace", "marker", "port", "parameter", "standard", "cal_kit")
+
+
+async def _read_message(reader:asyncio.StreamReader) -> bytes:
+    """Reads one response message from a stream. A response that starts with an IEEE 488.2
+    definite-length block is read by its declared length, so payload bytes equal to the
+    termination character do not end it early.
+
+    Args:
+        reader (asyncio.StreamReader): The instrument connection.
+
+    Returns:
+        bytes: The response including its termination character.
+    """
+    first = await reader.readexactly(1)
+    if first == b"\n":
+        return first
+    if first != b"#":
+        return first + await reader.readuntil(b"\n")
+    digits = await reader.readexactly(1)
+    length = await reader.readexactly(int(digits))
+    payload = await reader.readexactly(int(length))
+    return first + digits + length + payload + await reader.readuntil(b"\n")
+
+
+class AsyncSocketTransport():
+    """
+    Sends SCPI messages to an instrument over a raw TCP socket (port 5025 by
+    default) using asyncio streams.
+    """
+    def __init__(self, host:str, port:int=5025, timeout:float=10.0):
+        """
+        Args:
+            host (str): Host name or IP address of the analyzer.
+            port (int, optional): SCPI socket port. Defaults to 5025.
+            timeout (float, optional): Seconds to wait for a response. Defaults to 10.0.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.__reader = None
+        self.__writer = None
+
+    async def open(self):
+        """Connects to the instrument."""
+        self.__reader, self.__writer = await asyncio.open_connection(self.host, self.port)
+
+    async def write(self, message:bytes):
+        """Sends a program message terminated by a newline.
+
+        Args:
+            message (bytes): The message.
+        """
+        self.__writer.write(message)
+        await self.__writer.drain()
+
+    async def read(self) -> bytes:
+        """Waits for the next response message without blocking the event loop.
+
+        Returns:
+            bytes: The response including its termination character.
+        """
+        return await asyncio.wait_for(_read_message(self.__reader), self.timeout)
+
+    async def close(self):
+        """Closes the connection."""
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+            self.__writer = None
+
+
+class AsyncSimulatedTransport():
+    """
+    Connects the async driver to a SimulatedInstrument. The simulator's bus
+    latency and sweep time are awaited with asyncio.sleep() rather than
+    time.sleep(), so simulated instruments overlap the way real ones do.
+    """
+    def __init__(self, instrument):
+        """
+        Args:
+            instrument (SimulatedInstrument): The simulated analyzer.
+        """
+        self.instrument = instrument
+        self.latency = instrument.latency
+        instrument.latency = 0.0
+
+    async def open(self):
+        """Nothing to connect; present for symmetry with AsyncSocketTransport."""
+
+    async def write(self, message:bytes):
+        """Sends a program message terminated by a newline.
+
+        Args:
+            message (bytes): The message.
+        """
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if message.split(b" ", 1)[0].rstrip().endswith(b"?"):
+            # A query is answered once the sweep in progress has finished.
+            await asyncio.sleep(self.instrument.busy_time())
+        self.instrument.write_raw(message)
+
+    async def read(self) -> bytes:
+        """Returns the next response message.
+
+        Returns:
+            bytes: The response including its termination character.
+        """
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self.instrument.read_raw()
+
+    async def close(self):
+        """Closes the simulated session."""
+        self.instrument.close()
+
+
+class _NeedResponse(Exception):
+    """Stops a driver call at the first read whose response has not arrived yet."""
+
+
+class _ReplayResource():
+    """
+    Stands in for the instrument resource of a synchronous driver. A driver call
+    is run repeatedly: each run returns the responses collected so far, queues the
+    messages that have not been sent yet and stops at the first read that still
+    needs an answer. The async runner sends the queued messages, awaits the
+    response and runs the call again until it completes.
+    """
+    def __init__(self):
+        self.responses = []
+        self.outbound = []
+        self.sent = 0
+        self.__written = 0
+        self.__read = 0
+
+    def begin(self):
+        self.outbound = []
+        self.__written = 0
+        self.__read = 0
+
+    def write_raw(self, message:bytes) -> int:
+        if self.__written >= self.sent:
+            self.outbound.append(message if message.endswith(b"\n") else message + b"\n")
+        self.__written += 1
+        return len(message)
+
+    def write(self, message:str) -> int:
+        return self.write_raw(message.encode("latin-1"))
+
+    def read_raw(self, *args) -> bytes:
+        if self.__read >= len(self.responses):
+            raise _NeedResponse()
+        self.__read += 1
+        return self.responses[self.__read - 1]
+
+    def read(self) -> str:
+        return self.read_raw().decode("latin-1").rstrip("\n")
+
+    def query(self, message:str) -> str:
+        self.write(message)
+        return self.read()
+
+    def close(self):
+        pass
+
+
+class _Runner():
+    """
+    Runs synchronous driver calls against an async transport, one call at a
+    time per instrument. A call is re-run from the start after each response
+    it waits for, so a call that reads N responses runs its driver code N + 1
+    times; the cost is in the host, not on the bus, where each message is sent
+    once. Calls reading many separate responses are better made as one
+    compound query.
+    """
+    def __init__(self, driver:BirdVectorNetworkAnalyzer, resource:_ReplayResource, transport):
+        self.driver = driver
+        self.resource = resource
+        self.transport = transport
+        self.lock = asyncio.Lock()
+
+    def addressing(self) -> dict:
+        """Returns the addressing attributes of the driver as they are now."""
+        return {name: getattr(self.driver, name) for name in _ADDRESSING}
+
+    async def run(self, call, addressing:dict):
+        """Runs a driver call, awaiting each response it needs.
+
+        Args:
+            call: A callable using the synchronous driver.
+            addressing (dict): The addressing in effect when the call was made, from addressing().
+                It is used even if another task changes the addressing while this call waits
+                for the lock or for the instrument.
+
+        Returns:
+            The value returned by the call.
+        """
+        async with self.lock:
+            self.resource.responses = []
+            self.resource.sent = 0
+            while True:
+                current = self.addressing()
+                for name, value in addressing.items():
+                    setattr(self.driver, name, value)
+                self.resource.begin()
+                try:
+                    result = call()
+                    pending = None
+                except _NeedResponse as need:
+                    pending = need
+                finally:
+                    for name, value in current.items():
+                        setattr(self.driver, name, value)
+                for message in self.resource.outbound:
+                    await self.transport.write(message)
+                    self.resource.sent += 1
+                if pending is None:
+                    return result
+                self.resource.responses.append(await self.transport.read())
+
+
+class _AsyncSubsystem():
+    """
+    Mirrors one node of the synchronous subsystem tree. Child subsystems are
+    returned as further mirrors, methods become coroutine functions, and
+    properties become coroutine functions that read when called with no
+    argument and write when called with one. The addressing is captured when
+    a method or property is called, before the returned coroutine is awaited.
+    """
+    def __init__(self, target, runner:_Runner):
+        self.__target = target
+        self.__runner = runner
+
+    def __getattr__(self, name:str):
+        attribute = getattr(type(self.__target), name, None)
+        target = self.__target
+        runner = self.__runner
+        if isinstance(attribute, functools.cached_property):
+            mirror = _AsyncSubsystem(getattr(target, name), runner)
+            setattr(self, name, mirror)
+            return mirror
+        if isinstance(attribute, property):
+            def access(*value):
+                if value:
+                    return runner.run(lambda: setattr(target, name, *value), runner.addressing())
+                return runner.run(lambda: getattr(target, name), runner.addressing())
+            access.__doc__ = attribute.__doc__
+            return access
+        if callable(attribute):
+            @functools.wraps(attribute)
+            def call(*args, **kwargs):
+                return runner.run(lambda: getattr(target, name)(*args, **kwargs), runner.addressing())
+            return call
+        return getattr(target, name)
+
+
+class AsyncBirdVectorNetworkAnalyzer():
+    """
+    An asyncio driver mirroring BirdVectorNetworkAnalyzer. The addressing
+    attributes (channel, trace, marker, port, parameter, standard, cal_kit) are
+    plain assignments as in the synchronous driver; everything that talks to the
+    instrument is awaited. Several instances can be driven concurrently, e.g.
+
+        await asyncio.gather(*(vna.opc_query() for vna in analyzers))
+
+    Calls on one instance are sent one at a time, each using the addressing in
+    effect when it was made (when the coroutine was created, not when it is
+    first awaited). The state cache and transactions of the
+    synchronous driver are not available here.
+    """
+    def __init__(self):
+        self.__driver = BirdVectorNetworkAnalyzer()
+        self.__resource = _ReplayResource()
+        self.__runner = None
+        self.__transport = None
+
+    async def initialize(self, instrument_resource_string):
+        """Opens the instrument session.
+
+        Args:
+            instrument_resource_string: "TCPIP[n]::<host>::<port>::SOCKET" for a raw SCPI socket,
+                "SIM::<dut>::INSTR" or a SimulatedInstrument for the simulator, or a transport
+                object with async open(), write(), read() and close() methods.
+        """
+        if isinstance(instrument_resource_string, str):
+            fields = instrument_resource_string.split("::")
+            if fields[0].upper().startswith("SIM"):
+                from bird_vna_simulator import SimulatedInstrument
+                transport = AsyncSimulatedTransport(SimulatedInstrument(instrument_resource_string))
+            elif fields[0].upper().startswith("TCPIP") and fields[-1].upper() == "SOCKET":
+                transport = AsyncSocketTransport(fields[1], int(fields[2]))
+            else:
+                raise ValueError(f"{instrument_resource_string}: the async driver supports TCPIP::<host>::<port>::SOCKET "
+                                 "and SIM::<dut>::INSTR resources.")
+        elif hasattr(instrument_resource_string, "write_raw"):
+            transport = AsyncSimulatedTransport(instrument_resource_string)
+        else:
+            transport = instrument_resource_string
+        await transport.open()
+        self.__transport = transport
+        self.__runner = _Runner(self.__driver, self.__resource, transport)
+        await self.__runner.run(lambda: self.__driver.initialize(self.__resource), self.__runner.addressing())
+
+    async def close(self):
+        """Closes the instrument session."""
+        await self.__transport.close()
+
+    def __getattr__(self, name:str):
+        # Only reached for names not defined on this class: subsystems and driver methods.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(_AsyncSubsystem(self.__driver, self.__runner), name)
+
+    def __setattr__(self, name:str, value):
+        if name in _ADDRESSING:
+            setattr(self.__driver, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    @property
+    def channel(self):
+        return self.__driver.channel
+
+    @property
+    def trace(self):
+        return self.__driver.trace
+
+    @property
+    def marker(self):
+        return self.__driver.marker
+
+    @property
+    def port(self):
+        return self.__driver.port
+
+    @property
+    def parameter(self):
+        return self.__driver.parameter
+
+    @property
+    def standard(self):
+        return self.__driver.standard
+
+    @property
+    def cal_kit(self):
+        return self.__driver.cal_kit
@@ -0,0 +1,419 @@
+"""
+Example Description:
+        This module measures the bus cost of the example workflows and of
+        scaled acquisition loops, times switching the channel, trace and
+        marker addressing of the driver, and times the start-up of a fresh
+        process (import, initialize and first command). Every run is executed against the
+        simulator in bird_vna_simulator.py and reports the number of SCPI
+        messages written, the number of responses read (queries), the bytes
+        moved in each direction and the wall time. Results are written as
+        JSON lines and can be compared against a saved baseline so that
+        regressions in the driver show up as a non-zero exit status.
+
+        python bird_vna_benchmark.py --output baseline.jsonl
+        python bird_vna_benchmark.py --baseline baseline.jsonl
+
+@verbatim
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_benchmark.py
+
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer
+from bird_vna_scheduler import SweepScheduler
+from bird_vna_simulator import SimulatedInstrument
+# Imported here so that the writer thread keeps the real clock when an example is run on the virtual one.
+import bird_vna_writer
+
+EXAMPLES = {"ex01": ("ex01_single_port_calibration.py", "antenna"),
+            "ex02": ("ex02_two_port_calibration.py", "filter"),
+            "ex03": ("ex03_characterize_antenna.py", "antenna"),
+            "ex04": ("ex04_triggered_return_loss_sweep.py", "antenna"),
+            "ex05": ("ex05_two_port_calibration_using_ecal_module.py", "filter"),
+            "ex06": ("ex06_limit_test_on_return_loss_sweep_of_bandpass_filter.py", "filter"),
+            "ex07": ("ex07_bandwidth_search_on_insertion_loss_sweep_of_bandpass_filter.py", "filter"),
+            "ex08": ("ex08_save_and_recall_setups.py", "filter"),
+            "ex09": ("ex09_segmented_sweep.py", "antenna"),
+            "ex10": ("ex10_setup_multiple_traces_allocated_individual_panes.py", "filter"),
+            }
+
+SCALING_POINTS = (201, 401, 801, 1601, 3201, 6401, 10001, 16001)
+SCALING_TRACES = (1, 2, 4, 8, 16)
+SCALING_MARKERS = (1, 2, 4, 8, 15)
+
+# Counters compared exactly against a baseline; wall time is compared with a tolerance.
+COUNTERS = ("writes", "queries", "bytes_written", "bytes_read")
+
+
+class _VirtualTime(types.ModuleType):
+    """
+    A stand-in for the time module seen by an example script. sleep() and busy
+    waits on time.time() advance a virtual clock instead of the wall clock, so
+    that paced loops such as the 24 hour log of ex09 run as fast as the bus allows.
+    """
+    def __init__(self):
+        super().__init__("time")
+        self.__dict__.update({name: getattr(time, name) for name in dir(time) if not name.startswith("__")})
+        self.virtual_offset = 0.0
+        self.sleep = self.__sleep
+        self.time = self.__time
+        self.monotonic = self.__monotonic
+
+    def __sleep(self, seconds:float):
+        self.virtual_offset += max(seconds, 0.0)
+
+    def __time(self) -> float:
+        # Every reading moves the clock on by one second so busy waits terminate.
+        self.virtual_offset += 1.0
+        return time.time() + self.virtual_offset
+
+    def __monotonic(self) -> float:
+        self.virtual_offset += 1.0
+        return time.monotonic() + self.virtual_offset
+
+
+def _record(benchmark:str, name:str, instrument:SimulatedInstrument, wall_time:float, **parameters) -> dict:
+    bus_stats = instrument.statistics()
+    record = {"benchmark": benchmark,
+              "name": name,
+              }
+    record.update(parameters)
+    record.update({"writes": bus_stats["writes"],
+                   "queries": bus_stats["reads"],
+                   "bytes_written": bus_stats["bytes_written"],
+                   "bytes_read": bus_stats["bytes_read"],
+                   "bytes": bus_stats["bytes_written"] + bus_stats["bytes_read"],
+                   "wall_time": wall_time,
+                   })
+    return record
+
+
+@contextlib.contextmanager
+def _example_environment(instrument:SimulatedInstrument):
+    """Patches the driver, the scheduler, the time module, stdin and the working directory for
+    one example run, and restores all of them when the block exits, also on an error.
+
+    Args:
+        instrument (SimulatedInstrument): The instrument every driver initialize() connects to.
+    """
+    initialize = BirdVectorNetworkAnalyzer.initialize
+    scheduler_init = SweepScheduler.__init__
+    virtual_time = _VirtualTime()
+
+    def simulated_initialize(vna, resource, *args):
+        return initialize(vna, instrument, *args)
+
+    def virtual_scheduler_init(scheduler, *args, **kwargs):
+        # Paced loops wait on the virtual clock, running their actions inline so the counts are repeatable.
+        scheduler_init(scheduler, clock=virtual_time.monotonic, sleep=virtual_time.sleep, threaded=False)
+
+    real_time = sys.modules["time"]
+    real_stdin = sys.stdin
+    cwd = os.getcwd()
+    try:
+        BirdVectorNetworkAnalyzer.initialize = simulated_initialize
+        SweepScheduler.__init__ = virtual_scheduler_init
+        sys.modules["time"] = virtual_time
+        sys.stdin = io.StringIO("y\n" * 100)
+        with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(workdir)
+            try:
+                yield
+            finally:
+                os.chdir(cwd)
+    finally:
+        sys.modules["time"] = real_time
+        sys.stdin = real_stdin
+        BirdVectorNetworkAnalyzer.initialize = initialize
+        SweepScheduler.__init__ = scheduler_init
+
+
+def run_example(name:str, latency:float=0.0) -> dict:
+    """Runs one of the example scripts against the simulator.
+
+    The script's resource string is replaced by a simulated instrument, its
+    operator prompts are answered with "y", its console output is discarded,
+    files it creates are written to a temporary directory and its sleeps,
+    busy waits and scheduled loops run on a virtual clock.
+
+    Args:
+        name (str): The example key, "ex01" to "ex10".
+        latency (float, optional): Simulated seconds per bus transaction. Defaults to 0.0.
+
+    Returns:
+        dict: The benchmark record.
+    """
+    filename, dut = EXAMPLES[name]
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    instrument = SimulatedInstrument(f"SIM::{dut}::INSTR", latency=latency, seed=0)
+    with _example_environment(instrument):
+        start = time.perf_counter()
+        runpy.run_path(path, run_name="__main__")
+        wall_time = time.perf_counter() - start
+    return _record("example", name, instrument, wall_time, latency=latency)
+
+
+def run_scaling(points:int=201, traces:int=1, markers:int=1, data_format:str="ascii", latency:float=0.0) -> dict:
+    """Measures one bus triggered acquisition: trigger, wait for completion, then read the
+    formatted data of every trace and the response of every marker on every trace.
+
+    Args:
+        points (int, optional): Measurement points per sweep. Defaults to 201.
+        traces (int, optional): Number of traces in the channel. Defaults to 1.
+        markers (int, optional): Markers read on each trace. Defaults to 1.
+        data_format (str, optional): 'ascii', 'real32' or 'real64'. Defaults to "ascii".
+        latency (float, optional): Simulated seconds per bus transaction. Defaults to 0.0.
+
+    Returns:
+        dict: The benchmark record. Only the acquisition is counted, not the setup.
+    """
+    instrument = SimulatedInstrument("SIM::filter::INSTR", latency=latency, seed=0)
+    vna = BirdVectorNetworkAnalyzer()
+    vna.initialize(instrument)
+    vna.channel = 1
+    vna.trace = 1
+    vna.initiate.continuous = 0
+    vna.trigger.source = "bus"
+    vna.sense.sweep.points = points
+    vna.calculate.parameter.tracecount = traces
+    vna.format.data = data_format
+    for trace in range(1, traces + 1):
+        vna.trace = trace
+        vna.calculate.parameter.traceselect = trace
+        for marker in range(1, markers + 1):
+            vna.marker = marker
+            vna.calculate.marker.state = 1
+            vna.calculate.marker.x = 300e3 + marker * 500e6
+
+    instrument.reset_statistics()
+    start = time.perf_counter()
+    vna.trigger.immediate()
+    vna.opc_query()
+    for trace in range(1, traces + 1):
+        vna.trace = trace
+        vna.calculate.data.format_data
+        for marker in range(1, markers + 1):
+            vna.marker = marker
+            vna.calculate.marker.y()
+    wall_time = time.perf_counter() - start
+    vna.close()
+    return _record("scaling", f"p{points}_t{traces}_m{markers}_{data_format}", instrument, wall_time,
+                   points=points, traces=traces, markers=markers, data_format=data_format, latency=latency)
+
+
+def _build_subsystems(node, seen:set=None) -> int:
+    """Builds every lazily constructed subsystem reachable from a node of the driver's
+    command tree and returns how many there are.
+    """
+    seen = set() if seen is None else seen
+    count = 0
+    for name, attribute in vars(type(node)).items():
+        if isinstance(attribute, functools.cached_property):
+            child = getattr(node, name)
+            if id(child) not in seen:
+                seen.add(id(child))
+                count += 1 + _build_subsystems(child, seen)
+    return count
+
+
+def run_context_switch(iterations:int=100000) -> list[dict]:
+    """Times setting vna.channel, vna.trace and vna.marker, once on a driver whose command tree
+    has not been built and once on an initialized driver with every subsystem built. Because every subsystem reads the
+    shared addressing context when it builds a command, both take the same time per switch
+    regardless of how many subsystem objects the tree holds.
+
+    Args:
+        iterations (int, optional): Number of channel/trace/marker switches timed. Defaults to 100000.
+
+    Returns:
+        list[dict]: One record per driver, with the subsystem count and nanoseconds per switch.
+    """
+    records = []
+    for name, initialized in (("switch_empty_tree", False), ("switch_full_tree", True)):
+        vna = BirdVectorNetworkAnalyzer()
+        subsystems = 0
+        if initialized:
+            vna.initialize(SimulatedInstrument("SIM::filter::INSTR", seed=0))
+            subsystems = _build_subsystems(vna)
+        instrument_free = {"writes": 0, "queries": 0, "bytes_written": 0, "bytes_read": 0, "bytes": 0}
+        start = time.perf_counter()
+        for index in range(iterations):
+            vna.channel = 1 + index % 4
+            vna.trace = 1 + index % 16
+            vna.marker = 1 + index % 15
+        wall_time = time.perf_counter() - start
+        record = {"benchmark": "context",
+                  "name": name,
+                  "subsystems": subsystems,
+                  "iterations": iterations,
+                  "ns_per_switch": wall_time / (3 * iterations) * 1e9,
+                  }
+        record.update(instrument_free)
+        record["wall_time"] = wall_time
+        records.append(record)
+    return records
+
+
+_STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer
+imported = time.perf_counter()
+vna = BirdVectorNetworkAnalyzer()
+vna.initialize("SIM::filter::INSTR")
+initialized = time.perf_counter()
+vna.channel = 1
+vna.sense.sweep.points = 201
+commanded = time.perf_counter()
+print(imported - start, initialized - imported, commanded - initialized, "pyvisa" in sys.modules)
+"""
+
+
+def run_startup(repeats:int=5) -> dict:
+    """Measures the start-up cost of a short-lived test process: importing the driver,
+    initializing it against the simulator and sending the first command. Each repeat runs in
+    a fresh interpreter so module imports are not already cached; the median is reported.
+
+    Args:
+        repeats (int, optional): Number of interpreter launches. Defaults to 5.
+
+    Returns:
+        dict: The benchmark record with import, initialize and first command times in seconds.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], cwd=directory, check=True,
+                                capture_output=True, text=True).stdout.split()
+        samples.append(([float(value) for value in output[:3]], output[3] == "True"))
+    import_time, initialize_time, command_time = (statistics.median(sample[0][index] for sample in samples) for index in range(3))
+    return {"benchmark": "startup",
+            "name": "import_initialize_first_command",
+            "repeats": repeats,
+            "import_time": import_time,
+            "initialize_time": initialize_time,
+            "first_command_time": command_time,
+            "pyvisa_imported": any(sample[1] for sample in samples),
+            "wall_time": import_time + initialize_time + command_time,
+            }
+
+
+def scaling_cases(data_formats:tuple=("ascii", "real64")):
+    """Yields the keyword arguments of the scaling runs. Each sweep varies one dimension
+    from its smallest to its largest value with the other two held at their minimum.
+
+    Args:
+        data_formats (tuple, optional): Transfer formats to cover. Defaults to ("ascii", "real64").
+    """
+    for data_format in data_formats:
+        for points in SCALING_POINTS:
+            yield {"points": points, "data_format": data_format}
+        for traces in SCALING_TRACES[1:]:
+            yield {"traces": traces, "data_format": data_format}
+        for markers in SCALING_MARKERS[1:]:
+            yield {"markers": markers, "data_format": data_format}
+
+
+def compare(results:list, baseline:list, time_tolerance:float=0.5, time_slack:float=0.005) -> list[str]:
+    """Compares benchmark records with a baseline.
+
+    Args:
+        results (list): Records of the current run.
+        baseline (list): Records of the reference run.
+        time_tolerance (float, optional): Allowed fractional increase in wall time. Defaults to 0.5.
+        time_slack (float, optional): Allowed absolute increase in wall time in seconds, so that timer noise on very short runs is ignored. Defaults to 0.005.
+
+    Returns:
+        list[str]: A description of every regression; empty when there are none.
+    """
+    reference = {(record["benchmark"], record["name"]): record for record in baseline}
+    regressions = []
+    for record in results:
+        previous = reference.get((record["benchmark"], record["name"]))
+        if previous is None:
+            continue
+        for counter in COUNTERS:
+            if counter in record and counter in previous and record[counter] > previous[counter]:
+                regressions.append(f"{record['name']}: {counter} {previous[counter]} -> {record[counter]}")
+        if record["wall_time"] > previous["wall_time"] * (1.0 + time_tolerance) + time_slack:
+            regressions.append(f"{record['name']}: wall_time {previous['wall_time']:.6f} -> {record['wall_time']:.6f}")
+    return regressions
+
+
+def main(argv:list=None) -> int:
+    parser = argparse.ArgumentParser(description="Bus round-trip benchmark for the Bird VNA examples.")
+    parser.add_argument("--examples", nargs="*", default=list(EXAMPLES), help="examples to run, e.g. ex01 ex09; none to skip")
+    parser.add_argument("--no-scaling", action="store_true", help="skip the points/traces/markers scaling runs")
+    parser.add_argument("--no-context", action="store_true", help="skip the addressing context microbenchmark")
+    parser.add_argument("--no-startup", action="store_true", help="skip the import and initialize start-up benchmark")
+    parser.add_argument("--formats", nargs="+", default=["ascii", "real64"], help="transfer formats for the scaling runs")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per bus transaction")
+    parser.add_argument("--output", help="write JSON lines to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON lines file to compare against")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed fractional wall time increase")
+    args = parser.parse_args(argv)
+
+    results = [run_example(name, args.latency) for name in args.examples]
+    if not args.no_scaling:
+        results.extend(run_scaling(latency=args.latency, **case) for case in scaling_cases(tuple(args.formats)))
+    if not args.no_context:
+        results.extend(run_context_switch())
+    if not args.no_startup:
+        results.append(run_startup())
+
+    lines = "".join(json.dumps(record) + "\n" for record in results)
+    if args.output:
+        with open(args.output, "w") as ofile:
+            ofile.write(lines)
+    else:
+        sys.stdout.write(lines)
+
+    if args.baseline:
+        with open(args.baseline) as ifile:
+            baseline = [json.loads(line) for line in ifile if line.strip()]
+        regressions = compare(results, baseline, args.time_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Example Description:
+        This module locates faults along a cable or antenna feed from S11
+        sweeps on the host. The corrected S11 data is transformed into the
+        time domain with bird_vna_transform.py, the round-trip time is
+        converted into distance with the velocity factor of the cable, the
+        cable loss is compensated, and the return loss at each distance is
+        searched for the worst reflections:
+
+            frequency = bna1k.sense.frequency.data
+            dtf = DistanceToFault(frequency, velocity_factor=0.85, cable_loss=0.1, max_distance=40.0)
+            for record in bna1k.stream(channel=1, traces=(1,), data="corrected", count=100):
+                faults = dtf.faults(record[1], threshold=20.0, count=3)
+
+        Every method works on a whole (sweeps x points) batch, so a survey of
+        many feed lines is one call per batch and the analyzer keeps the same
+        settings from one cable to the next.
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_dtf.py
+
+"""
+import numpy as np
+
+from bird_vna_transform import TimeDomainTransform
+
+SPEED_OF_LIGHT = 299792458.0
+
+# Length of one distance unit in meters, as in calculate.correction.electricaldelay.distance.units.
+_UNITS = {'m': 1.0,
+          'meters': 1.0,
+          'ft': 0.3048,
+          'feet': 0.3048,
+          }
+
+# Row layout of DistanceToFault.faults().
+FAULT_DTYPE = np.dtype([("sweep", "i8"), ("distance", "f8"), ("return_loss", "f8")])
+
+
+class DistanceToFault():
+    """
+    A distance-to-fault transform for one stimulus grid and cable. Return
+    loss is positive dB, so a fault is a local minimum of the return loss
+    and the worst fault has the lowest value.
+    """
+    def __init__(self, frequency:np.ndarray, velocity_factor:float=1.0, cable_loss:float=0.0, units:str="m",
+                 window="norm", length:int=None, max_distance:float=None):
+        """
+        Args:
+            frequency (np.ndarray): Stimulus frequency of each point in Hz, evenly spaced.
+            velocity_factor (float, optional): Propagation velocity of the cable relative to the speed of light. Defaults to 1.0.
+            cable_loss (float, optional): One-way cable loss in dB per unit of distance, at the sweep center
+                frequency. It is compensated for both directions. Defaults to 0.0.
+            units (str, optional): Distance unit, 'm' or 'ft'. Defaults to "m".
+            window (optional): Transform window, 'min', 'norm' or 'max', or a Kaiser beta. Defaults to "norm".
+            length (int, optional): Transform length; the sweep is zero-padded to it to interpolate the
+                distance axis. Defaults to that of TimeDomainTransform.
+            max_distance (float, optional): Farthest distance reported. Defaults to the unambiguous range,
+                velocity / (2 x frequency step).
+        """
+        if not 0 < velocity_factor <= 1:
+            raise ValueError(f"{velocity_factor}: the velocity factor is between 0 and 1.")
+        self.__transform = TimeDomainTransform(frequency, mode="bandpass", window=window, length=length)
+        self.velocity_factor = velocity_factor
+        self.cable_loss = cable_loss
+        self.units = units
+        length = self.__transform.length
+        step = self.__transform.step
+        meters = np.arange(length) / (length * step) * SPEED_OF_LIGHT * velocity_factor / 2
+        distance = meters / _UNITS[units.lower()]
+        if max_distance is not None:
+            distance = distance[distance <= max_distance]
+        self.distance = distance
+        # Round-trip cable loss added back at each distance.
+        self.__compensation = 2 * cable_loss * distance
+
+    @property
+    def range(self) -> float:
+        """The unambiguous range in distance units; reflections beyond it alias to shorter distances."""
+        step = self.__transform.step
+        return SPEED_OF_LIGHT * self.velocity_factor / (2 * step) / _UNITS[self.units.lower()]
+
+    def reflection(self, data:np.ndarray) -> np.ndarray:
+        """Computes the magnitude of the reflection at each distance, before cable loss compensation.
+
+        Args:
+            data (np.ndarray): (..., points) complex corrected S11 data.
+
+        Returns:
+            np.ndarray: (..., distances) linear reflection magnitude at each value of distance.
+        """
+        response = np.fft.ifftshift(self.__transform.transform(data), axes=-1)
+        return np.abs(response[..., :self.distance.size])
+
+    def return_loss(self, data:np.ndarray) -> np.ndarray:
+        """Computes the return loss at each distance with the cable loss compensated.
+
+        Args:
+            data (np.ndarray): (..., points) complex corrected S11 data.
+
+        Returns:
+            np.ndarray: (..., distances) return loss in dB at each value of distance.
+        """
+        return -20 * np.log10(np.maximum(self.reflection(data), 1e-15)) - self.__compensation
+
+    def faults(self, data:np.ndarray, threshold:float=20.0, count:int=5) -> np.ndarray:
+        """Finds the worst reflections of each sweep: the local minima of the return loss below a
+        threshold, with their distance refined between points by a parabola through the minimum and
+        its neighbours.
+
+        Args:
+            data (np.ndarray): (sweeps, points) or (points,) complex corrected S11 data.
+            threshold (float, optional): Return loss in dB below which a minimum is a fault. Defaults to 20.0.
+            count (int, optional): Most faults reported per sweep. Defaults to 5.
+
+        Returns:
+            np.ndarray: Structured array of FAULT_DTYPE (sweep, distance, return_loss), ordered by
+                sweep and, within a sweep, from the lowest return loss.
+        """
+        return_loss = self.return_loss(data).reshape(-1, self.distance.size)
+        center = return_loss[:, 1:-1]
+        minimum = (center < return_loss[:, :-2]) & (center <= return_loss[:, 2:]) & (center < threshold)
+        sweep, index = np.nonzero(minimum)
+        index = index + 1
+        value = return_loss[sweep, index]
+        order = np.lexsort((value, sweep))
+        sweep, index, value = sweep[order], index[order], value[order]
+        rank = np.arange(sweep.size) - np.searchsorted(sweep, sweep)
+        keep = rank < count
+        sweep, index, value = sweep[keep], index[keep], value[keep]
+        before = return_loss[sweep, index - 1]
+        after = return_loss[sweep, index + 1]
+        curvature = before - 2 * value + after
+        offset = np.divide(before - after, 2 * curvature, out=np.zeros(value.shape), where=curvature != 0)
+        result = np.zeros(sweep.size, dtype=FAULT_DTYPE)
+        result["sweep"] = sweep
+        result["distance"] = np.interp(index + offset, np.arange(self.distance.size), self.distance)
+        result["return_loss"] = value - curvature * offset ** 2 / 2
+        return result
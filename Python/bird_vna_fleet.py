@@ -0,0 +1,242 @@
+"""
+Example Description:
+        This module runs the same measurement recipe on several analyzers at
+        once. A recipe is any function that takes a connected
+        BirdVectorNetworkAnalyzer and returns its measurement, for example the
+        body of ex04 ending in calculate.data.format_data. Each instrument
+        gets its own worker thread, so every instrument sweeps while the
+        others are being read out, and the results come back as one array
+        indexed by instrument and repetition, together with the throughput
+        of each instrument:
+
+            def return_loss(vna):
+                vna.trigger.immediate()
+                vna.opc_query()
+                return vna.calculate.data.format_data
+
+            with InstrumentFleet(["TCPIP0::10.0.0.11::inst0::INSTR",
+                                  "TCPIP0::10.0.0.12::inst0::INSTR"]) as fleet:
+                result = fleet.run(return_loss, repeats=10, setup=configure)
+                print(result.data.shape, result.throughput)
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_fleet.py
+
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer, SessionPool
+
+
+class FleetResult():
+    """
+    The results of one InstrumentFleet.run() call.
+
+    Attributes:
+        names (list): Instrument names, in the order of the first axis of data.
+        data (numpy.ndarray): Recipe results, shape (instruments, repeats, ...). Repetitions that
+            were not completed because the instrument failed are NaN. When the recipe returned
+            results of different shapes, data is instead an (instruments, repeats) object array
+            holding each result, with None where not completed; the same applies to results that are
+            not numeric, such as structured arrays or other objects.
+        timestamps (numpy.ndarray): Seconds from the start of the run at which each repetition
+            finished, shape (instruments, repeats); NaN where not completed.
+        errors (dict): The exception that stopped each failed instrument, by name.
+        throughput (dict): Per instrument: runs completed, busy seconds, runs per second and
+            values (points) per second.
+        elapsed (float): Wall time of the whole run in seconds.
+    """
+    def __init__(self, names:list, data:np.ndarray, timestamps:np.ndarray, errors:dict, throughput:dict, elapsed:float):
+        self.names = names
+        self.data = data
+        self.timestamps = timestamps
+        self.errors = errors
+        self.throughput = throughput
+        self.elapsed = elapsed
+
+    def __getitem__(self, name:str) -> np.ndarray:
+        """Returns the results of one instrument, shape (repeats, ...)."""
+        return self.data[self.names.index(name)]
+
+    @property
+    def speedup(self) -> float:
+        """Sum of the busy time of all instruments divided by the wall time of the run, i.e.
+        how many instruments were measuring at once on average."""
+        busy = sum(stats["elapsed"] for stats in self.throughput.values())
+        return busy / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class InstrumentFleet():
+    """
+    Holds one BirdVectorNetworkAnalyzer session per instrument and runs
+    measurement recipes on all of them in parallel.
+    """
+    def __init__(self, resources=(), max_workers:int=None, session_pool:SessionPool=None):
+        """
+        Args:
+            resources (optional): Resource strings (or opened resource objects) to connect, either
+                as a sequence, named by their resource string, or as a dict of name to resource.
+                Defaults to none; instruments can be added later with add().
+            max_workers (int, optional): Maximum number of instruments measuring at once.
+                Defaults to the number of instruments.
+            session_pool (SessionPool, optional): Pool the instrument sessions are checked out of,
+                so that fleets created one after another reuse the open connections. Defaults to None.
+        """
+        self.max_workers = max_workers
+        self.session_pool = session_pool
+        self.__instruments = {}
+        if isinstance(resources, dict):
+            resources = resources.items()
+        else:
+            resources = ((resource if isinstance(resource, str) else f"vna{index + 1}", resource)
+                         for index, resource in enumerate(resources))
+        for name, resource in resources:
+            self.add(name, resource)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return len(self.__instruments)
+
+    def __iter__(self):
+        return iter(self.__instruments.values())
+
+    def __getitem__(self, name:str) -> BirdVectorNetworkAnalyzer:
+        return self.__instruments[name]
+
+    @property
+    def names(self) -> list:
+        """Names of the instruments in the fleet, in the order they were added."""
+        return list(self.__instruments)
+
+    def add(self, name:str, resource) -> BirdVectorNetworkAnalyzer:
+        """Connects an instrument and adds it to the fleet.
+
+        Args:
+            name (str): Name the instrument's results are reported under.
+            resource: A resource string or opened resource object, as accepted by
+                BirdVectorNetworkAnalyzer.initialize().
+
+        Returns:
+            BirdVectorNetworkAnalyzer: The connected driver.
+        """
+        if name in self.__instruments:
+            raise ValueError(f"{name}: an instrument with this name is already in the fleet.")
+        vna = BirdVectorNetworkAnalyzer(session_pool=self.session_pool)
+        vna.initialize(resource)
+        self.__instruments[name] = vna
+        return vna
+
+    def remove(self, name:str):
+        """Closes an instrument's session and removes it from the fleet.
+
+        Args:
+            name (str): Name of the instrument.
+        """
+        self.__instruments.pop(name).close()
+
+    def close(self):
+        """Closes the sessions of all instruments in the fleet."""
+        while self.__instruments:
+            self.__instruments.popitem()[1].close()
+
+    def run(self, recipe, repeats:int=1, setup=None) -> FleetResult:
+        """Runs a measurement recipe on every instrument in parallel. The repetitions on one
+        instrument run one after another in that instrument's worker, so each instrument is
+        only ever used by one thread.
+
+        Args:
+            recipe: Function taking a BirdVectorNetworkAnalyzer and returning its measurement
+                (a number or array). Results of one shape are aligned in one array; see FleetResult.data.
+            repeats (int, optional): Number of times the recipe is run on each instrument. Defaults to 1.
+            setup (optional): Function taking a BirdVectorNetworkAnalyzer, run once on each
+                instrument before the first repetition and not included in the throughput.
+                Defaults to None.
+
+        Returns:
+            FleetResult: The aligned results, timestamps, errors and throughput.
+        """
+        names = self.names
+        start = time.monotonic()
+
+        def measure(vna):
+            results = []
+            finished = []
+            busy = 0.0
+            try:
+                if setup is not None:
+                    setup(vna)
+                for _ in range(repeats):
+                    began = time.monotonic()
+                    results.append(recipe(vna))
+                    finished.append(time.monotonic())
+                    busy += finished[-1] - began
+                error = None
+            except Exception as exc:
+                error = exc
+            return results, finished, busy, error
+
+        workers = self.max_workers or max(len(names), 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vna-fleet") as pool:
+            outcomes = list(pool.map(measure, (self.__instruments[name] for name in names)))
+        elapsed = time.monotonic() - start
+
+        completed = [np.asarray(result) for results, _, _, _ in outcomes for result in results]
+        shapes = {result.shape for result in completed}
+        numeric = all(result.dtype.kind in "biufc" for result in completed)
+        if len(shapes) > 1 or not numeric:
+            # Results that cannot be aligned in one numeric array, e.g. of different shapes or structured
+            # tables, are kept as they are rather than losing the run.
+            data = np.full((len(names), repeats), None, dtype=object)
+        else:
+            shape = shapes.pop() if shapes else ()
+            dtype = np.result_type(np.float64, *(result.dtype for result in completed))
+            data = np.full((len(names), repeats) + shape, np.nan, dtype=dtype)
+        timestamps = np.full((len(names), repeats), np.nan)
+        errors = {}
+        throughput = {}
+        for index, (name, (results, finished, busy, error)) in enumerate(zip(names, outcomes)):
+            for repeat, result in enumerate(results):
+                data[index, repeat] = result
+            timestamps[index, :len(finished)] = np.asarray(finished) - start
+            if error is not None:
+                errors[name] = error
+            throughput[name] = {"runs": len(results),
+                                "elapsed": busy,
+                                "runs_per_second": len(results) / busy if busy > 0 else 0.0,
+                                "points_per_second": sum(np.size(result) for result in results) / busy if busy > 0 else 0.0}
+        return FleetResult(names, data, timestamps, errors, throughput, elapsed)
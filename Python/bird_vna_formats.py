@@ -0,0 +1,201 @@
+"""
+Example Description:
+        This module converts complex corrected data into the display formats
+        of calculate.format.type on the host. Rather than allocating one trace
+        per format on the analyzer (ex03 and ex06 use three traces on S11 for
+        log magnitude, VSWR and Smith chart), read the corrected data once and
+        format it here, for one sweep or a whole batch of sweeps:
+
+            data = bna1k.calculate.data.corrected_data_traces((1,))[0]
+            frequency = bna1k.sense.frequency.data
+            views = format_all(data, frequency, ("mlog", "swr", "smith"))
+            return_loss, _ = views["mlog"]
+            resistance, reactance = views["smith"]
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_formats.py
+
+"""
+import numpy as np
+
+from bird_vector_network_analyzer import _short_form
+
+# Every format of calculate.format.type by its short form.
+FORMATS = ("MLOG", "PHAS", "GDEL", "SLIN", "SLOG", "SCOM", "SMIT", "SADM",
+           "PLIN", "PLOG", "POL", "MLIN", "SWR", "REAL", "IMAG", "UPH")
+
+def _format_key(fmt:str) -> str:
+    """Reduces a format name such as 'mlog', 'MLOGarithmic' or 'smith' to its short form, e.g. MLOG or SMIT."""
+    name = _short_form(fmt.strip().upper())
+    if name not in FORMATS:
+        raise ValueError(f"{fmt}: not one of the calculate.format.type formats {', '.join(FORMATS)}.")
+    return name
+
+
+def _at(values:np.ndarray, position:np.ndarray) -> np.ndarray:
+    """Linearly interpolates values along the last axis at fractional point positions."""
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, values.shape[-1] - 1)
+    weight = position - lower
+    return values[..., lower] * (1 - weight) + values[..., upper] * weight
+
+
+def group_delay(data:np.ndarray, frequency:np.ndarray, aperture:int=2) -> np.ndarray:
+    """Computes the group delay, the negative slope of the unwrapped phase against angular
+    frequency, over an aperture centered on each point. An odd aperture ends halfway between two
+    points, where the phase and frequency are interpolated. Near the ends of the sweep the
+    aperture is cut short at the first or last point.
+
+    Args:
+        data (np.ndarray): (..., N) complex data.
+        frequency (np.ndarray): Stimulus frequency of each of the N points in Hz.
+        aperture (int, optional): Number of point intervals the slope is taken over, at least 1.
+            2 is the central difference between the neighbouring points, as the analyzer computes
+            it; larger apertures smooth the delay of noisy traces. Defaults to 2.
+
+    Returns:
+        np.ndarray: (..., N) group delay in seconds.
+    """
+    points = data.shape[-1]
+    if points < 2:
+        return np.zeros(data.shape)
+    if aperture < 1:
+        raise ValueError(f"{aperture}: the group delay aperture is at least one point interval.")
+    index = np.arange(points)
+    # With a half-aperture of at least half a point, low < high at every point, also at the ends.
+    low = np.clip(index - aperture / 2, 0, points - 1)
+    high = np.clip(index + aperture / 2, 0, points - 1)
+    phase = np.unwrap(np.angle(data), axis=-1)
+    frequency = np.asarray(frequency, dtype=float)
+    return -(_at(phase, high) - _at(phase, low)) / (2 * np.pi * (_at(frequency, high) - _at(frequency, low)))
+
+
+class _Quantities():
+    """Intermediate quantities of one complex data array, each computed the first time a format needs it."""
+    def __init__(self, data:np.ndarray, frequency:np.ndarray, impedance:float, aperture:int):
+        self.data = data
+        self.frequency = frequency
+        self.impedance = impedance
+        self.aperture = aperture
+        self.__values = {}
+
+    def __getattr__(self, name:str) -> np.ndarray:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        values = self.__values
+        if name not in values:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if name == "magnitude":
+                    values[name] = np.abs(self.data)
+                elif name == "decibels":
+                    values[name] = 20 * np.log10(np.maximum(self.magnitude, 1e-15))
+                elif name == "phase":
+                    values[name] = np.angle(self.data, deg=True)
+                elif name == "impedance_values":
+                    values[name] = self.impedance * (1 + self.data) / (1 - self.data)
+                elif name == "zeros":
+                    values[name] = np.zeros(self.data.shape)
+                else:
+                    raise AttributeError(name)
+        return values[name]
+
+    def format(self, key:str) -> tuple[np.ndarray, np.ndarray]:
+        if key == "MLOG":
+            return self.decibels, self.zeros
+        if key == "MLIN":
+            return self.magnitude, self.zeros
+        if key == "PHAS":
+            return self.phase, self.zeros
+        if key == "UPH":
+            return np.degrees(np.unwrap(np.angle(self.data), axis=-1)), self.zeros
+        if key == "GDEL":
+            if self.frequency is None:
+                raise ValueError("The group delay format needs the frequency of each point.")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return group_delay(self.data, self.frequency, self.aperture), self.zeros
+        if key == "SWR":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (1 + self.magnitude) / np.maximum(1 - self.magnitude, 1e-15), self.zeros
+        if key == "REAL":
+            return self.data.real, self.zeros
+        if key == "IMAG":
+            return self.data.imag, self.zeros
+        if key in ("SLIN", "PLIN"):
+            return self.magnitude, self.phase
+        if key in ("SLOG", "PLOG"):
+            return self.decibels, self.phase
+        if key in ("SCOM", "POL"):
+            return self.data.real, self.data.imag
+        if key == "SMIT":
+            return self.impedance_values.real, self.impedance_values.imag
+        with np.errstate(divide="ignore", invalid="ignore"):
+            admittance = 1 / self.impedance_values
+        return admittance.real, admittance.imag
+
+
+def format_data(data:np.ndarray, fmt:str="mlog", frequency:np.ndarray=None, impedance:float=50.0,
+                aperture:int=2) -> tuple[np.ndarray, np.ndarray]:
+    """Converts complex corrected data into the primary and secondary values of one display format,
+    as the analyzer returns them for calculate.data.format_data.
+
+    Args:
+        data (np.ndarray): (..., points) complex corrected data of one sweep or a batch of sweeps.
+        fmt (str, optional): A calculate.format.type format, e.g. 'mlog', 'phase', 'gdelay', 'swr',
+            'smith' or 'polar'. Defaults to "mlog".
+        frequency (np.ndarray, optional): Stimulus frequency of each point; needed for group delay. Defaults to None.
+        impedance (float, optional): System impedance for the Smith and admittance formats. Defaults to 50.0.
+        aperture (int, optional): Group delay aperture in point intervals. Defaults to 2.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The primary and secondary values, each shaped like data.
+            The secondary values are 0 for formats that have none.
+    """
+    return _Quantities(np.asarray(data), frequency, impedance, aperture).format(_format_key(fmt))
+
+
+def format_all(data:np.ndarray, frequency:np.ndarray=None, formats:tuple=None, impedance:float=50.0,
+               aperture:int=2) -> dict:
+    """Converts complex corrected data into several display formats, computing the magnitude,
+    phase and impedance the formats share only once.
+
+    Args:
+        data (np.ndarray): (..., points) complex corrected data of one sweep or a batch of sweeps.
+        frequency (np.ndarray, optional): Stimulus frequency of each point; needed for group delay. Defaults to None.
+        formats (tuple, optional): The formats to produce. Defaults to every format, leaving out group
+            delay when no frequency is given.
+        impedance (float, optional): System impedance for the Smith and admittance formats. Defaults to 50.0.
+        aperture (int, optional): Group delay aperture in point intervals. Defaults to 2.
+
+    Returns:
+        dict: (primary, secondary) values by format name, as given in formats or by short form.
+    """
+    if formats is None:
+        formats = tuple(key for key in FORMATS if key != "GDEL" or frequency is not None)
+    quantities = _Quantities(np.asarray(data), frequency, impedance, aperture)
+    return {fmt: quantities.format(_format_key(fmt)) for fmt in formats}
@@ -0,0 +1,266 @@
+"""
+Example Description:
+        This module performs the limit test of calculate.limit on the host.
+        A limit table (lines of type off, maximum, minimum or single, as sent
+        with LIM:DATA) is compiled once for a stimulus grid into upper and
+        lower bound arrays, and whole batches of sweeps are then tested in a
+        single vectorized pass. Besides pass/fail, the result tells how close
+        each sweep came to its limits and at which points it failed:
+
+            engine = LimitEngine(frequency, [("maximum", 423e6, 443e6, -10.0, -10.0),
+                                             ("minimum", 380e6, 400e6, -60.0, -40.0)])
+            result = engine.evaluate(sweeps)            # (sweeps, points) formatted data
+            print(result.passed, result.worst_margin, result.failing_indices(0))
+
+        LimitTable holds such a table for the analyzer. It is sent in one
+        LIM:DATA command, read back with LIM:DATA?, and
+        calculate.limit.sync(table) uploads it only when the analyzer holds a
+        different table, comparing content hashes:
+
+            table = LimitTable.from_file("filter_433.csv")
+            bna1k.calculate.limit.sync(table)
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_limits.py
+
+"""
+import csv
+import hashlib
+
+import numpy as np
+
+from bird_vna_markers import interpolate
+
+# Limit line types, as in calculate.limit.addline() and the type field of LIM:DATA.
+_LINE_TYPES = {'off': 0,
+               'maximum': 1,
+               'minimum': 2,
+               'single': 3,
+               }
+
+
+def _limit_line(line) -> tuple[int, float, float, float, float]:
+    """Normalizes a limit line to (type, start stimulus, stop stimulus, start level, stop level),
+    accepting the type as its LIM:DATA number or as 'off', 'maximum', 'minimum' or 'single'."""
+    kind, start, stop, start_level, stop_level = line
+    kind = _LINE_TYPES[kind.lower()] if isinstance(kind, str) else int(kind)
+    if kind not in _LINE_TYPES.values():
+        raise ValueError(f"{kind}: a limit line type is 0 (off), 1 (maximum), 2 (minimum) or 3 (single).")
+    return kind, float(start), float(stop), float(start_level), float(stop_level)
+
+
+class LimitTable():
+    """
+    A limit table: an ordered list of (type, start stimulus, stop stimulus,
+    start level, stop level) lines, with type 0 (off), 1 (maximum),
+    2 (minimum) or 3 (single).
+    """
+    def __init__(self, lines=()):
+        """
+        Args:
+            lines (optional): Limit lines as (type, start, stop, start level, stop level) tuples, the type
+                given as its number or as 'off', 'maximum', 'minimum' or 'single'. Defaults to no lines.
+        """
+        self.lines = [_limit_line(line) for line in lines]
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, LimitTable) and self.content_hash == other.content_hash
+
+    def __repr__(self) -> str:
+        return f"LimitTable({self.lines!r})"
+
+    @classmethod
+    def from_arrays(cls, types, start, stop, start_level, stop_level) -> "LimitTable":
+        """Builds a table from one array per field.
+
+        Args:
+            types: Line types, as numbers or names.
+            start: Start stimulus of each line.
+            stop: Stop stimulus of each line.
+            start_level: Start level of each line.
+            stop_level: Stop level of each line.
+
+        Returns:
+            LimitTable: The table.
+        """
+        return cls(zip(types, start, stop, start_level, stop_level))
+
+    @classmethod
+    def from_file(cls, path:str) -> "LimitTable":
+        """Reads a table from a CSV file of type,start,stop,start_level,stop_level rows. A first row
+        that does not start with a line type is taken as a header and skipped.
+
+        Args:
+            path (str): The CSV file.
+
+        Returns:
+            LimitTable: The table.
+        """
+        with open(path, newline="") as limit_file:
+            rows = [row for row in csv.reader(limit_file) if row and any(field.strip() for field in row)]
+        if rows and rows[0][0].strip().lower() not in _LINE_TYPES and not rows[0][0].strip().isdigit():
+            rows = rows[1:]
+        return cls((row[0].strip(),) + tuple(float(field) for field in row[1:5]) for row in rows)
+
+    @classmethod
+    def from_response(cls, response:str) -> "LimitTable":
+        """Builds a table from a LIM:DATA? response, the line count followed by five values per line.
+
+        Args:
+            response (str): The response.
+
+        Returns:
+            LimitTable: The table.
+        """
+        values = [float(value) for value in response.strip().split(",") if value.strip()]
+        count = int(values[0]) if values else 0
+        return cls(values[1 + index * 5:6 + index * 5] for index in range(count))
+
+    def save(self, path:str):
+        """Writes the table to a CSV file that from_file() reads back.
+
+        Args:
+            path (str): The CSV file.
+        """
+        names = {number: name for name, number in _LINE_TYPES.items()}
+        with open(path, "w", newline="") as limit_file:
+            writer = csv.writer(limit_file)
+            writer.writerow(("type", "start", "stop", "start_level", "stop_level"))
+            for kind, start, stop, start_level, stop_level in self.lines:
+                writer.writerow((names[kind], repr(start), repr(stop), repr(start_level), repr(stop_level)))
+
+    def parameters(self) -> str:
+        """Returns the LIM:DATA parameters sending the whole table in one command: the line count
+        followed by the five values of every line.
+
+        Returns:
+            str: The comma-separated parameters.
+        """
+        values = [str(len(self.lines))]
+        for kind, start, stop, start_level, stop_level in self.lines:
+            values.extend((str(kind), repr(start), repr(stop), repr(start_level), repr(stop_level)))
+        return ",".join(values)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the table with values rounded to 9 significant digits, so that a table read
+        back from the analyzer hashes the same as the one that was sent."""
+        text = ";".join(",".join(f"{value:.9g}" for value in line) for line in self.lines)
+        return hashlib.sha256(text.encode("ascii")).hexdigest()
+
+
+class LimitResult():
+    """
+    The outcome of LimitEngine.evaluate() for a batch of sweeps.
+
+    Attributes:
+        passed (numpy.ndarray): (sweeps,) True where a sweep is within all limits.
+        margin (numpy.ndarray): (sweeps, points) distance from each point to its nearest limit,
+            negative where the limit is violated and inf where no limit applies.
+        worst_margin (numpy.ndarray): (sweeps,) smallest margin of each sweep.
+        worst_index (numpy.ndarray): (sweeps,) point index of the smallest margin.
+        failed (numpy.ndarray): (sweeps, points) True at points outside a limit.
+    """
+    def __init__(self, margin:np.ndarray):
+        self.margin = margin
+        self.failed = margin < 0
+        self.passed = ~self.failed.any(axis=-1)
+        self.worst_index = np.argmin(margin, axis=-1)
+        self.worst_margin = np.take_along_axis(margin, self.worst_index[..., None], axis=-1)[..., 0]
+
+    def failing_indices(self, sweep:int=0) -> np.ndarray:
+        """Returns the point indices at which a sweep failed.
+
+        Args:
+            sweep (int, optional): Index of the sweep in the batch. Defaults to 0.
+
+        Returns:
+            np.ndarray: The failing point indices in ascending order.
+        """
+        return np.flatnonzero(self.failed.reshape(-1, self.failed.shape[-1])[sweep])
+
+
+class LimitEngine():
+    """
+    A limit table compiled for one stimulus grid. Maximum and minimum lines
+    become per-point upper and lower bounds, interpolated linearly between
+    the line's start and stop levels over the points within its stimulus
+    range. A single line bounds the trace, interpolated at its start
+    stimulus, between the start level (upper) and the stop level (lower).
+    """
+    def __init__(self, frequency:np.ndarray, lines=()):
+        """
+        Args:
+            frequency (np.ndarray): Ascending stimulus value of each point, e.g. sense.frequency.data.
+            lines (optional): Limit lines as (type, start, stop, start level, stop level) tuples, or an
+                object with a lines attribute holding them. Defaults to no lines.
+        """
+        self.frequency = np.asarray(frequency, dtype=np.float64)
+        self.lines = [_limit_line(line) for line in getattr(lines, "lines", lines)]
+        self.upper = np.full(self.frequency.size, np.inf)
+        self.lower = np.full(self.frequency.size, -np.inf)
+        single = []
+        for kind, start, stop, start_level, stop_level in self.lines:
+            if kind == 3:
+                single.append((start, start_level, stop_level))
+                continue
+            inside = (self.frequency >= min(start, stop)) & (self.frequency <= max(start, stop))
+            if kind == 0 or not inside.any():
+                continue
+            slope = (stop_level - start_level) / (stop - start) if stop != start else 0.0
+            limit = start_level + (self.frequency[inside] - start) * slope
+            if kind == 1:
+                self.upper[inside] = np.minimum(self.upper[inside], limit)
+            else:
+                self.lower[inside] = np.maximum(self.lower[inside], limit)
+        single = np.array(single, dtype=np.float64).reshape(-1, 3)
+        self.single_x, self.single_upper, self.single_lower = single.T
+        # A single-point failure is reported at the point nearest its stimulus.
+        self.single_index = np.abs(self.frequency[:, None] - self.single_x).argmin(axis=0) if single.size else np.zeros(0, dtype=int)
+
+    def evaluate(self, values:np.ndarray) -> LimitResult:
+        """Tests one sweep or a batch of sweeps against the limit table.
+
+        Args:
+            values (np.ndarray): (points,) or (sweeps, points) formatted primary values.
+
+        Returns:
+            LimitResult: Pass/fail, margins and failing points of each sweep.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        margin = np.minimum(self.upper - values, values - self.lower)
+        if self.single_x.size:
+            responses = interpolate(self.frequency, values, self.single_x)
+            single_margin = np.minimum(self.single_upper - responses, responses - self.single_lower)
+            for column, index in enumerate(self.single_index):
+                margin[..., index] = np.minimum(margin[..., index], single_margin[..., column])
+        return LimitResult(margin)
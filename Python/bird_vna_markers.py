@@ -0,0 +1,368 @@
+"""
+Example Description:
+        This module evaluates markers on the host from trace data that has
+        already been read, instead of querying the analyzer for each marker.
+        MarkerEngine mirrors calculate.marker: marker positions (x), the
+        interpolated response at each marker (y), quick positioning (set) and
+        the marker searches of calculate.marker.function, as well as the
+        bandwidth search of calculate.marker.bandwidth. Every operation
+        works on many markers and many sweeps at once:
+
+            sweeps = np.array([sweep[1] for sweep in bna1k.stream(count=100)])
+            markers = MarkerEngine(bna1k.sense.frequency.data, markers=4)
+            markers.x = (329e6, 834e6, 888e6, 2.4e9)
+            y1, y2 = markers.y(sweeps)                  # (100, 4) responses
+            markers.search(sweeps, "minimum", markers=(1,))
+            results = bandwidth_search(markers.frequency, sweeps, threshold=-3.0)
+            print(results["bandwidth"], results["q"])
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_markers.py
+
+"""
+import numpy as np
+
+# Search types accepted by MarkerEngine.search(), as in calculate.marker.function.searchtype
+# and by their SCPI names.
+_SEARCH_TYPES = {'maximum': "MAX",
+                 'minimum': "MIN",
+                 'peak': "PEAK",
+                 'leftpeak': "LPE",
+                 'rightpeak': "RPE",
+                 'target': "TARG",
+                 'leftarget': "LTAR",
+                 'righttarget': "RTAR",
+                 }
+_SEARCH_TYPES.update({value.lower(): value for value in list(_SEARCH_TYPES.values())})
+_SEARCH_TYPES.update({'max': "MAX", 'min': "MIN"})
+
+# Row layout of bandwidth_search(), in the order of calculate.marker.bandwidth.searchdata().
+BANDWIDTH_DTYPE = np.dtype([("bandwidth", "f8"), ("center", "f8"), ("low", "f8"), ("high", "f8"), ("q", "f8"), ("loss", "f8")])
+
+
+def interpolate(frequency:np.ndarray, values:np.ndarray, x:np.ndarray) -> np.ndarray:
+    """Linearly interpolates traces at stimulus positions, clamping positions outside the sweep
+    to its ends as the analyzer does.
+
+    Args:
+        frequency (np.ndarray): Ascending stimulus value of each of the N points.
+        values (np.ndarray): (..., N) trace data.
+        x (np.ndarray): (M,) positions shared by all traces, or (..., M) positions per trace.
+
+    Returns:
+        np.ndarray: (..., M) interpolated values.
+    """
+    values = np.asarray(values)
+    x = np.asarray(x, dtype=np.float64)
+    shape = np.broadcast_shapes(values.shape[:-1], x.shape[:-1]) + x.shape[-1:]
+    x = np.broadcast_to(x, shape)
+    values = np.broadcast_to(values, shape[:-1] + values.shape[-1:])
+    segment = np.clip(np.searchsorted(frequency, x, side="right") - 1, 0, frequency.size - 2)
+    start = frequency[segment]
+    width = frequency[segment + 1] - start
+    # Segmented sweeps can repeat a frequency at a segment boundary; such a zero-width step takes the left value.
+    fraction = np.divide(x - start, width, out=np.zeros(shape), where=width > 0)
+    fraction = np.clip(fraction, 0.0, 1.0)
+    left = np.take_along_axis(values, segment, axis=-1)
+    right = np.take_along_axis(values, segment + 1, axis=-1)
+    return left + fraction * (right - left)
+
+
+def _crossings(frequency:np.ndarray, values:np.ndarray, level) -> np.ndarray:
+    """Returns the interpolated stimulus value at which each segment between two points crosses
+    a level, NaN for segments that do not cross, shape (..., N - 1)."""
+    level = np.asarray(level, dtype=np.float64)[..., None]
+    above = values >= level
+    crossed = above[..., 1:] != above[..., :-1]
+    step = values[..., 1:] - values[..., :-1]
+    fraction = np.divide(level - values[..., :-1], step, out=np.zeros(step.shape), where=crossed)
+    return np.where(crossed, frequency[:-1] + fraction * np.diff(frequency), np.nan)
+
+
+def _nearest(candidates:np.ndarray, lower:np.ndarray, upper:np.ndarray, x:np.ndarray, side:str, strict:bool) -> np.ndarray:
+    """Finds, for every marker, the nearest candidate position on one side of it.
+
+    Candidates belong to cells of the stimulus axis (points or the segments between them) and are
+    therefore ordered, so the search starts at the cell holding the marker and steps over at most
+    the candidates that coincide with the marker.
+
+    Args:
+        candidates (np.ndarray): (S, K) candidate stimulus value of each cell, NaN for cells without one.
+        lower (np.ndarray): (K,) lowest stimulus value a candidate of each cell can have.
+        upper (np.ndarray): (K,) highest stimulus value a candidate of each cell can have.
+        x (np.ndarray): (S, M) marker positions.
+        side (str): "left" or "right".
+        strict (bool): Whether a candidate at the marker position itself is excluded.
+
+    Returns:
+        np.ndarray: (S, M) positions, NaN where there is no candidate on that side.
+    """
+    count = candidates.shape[-1]
+    present = ~np.isnan(candidates)
+    rows = np.arange(candidates.shape[0])[:, None]
+    if side == "left":
+        # Index of the last candidate at or before each cell.
+        nearest = np.maximum.accumulate(np.where(present, np.arange(count), -1), axis=-1)
+        index = np.searchsorted(lower, x, side="right") - 1
+        index = np.where(index >= 0, nearest[rows, np.clip(index, 0, count - 1)], -1)
+        for _ in range(2):
+            value = candidates[rows, np.clip(index, 0, count - 1)]
+            beyond = (index >= 0) & ((value >= x) if strict else (value > x))
+            previous = np.where(index > 0, nearest[rows, np.clip(index - 1, 0, count - 1)], -1)
+            index = np.where(beyond, previous, index)
+        valid = index >= 0
+    else:
+        # Index of the first candidate at or after each cell.
+        nearest = np.minimum.accumulate(np.where(present, np.arange(count), count)[:, ::-1], axis=-1)[:, ::-1]
+        index = np.searchsorted(upper, x, side="left")
+        index = np.where(index < count, nearest[rows, np.clip(index, 0, count - 1)], count)
+        for _ in range(2):
+            value = candidates[rows, np.clip(index, 0, count - 1)]
+            beyond = (index < count) & ((value <= x) if strict else (value < x))
+            following = np.where(index < count - 1, nearest[rows, np.clip(index + 1, 0, count - 1)], count)
+            index = np.where(beyond, following, index)
+        valid = index < count
+    return np.where(valid, candidates[rows, np.clip(index, 0, count - 1)], np.nan)
+
+
+def marker_search(frequency:np.ndarray, values:np.ndarray, search_type:str, x:np.ndarray, target:float=0.0) -> np.ndarray:
+    """Performs a marker search on a batch of traces, as calculate.marker.function.seachexecute()
+    does on the analyzer. A marker whose search finds nothing keeps its position.
+
+    Args:
+        frequency (np.ndarray): Ascending stimulus value of each of the N points.
+        values (np.ndarray): (S, N) formatted primary values of S sweeps.
+        search_type (str): 'maximum', 'minimum', 'peak', 'leftpeak', 'rightpeak', 'target',
+            'leftarget' or 'righttarget', or the SCPI names 'max', 'min', 'lpe', 'rpe', 'targ', 'ltar' and 'rtar'.
+        x (np.ndarray): (S, M) marker positions the left/right searches and target search start from.
+        target (float, optional): Level of the target searches. Defaults to 0.0.
+
+    Returns:
+        np.ndarray: (S, M) new marker positions.
+    """
+    search_type = _SEARCH_TYPES[search_type.lower()]
+    if search_type in ("MAX", "MIN"):
+        index = np.argmax(values, axis=-1) if search_type == "MAX" else np.argmin(values, axis=-1)
+        return np.broadcast_to(frequency[index][:, None], x.shape).copy()
+    if search_type in ("PEAK", "LPE", "RPE"):
+        peaks = np.zeros(values.shape, dtype=bool)
+        peaks[:, 1:-1] = (values[:, 1:-1] > values[:, :-2]) & (values[:, 1:-1] >= values[:, 2:])
+        if search_type == "PEAK":
+            highest = np.argmax(np.where(peaks, values, -np.inf), axis=-1)
+            found = np.where(peaks.any(axis=-1), frequency[highest], np.nan)[:, None]
+        else:
+            candidates = np.where(peaks, frequency, np.nan)
+            found = _nearest(candidates, frequency, frequency, x, "left" if search_type == "LPE" else "right", True)
+        return np.where(np.isnan(found), x, found)
+    candidates = _crossings(frequency, values, np.full(values.shape[0], target))
+    if search_type == "TARG":
+        left = _nearest(candidates, frequency[:-1], frequency[1:], x, "left", False)
+        right = _nearest(candidates, frequency[:-1], frequency[1:], x, "right", False)
+        found = np.where(np.isnan(right) | (np.abs(x - left) <= np.abs(right - x)), left, right)
+    else:
+        found = _nearest(candidates, frequency[:-1], frequency[1:], x, "left" if search_type == "LTAR" else "right", True)
+    return np.where(np.isnan(found), x, found)
+
+
+def bandwidth_search(frequency:np.ndarray, values:np.ndarray, threshold:float=-3.0, search_type:str="bandpass",
+                     reference:str="maximum", x:np.ndarray=None) -> np.ndarray:
+    """Performs the bandwidth search of calculate.marker.bandwidth on a batch of traces. The
+    reference point is the marker, the maximum or the minimum of each trace. A bandpass search
+    measures the bandwidth where the trace crosses the reference value plus the threshold on
+    either side of the reference point; a notch search measures it at that level on either side
+    of the minimum. Where a trace does not cross the level on both sides, all six values are 0.
+
+    Args:
+        frequency (np.ndarray): Ascending stimulus value of each of the N points.
+        values (np.ndarray): (S, N) or (N,) formatted primary values, e.g. S21 in dB.
+        threshold (float, optional): Bandwidth definition value relative to the reference, as set
+            with searchvalue. Defaults to -3.0.
+        search_type (str, optional): 'bandpass' or 'notch'. Defaults to "bandpass".
+        reference (str, optional): 'marker', 'maximum' or 'minimum'. Defaults to "maximum".
+        x (np.ndarray, optional): Marker position, scalar or one per sweep, when the reference is
+            the marker. Defaults to None.
+
+    Returns:
+        np.ndarray: Structured array of BANDWIDTH_DTYPE (bandwidth, center, low, high, q, loss),
+            one row per sweep, or a single row for one trace.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    single = values.ndim == 1
+    values = values.reshape(-1, values.shape[-1])
+    rows = np.arange(values.shape[0])
+    reference_dict = {'marker': "MARK",
+                      'maximum': "MAX",
+                      'minimum': "MIN",
+                      }
+    reference = reference_dict[reference]
+    if reference == "MAX":
+        index = np.argmax(values, axis=-1)
+    elif reference == "MIN":
+        index = np.argmin(values, axis=-1)
+    else:
+        position = np.broadcast_to(np.asarray(x, dtype=np.float64), rows.shape)
+        # The point nearest the marker, the earlier one on a tie.
+        right = np.clip(np.searchsorted(frequency, position, side="left"), 0, frequency.size - 1)
+        left = np.clip(right - 1, 0, frequency.size - 1)
+        index = np.where(np.abs(frequency[left] - position) <= np.abs(frequency[right] - position), left, right)
+    level = values[rows, index] + threshold
+    search_dict = {'bandpass': "BPAS",
+                   'notch': "NOTC",
+                   }
+    if search_dict[search_type] == "NOTC":
+        index = np.argmin(values, axis=-1)
+    loss = values[rows, index]
+    candidates = _crossings(frequency, values, level)
+    center_point = frequency[index][:, None]
+    low = _nearest(candidates, frequency[:-1], frequency[1:], center_point, "left", False)[:, 0]
+    high = _nearest(candidates, frequency[:-1], frequency[1:], center_point, "right", False)[:, 0]
+    found = ~(np.isnan(low) | np.isnan(high))
+    result = np.zeros(values.shape[0], dtype=BANDWIDTH_DTYPE)
+    bandwidth = np.where(found, high - low, 0.0)
+    center = np.where(found, (high + low) / 2, 0.0)
+    result["bandwidth"] = bandwidth
+    result["center"] = center
+    result["low"] = np.where(found, low, 0.0)
+    result["high"] = np.where(found, high, 0.0)
+    result["q"] = np.divide(center, bandwidth, out=np.zeros(bandwidth.shape), where=bandwidth != 0)
+    result["loss"] = np.where(found, loss, 0.0)
+    return result[0] if single else result
+
+
+class MarkerEngine():
+    """
+    Host-side markers over a fixed stimulus axis, mirroring calculate.marker.
+    Marker numbers start at 1 as on the analyzer. Positions are shared by all
+    sweeps until a search on a batch of sweeps gives every sweep its own
+    positions, after which x has the shape (sweeps, markers).
+    """
+    def __init__(self, frequency:np.ndarray, markers:int=1):
+        """
+        Args:
+            frequency (np.ndarray): Ascending stimulus value of each point, e.g. sense.frequency.data.
+            markers (int, optional): Number of markers. Defaults to 1.
+        """
+        self.frequency = np.asarray(frequency, dtype=np.float64)
+        self.x = np.full(markers, (self.frequency[0] + self.frequency[-1]) / 2)
+
+    @property
+    def x(self) -> np.ndarray:
+        """Marker positions, shape (markers,) or (sweeps, markers)."""
+        return self.__x
+
+    @x.setter
+    def x(self, positions):
+        """Sets the marker positions, clamped to the stimulus range as on the analyzer.
+
+        Args:
+            positions: (markers,) or (sweeps, markers) positions.
+        """
+        self.__x = np.clip(np.atleast_1d(np.array(positions, dtype=np.float64)), self.frequency.min(), self.frequency.max())
+
+    @property
+    def markers(self) -> int:
+        """Number of markers."""
+        return self.__x.shape[-1]
+
+    def __columns(self, markers) -> np.ndarray:
+        if markers is None:
+            return np.arange(self.markers)
+        return np.asarray(markers, dtype=int).reshape(-1) - 1
+
+    def set(self, location:str="center", markers:tuple=None):
+        """Moves markers to a position of the stimulus axis.
+
+        Args:
+            location (str, optional): 'start', 'stop' or 'center'. Defaults to "center".
+            markers (tuple, optional): Marker numbers to move. Defaults to all markers.
+        """
+        location_dict = {"start": self.frequency[0],
+                         "stop": self.frequency[-1],
+                         "center": (self.frequency[0] + self.frequency[-1]) / 2,
+                         }
+        self.__x[..., self.__columns(markers)] = location_dict[location]
+
+    def y(self, primary:np.ndarray, secondary:np.ndarray=None) -> tuple[np.ndarray, np.ndarray]:
+        """Reads the response at every marker by linear interpolation between the points.
+
+        Args:
+            primary (np.ndarray): (points,) or (sweeps, points) formatted primary values.
+            secondary (np.ndarray, optional): Secondary values of the same shape. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Primary and secondary response, shape (markers,) or
+                (sweeps, markers). The secondary response is 0 when no secondary values are given.
+        """
+        y1 = interpolate(self.frequency, primary, self.__x)
+        y2 = np.zeros_like(y1) if secondary is None else interpolate(self.frequency, secondary, self.__x)
+        return y1, y2
+
+    def search(self, primary:np.ndarray, search:str="maximum", target:float=-10.0, markers:tuple=None) -> np.ndarray:
+        """Runs a marker search on one sweep or a batch of sweeps and moves the markers to the result.
+        Once a batch search has given every sweep its own positions, later searches must be on a batch
+        of the same number of sweeps; anything else raises ValueError until x is set again.
+
+        Args:
+            primary (np.ndarray): (points,) or (sweeps, points) formatted primary values.
+            search (str, optional): 'maximum', 'minimum', 'peak', 'leftpeak', 'rightpeak', 'target',
+                'leftarget' or 'righttarget' (or 'max', 'min', 'lpe', 'rpe', 'targ', 'ltar', 'rtar').
+                Defaults to 'maximum'.
+            target (float, optional): Level of the target searches. Defaults to -10.0.
+            markers (tuple, optional): Marker numbers to search with. Defaults to all markers.
+
+        Returns:
+            np.ndarray: The new marker positions, shape (markers,) for one sweep or (sweeps, markers).
+        """
+        primary = np.asarray(primary, dtype=np.float64)
+        single = primary.ndim == 1
+        values = primary.reshape(-1, primary.shape[-1])
+        if self.__x.ndim == 2 and (single or values.shape[0] != self.__x.shape[0]):
+            raise ValueError(f"The markers hold positions for {self.__x.shape[0]} sweeps, so the search needs "
+                             f"({self.__x.shape[0]}, points) values; set x to search other sweeps.")
+        columns = self.__columns(markers)
+        x = np.broadcast_to(self.__x, (values.shape[0], self.markers)).copy()
+        x[:, columns] = marker_search(self.frequency, values, search, x[:, columns], target)
+        self.__x = x[0] if single and self.__x.ndim == 1 else x
+        return self.__x
+
+    def bandwidth(self, primary:np.ndarray, threshold:float=-3.0, search_type:str="bandpass", reference:str="maximum",
+                  marker:int=1) -> np.ndarray:
+        """Runs the bandwidth search of calculate.marker.bandwidth.searchdata() on one sweep or a batch of sweeps.
+
+        Args:
+            primary (np.ndarray): (points,) or (sweeps, points) formatted primary values.
+            threshold (float, optional): Bandwidth definition value. Defaults to -3.0.
+            search_type (str, optional): 'bandpass' or 'notch'. Defaults to "bandpass".
+            reference (str, optional): 'marker', 'maximum' or 'minimum'. Defaults to "maximum".
+            marker (int, optional): The marker used as the reference. Defaults to 1.
+
+        Returns:
+            np.ndarray: Structured array of (bandwidth, center, low, high, q, loss), one row per sweep.
+        """
+        return bandwidth_search(self.frequency, primary, threshold, search_type, reference, self.__x[..., marker - 1])
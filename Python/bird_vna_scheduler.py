@@ -0,0 +1,260 @@
+"""
+Example Description:
+        This module runs measurements at fixed periods, e.g. logging markers
+        every 10 s for 24 hours as in ex09, without a busy-wait loop. Every
+        deadline is computed from the start of its schedule on the monotonic
+        clock (start + n * period), so the period does not drift by the time
+        a measurement takes. The scheduler sleeps until the next deadline
+        instead of polling. A deadline that arrives while the previous run of
+        its schedule is still in progress is skipped and counted as missed.
+        Schedules on different instruments run in parallel, while schedules
+        sharing an instrument are run one at a time on that instrument's worker:
+
+            scheduler = SweepScheduler()
+            scheduler.add(log_markers, period=10.0, instrument=bna1k, count=8640)
+            scheduler.add(log_temperature, period=60.0, instrument=bna2)
+            scheduler.run(duration=24 * 3600)
+            print(scheduler.statistics())
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_scheduler.py
+
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Schedule():
+    """
+    One periodic measurement registered with a SweepScheduler, with its
+    accounting of runs, missed deadlines, lateness and errors.
+    """
+    def __init__(self, action, period:float, instrument=None, count:int=None, name:str=None):
+        """
+        Args:
+            action: Function run at each deadline. It is called with the instrument when one is given,
+                otherwise with no arguments.
+            period (float): Seconds between deadlines.
+            instrument (optional): Instrument (e.g. a BirdVectorNetworkAnalyzer) the action uses; actions
+                of schedules sharing an instrument never run at the same time. Defaults to None.
+            count (int, optional): Number of deadlines, missed ones included, after which the schedule
+                ends. Defaults to None, running until the scheduler stops.
+            name (str, optional): Name reported in the statistics. Defaults to the action's name.
+        """
+        if period <= 0:
+            raise ValueError(f"{period}: the period must be positive.")
+        self.action = action
+        self.period = period
+        self.instrument = instrument
+        self.count = count
+        self.name = name or getattr(action, "__name__", repr(action))
+        self.runs = 0
+        self.missed = 0
+        self.errors = 0
+        self.last_error = None
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.last_duration = 0.0
+        self.cancelled = False
+        self.running = False
+        self.origin = None
+        self.slot = 0
+
+    def cancel(self):
+        """Stops the schedule after the run in progress, if any."""
+        self.cancelled = True
+
+    def statistics(self) -> dict:
+        """Reports how the schedule has kept to its period.
+
+        Returns:
+            dict: Runs completed, deadlines missed, failed runs, the largest and mean delay of a run's
+                start after its deadline and the duration of the last run, in seconds.
+        """
+        return {"name": self.name,
+                "period": self.period,
+                "runs": self.runs,
+                "missed": self.missed,
+                "errors": self.errors,
+                "max_lateness": self.max_lateness,
+                "mean_lateness": self.total_lateness / self.runs if self.runs else 0.0,
+                "last_duration": self.last_duration,
+                }
+
+
+class SweepScheduler():
+    """
+    Runs Schedules at their deadlines. run() blocks until every schedule has
+    ended, the duration has elapsed or stop() is called.
+    """
+    def __init__(self, clock=time.monotonic, sleep=None, threaded:bool=True):
+        """
+        Args:
+            clock (optional): Monotonic clock returning seconds. Defaults to time.monotonic.
+            sleep (optional): Function waiting a number of seconds on that clock, for use with a
+                simulated clock. Defaults to None, waiting on an event that add() and stop() interrupt.
+            threaded (bool, optional): Run actions on one worker thread per instrument. When False, every
+                action runs on the thread calling run(), one at a time. Defaults to True.
+        """
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__threaded = threaded
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__queue = []
+        self.__order = itertools.count()
+        self.__schedules = []
+        self.__workers = {}
+        self.__stopped = False
+
+    @property
+    def schedules(self) -> list:
+        """The schedules added to the scheduler."""
+        return list(self.__schedules)
+
+    def add(self, action, period:float, instrument=None, count:int=None, name:str=None, delay:float=0.0) -> Schedule:
+        """Adds a periodic measurement. It can be called while the scheduler is running.
+
+        Args:
+            action: Function run at each deadline, called with the instrument when one is given.
+            period (float): Seconds between deadlines.
+            instrument (optional): Instrument the action uses. Defaults to None.
+            count (int, optional): Number of deadlines before the schedule ends. Defaults to None.
+            name (str, optional): Name reported in the statistics. Defaults to the action's name.
+            delay (float, optional): Seconds from now to the first deadline. Defaults to 0.0.
+
+        Returns:
+            Schedule: The schedule, whose cancel() method removes it again.
+        """
+        schedule = Schedule(action, period, instrument, count, name)
+        schedule.origin = self.__clock() + delay
+        with self.__lock:
+            self.__schedules.append(schedule)
+            if count is None or count > 0:
+                heapq.heappush(self.__queue, (schedule.origin, next(self.__order), schedule))
+        self.__wakeup.set()
+        return schedule
+
+    def stop(self):
+        """Makes run() return once the runs in progress have finished."""
+        self.__stopped = True
+        self.__wakeup.set()
+
+    def statistics(self) -> list[dict]:
+        """Reports the statistics of every schedule.
+
+        Returns:
+            list[dict]: One Schedule.statistics() entry per schedule.
+        """
+        return [schedule.statistics() for schedule in self.__schedules]
+
+    def run(self, duration:float=None):
+        """Runs the schedules until all of them have ended, the duration has elapsed or stop() is called.
+
+        Args:
+            duration (float, optional): Seconds to run for. Defaults to None, running until the
+                schedules end or stop() is called.
+        """
+        self.__stopped = False
+        end = math.inf if duration is None else self.__clock() + duration
+        try:
+            while not self.__stopped:
+                self.__wakeup.clear()
+                with self.__lock:
+                    if not self.__queue:
+                        break
+                    deadline, _, schedule = self.__queue[0]
+                now = self.__clock()
+                if now >= end:
+                    break
+                if deadline > now:
+                    self.__wait(min(deadline, end) - now)
+                    continue
+                with self.__lock:
+                    heapq.heappop(self.__queue)
+                if schedule.cancelled:
+                    continue
+                self.__dispatch(schedule, deadline)
+                # The next deadline stays on the grid origin + n * period; deadlines that already
+                # passed while the scheduler was behind are skipped and counted as missed.
+                slot = max(schedule.slot + 1, math.floor((self.__clock() - schedule.origin) / schedule.period) + 1)
+                schedule.missed += slot - schedule.slot - 1
+                schedule.slot = slot
+                if schedule.count is not None and slot >= schedule.count:
+                    continue
+                with self.__lock:
+                    heapq.heappush(self.__queue, (schedule.origin + slot * schedule.period, next(self.__order), schedule))
+        finally:
+            for worker in self.__workers.values():
+                worker.shutdown(wait=True)
+            self.__workers.clear()
+
+    def __wait(self, seconds:float):
+        if self.__sleep is not None:
+            self.__sleep(seconds)
+            return
+        self.__wakeup.wait(seconds)
+
+    def __dispatch(self, schedule:Schedule, deadline:float):
+        if schedule.running:
+            schedule.missed += 1
+            return
+        if not self.__threaded:
+            self.__execute(schedule, deadline)
+            return
+        key = schedule.instrument if schedule.instrument is not None else schedule
+        worker = self.__workers.get(key)
+        if worker is None:
+            worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"vna-schedule-{schedule.name}")
+            self.__workers[key] = worker
+        schedule.running = True
+        worker.submit(self.__execute, schedule, deadline)
+
+    def __execute(self, schedule:Schedule, deadline:float):
+        started = self.__clock()
+        lateness = max(started - deadline, 0.0)
+        schedule.max_lateness = max(schedule.max_lateness, lateness)
+        schedule.total_lateness += lateness
+        try:
+            if schedule.instrument is not None:
+                schedule.action(schedule.instrument)
+            else:
+                schedule.action()
+        except Exception as error:
+            schedule.errors += 1
+            schedule.last_error = error
+        finally:
+            schedule.last_duration = self.__clock() - started
+            schedule.runs += 1
+            schedule.running = False
+            self.__wakeup.set()
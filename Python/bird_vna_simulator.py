@@ -0,0 +1,1128 @@
+"""
+Example Description:
+        This module provides a simulated Bird vector network analyzer that
+        can be used in place of a pyvisa resource. It understands the SCPI
+        command tree emitted by bird_vector_network_analyzer.py, keeps state
+        per channel, trace and marker, and produces S-parameter data from
+        simple antenna and bandpass filter models. A configurable latency
+        can be applied to every bus transaction so that the throughput of
+        scripts can be studied without an instrument on the bench.
+
+@verbatim
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_simulator.py
+
+"""
+import copy
+import re
+import threading
+import time
+
+import numpy as np
+
+from bird_vector_network_analyzer import _short_form
+from bird_vna_formats import format_data
+
+
+class AntennaModel():
+    """
+    A multi-band antenna seen through a short length of feed cable. Each band is
+    a resonance which pulls the reflection coefficient down towards a match.
+    """
+    def __init__(self, resonances:tuple=((329e6, 12.0, 0.85), (834e6, 25.0, 0.9), (888e6, 25.0, 0.88), (2.4e9, 18.0, 0.92)),
+                 mismatch:float=0.95, feed_delay:float=1.5e-9):
+        """
+        Args:
+            resonances (tuple, optional): (frequency, quality factor, depth) for each band, where a depth of 1.0 gives a perfect match.
+            mismatch (float, optional): Magnitude of the reflection coefficient away from the bands. Defaults to 0.95.
+            feed_delay (float, optional): One-way delay of the feed cable in seconds. Defaults to 1.5e-9.
+        """
+        self.resonances = resonances
+        self.mismatch = mismatch
+        self.feed_delay = feed_delay
+
+    def sparameters(self, frequency:np.ndarray) -> dict:
+        """Computes the S-parameters of the model.
+
+        Args:
+            frequency (np.ndarray): Stimulus frequencies in Hz.
+
+        Returns:
+            dict: Complex arrays keyed by "S11", "S21", "S12" and "S22".
+        """
+        frequency = np.maximum(np.asarray(frequency, dtype=np.float64), 1.0)
+        gamma = np.full(frequency.shape, self.mismatch, dtype=np.complex128)
+        for f0, q, depth in self.resonances:
+            gamma -= self.mismatch * depth / (1.0 + 1j * q * (frequency / f0 - f0 / frequency))
+        feed = np.exp(-2j * np.pi * frequency * self.feed_delay)
+        s11 = gamma * feed * feed
+        coupling = 0.01 * (1.0 - np.abs(gamma) ** 2) * feed
+        return {"S11": s11, "S21": coupling, "S12": coupling, "S22": s11}
+
+
+class BandpassFilterModel():
+    """
+    A lossless Butterworth bandpass filter with a flat insertion loss and a line
+    delay at each port.
+    """
+    def __init__(self, center:float=433e6, bandwidth:float=10e6, order:int=5, insertion_loss:float=1.0, delay:float=0.5e-9):
+        """
+        Args:
+            center (float, optional): Center frequency in Hz. Defaults to 433e6.
+            bandwidth (float, optional): 3 dB bandwidth in Hz. Defaults to 10e6.
+            order (int, optional): Number of resonators. Defaults to 5.
+            insertion_loss (float, optional): Passband loss in dB. Defaults to 1.0.
+            delay (float, optional): Line delay at each port in seconds. Defaults to 0.5e-9.
+        """
+        self.center = center
+        self.bandwidth = bandwidth
+        self.order = order
+        self.insertion_loss = insertion_loss
+        self.delay = delay
+
+    def sparameters(self, frequency:np.ndarray) -> dict:
+        """Computes the S-parameters of the model.
+
+        Args:
+            frequency (np.ndarray): Stimulus frequencies in Hz.
+
+        Returns:
+            dict: Complex arrays keyed by "S11", "S21", "S12" and "S22".
+        """
+        frequency = np.maximum(np.asarray(frequency, dtype=np.float64), 1.0)
+        s = 1j * (frequency / self.center - self.center / frequency) * self.center / self.bandwidth
+        k = np.arange(1, self.order + 1)
+        poles = np.exp(1j * np.pi * (2 * k + self.order - 1) / (2 * self.order))
+        denominator = np.prod(s[..., np.newaxis] - poles, axis=-1)
+        line = np.exp(-1j * 2 * np.pi * frequency * self.delay)
+        s21 = 10 ** (-self.insertion_loss / 20) / denominator * line * line
+        s11 = s ** self.order / denominator * line * line
+        return {"S11": s11, "S21": s21, "S12": s21, "S22": s11}
+
+
+def _format_trace(data:np.ndarray, frequency:np.ndarray, fmt:str, impedance:float=50.0) -> tuple[np.ndarray, np.ndarray]:
+    """Converts complex trace data into the primary and secondary values of a display format
+    with the host-side formatter of bird_vna_formats.py.
+
+    Args:
+        data (np.ndarray): Complex corrected data.
+        frequency (np.ndarray): Stimulus frequencies in Hz.
+        fmt (str): Short form of the format, e.g. MLOG or SMIT.
+        impedance (float, optional): Characteristic impedance for the Smith and admittance formats. Defaults to 50.0.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The primary and secondary values.
+    """
+    return format_data(data, fmt, frequency, impedance)
+
+
+class _Marker():
+    def __init__(self):
+        self.state = 0
+        self.x = None
+        self.search_type = "MAX"
+        self.target = 0.0
+        self.bw_type = "BPAS"
+        self.bw_threshold = -3.0
+
+
+class _Trace():
+    def __init__(self, number:int):
+        sparams = ("S11", "S21", "S12", "S22")
+        self.sparam = sparams[(number - 1) % 4]
+        self.format = "MLOG"
+        self.data = None
+        self.memory = None
+        self.formatted = None
+        self.formatted_memory = None
+        self.markers = {}
+        self.bw_state = 0
+        self.bw_reference = "MARK"
+        self.edelay_time = 0.0
+        self.edelay_media = "COAX"
+        self.edelay_distance = 0.0
+        self.phase_offset = 0.0
+        self.scale = 10.0
+        self.gate_type = "BPAS"
+        self.gate_center = 0.0
+        self.gate_start = 0.0
+        self.gate_shape = "NORM"
+        self.gate_state = 0
+
+    def marker(self, number:int) -> _Marker:
+        if number not in self.markers:
+            self.markers[number] = _Marker()
+        return self.markers[number]
+
+
+class _Channel():
+    def __init__(self):
+        self.start = 300e3
+        self.stop = 8.5e9
+        self.cw = 1e9
+        self.points = 201
+        self.point_time = 0.0
+        self.sweep_type = "LIN"
+        self.segments = []
+        self.segment_ifbw = 70e3
+        self.segment_enabled = []
+        self.continuous = 1
+        self.trace_count = 1
+        self.active_trace = 1
+        self.traces = {}
+        self.frequency = None
+        self.dirty = True
+        self.limit_lines = []
+        self.limit_state = 0
+        self.limit_display = 0
+        self.correction_state = 0
+        self.impedance = 50.0
+        self.calkit = 31
+        self.extension_ports = {}
+        self.layout = "D1"
+        self.maximize = 0
+
+    def trace(self, number:int) -> _Trace:
+        if number not in self.traces:
+            self.traces[number] = _Trace(number)
+        return self.traces[number]
+
+    def stimulus(self) -> np.ndarray:
+        if self.sweep_type == "LOG":
+            return np.geomspace(max(self.start, 1.0), max(self.stop, 1.0), self.points)
+        if self.sweep_type == "POW":
+            return np.full(self.points, self.cw)
+        if self.sweep_type == "SEG" and self.segments:
+            pieces = [np.linspace(start, stop, int(points)) for (start, stop, points), enabled
+                      in zip(self.segments, self.segment_enabled) if enabled]
+            if pieces:
+                return np.concatenate(pieces)
+        return np.linspace(self.start, self.stop, self.points)
+
+
+class SimulatedInstrument():
+    """
+    A stand-in for a pyvisa message based resource that emulates a Bird vector
+    network analyzer. Pass an instance to BirdVectorNetworkAnalyzer.initialize(),
+    or use a resource string of the form "SIM::<dut>::INSTR" where <dut> is
+    antenna or filter.
+    """
+    def __init__(self, resource_name:str="SIM::antenna::INSTR", dut=None, latency:float=0.0, command_latency:dict=None,
+                 point_duration:float=0.0, noise:float=1e-4, seed:int=None):
+        """
+        Args:
+            resource_name (str, optional): Name reported by the resource. The second field selects the device model when dut is not given. Defaults to "SIM::antenna::INSTR".
+            dut (optional): A device model providing sparameters(frequency). Defaults to the model named in resource_name.
+            latency (float, optional): Seconds added to every write and read transaction. Defaults to 0.0.
+            command_latency (dict, optional): Extra seconds added when a command whose header starts with a key is executed, e.g. {":SENS1:CORR:COLL": 0.5}. Defaults to None.
+            point_duration (float, optional): Seconds spent measuring each point of a sweep. Defaults to 0.0.
+            noise (float, optional): Standard deviation of the complex measurement noise. Defaults to 1e-4.
+            seed (int, optional): Seed of the noise generator. Defaults to None.
+        """
+        self.resource_name = resource_name
+        if dut is None:
+            fields = resource_name.split("::")
+            dut = BandpassFilterModel() if len(fields) > 1 and fields[1].lower() == "filter" else AntennaModel()
+        self.dut = dut
+        self.latency = latency
+        self.command_latency = dict(command_latency or {})
+        self.point_duration = point_duration
+        self.noise = noise
+        self.timeout = 2000
+        self.read_termination = "\n"
+        self.write_termination = "\n"
+        self.__rng = np.random.default_rng(seed)
+        self.__lock = threading.RLock()
+        self.__outputs = []
+        self.__files = {}
+        self.__busy_until = 0.0
+        self.__closed = False
+        self.reset_statistics()
+        self.__preset()
+
+    # ------------------------------------------------------------------ #
+    # pyvisa resource interface
+    # ------------------------------------------------------------------ #
+    def write(self, message:str) -> int:
+        """Sends a program message to the simulated instrument.
+
+        Args:
+            message (str): One or more ';' separated commands.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        return self.write_raw(message.encode("latin-1"))
+
+    def write_raw(self, message:bytes) -> int:
+        """Sends a program message which may contain IEEE 488.2 definite-length blocks.
+
+        Args:
+            message (bytes): The raw message.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        with self.__lock:
+            self.__transaction()
+            self.writes += 1
+            self.bytes_written += len(message)
+            if self.__outputs:
+                self.__outputs.clear()
+                self.errors.append('-410,"Query INTERRUPTED"')
+            responses = []
+            prefix = []
+            for header, params in _split_program_message(message):
+                if not header.startswith((":", "*")):
+                    header = ":".join(prefix + [header])
+                elif header.startswith(":"):
+                    header = header[1:]
+                if not header.startswith("*"):
+                    prefix = header.split(":")[:-1]
+                self.commands += 1
+                response = self.__execute(header, params)
+                if response is not None:
+                    responses.append(response)
+            if responses:
+                self.__outputs.append(b";".join(responses) + b"\n")
+            return len(message)
+
+    def read_raw(self, size:int=None) -> bytes:
+        """Reads the next response message including its termination character.
+
+        Returns:
+            bytes: The response.
+        """
+        with self.__lock:
+            self.__transaction()
+            if not self.__outputs:
+                raise TimeoutError(f"{self.resource_name}: no response is pending (query interrupted or undefined).")
+            self.reads += 1
+            response = self.__outputs.pop(0)
+            self.bytes_read += len(response)
+            return response
+
+    def read(self) -> str:
+        """Reads the next response message as text.
+
+        Returns:
+            str: The response without its termination character.
+        """
+        return self.read_raw().decode("latin-1").rstrip("\n")
+
+    def query(self, message:str) -> str:
+        """Writes a message and reads the response.
+
+        Args:
+            message (str): The query.
+
+        Returns:
+            str: The response.
+        """
+        self.write(message)
+        return self.read()
+
+    def clear(self):
+        """Discards any pending responses."""
+        with self.__lock:
+            self.__outputs.clear()
+
+    def close(self):
+        """Closes the simulated session."""
+        self.__closed = True
+
+    def reset_statistics(self):
+        """Clears the transaction counters."""
+        self.writes = 0
+        self.reads = 0
+        self.commands = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def statistics(self) -> dict:
+        """Reports the transaction counters.
+
+        Returns:
+            dict: Counts of writes, reads, commands, bytes_written and bytes_read.
+        """
+        return {"writes": self.writes,
+                "reads": self.reads,
+                "commands": self.commands,
+                "bytes_written": self.bytes_written,
+                "bytes_read": self.bytes_read,
+                }
+
+    def __transaction(self):
+        if self.__closed:
+            raise ConnectionError(f"{self.resource_name} is closed.")
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    # ------------------------------------------------------------------ #
+    # Command execution
+    # ------------------------------------------------------------------ #
+    def __preset(self):
+        self.channels = {}
+        self.active_channel = 1
+        self.trigger_source = "INT"
+        self.trigger_scope = "ACT"
+        self.data_format = "ASC"
+        self.byte_order = "NORM"
+        self.display_enable = 1
+        self.fail_sign = 0
+        self.state_type = "STAT"
+        self.errors = []
+
+    def channel(self, number:int) -> _Channel:
+        """Returns the state of a channel, creating it on first use.
+
+        Args:
+            number (int): The channel number.
+
+        Returns:
+            _Channel: The channel state.
+        """
+        if number not in self.channels:
+            self.channels[number] = _Channel()
+        return self.channels[number]
+
+    def __execute(self, header:str, params:list):
+        is_query = header.endswith("?")
+        nodes = []
+        suffixes = {}
+        for node in header.rstrip("?").split(":"):
+            match = re.fullmatch(r"(\*?[A-Za-z]+)(\d*)", node)
+            if match is None:
+                self.errors.append('-113,"Undefined header"')
+                return None
+            mnemonic = _short_form(match.group(1).upper())
+            nodes.append(mnemonic)
+            if match.group(2):
+                suffixes[mnemonic] = int(match.group(2))
+        key = ":".join(node for node in nodes if node != "TRAC" or nodes[0] != "CALC")
+        for prefix, delay in self.command_latency.items():
+            if header.upper().startswith(prefix.lstrip(":").upper()):
+                time.sleep(delay)
+        handler = _HANDLERS.get((key, is_query))
+        if handler is None:
+            handler = _HANDLERS.get((key, None))
+        if handler is None:
+            self.errors.append(f'-113,"Undefined header; {header}"')
+            return None
+        if nodes[0] in ("CALC", "SENS", "INIT") and nodes[0] in suffixes:
+            self.active_channel = suffixes[nodes[0]]
+        try:
+            response = handler(self, _Address(nodes, suffixes, self), params, is_query)
+        except (ValueError, IndexError, KeyError):
+            self.errors.append(f'-224,"Illegal parameter value; {header}"')
+            return None
+        if is_query:
+            if response is None:
+                response = ""
+            if isinstance(response, str):
+                response = response.encode("latin-1")
+            return response
+        return None
+
+    def encode_array(self, values:np.ndarray) -> bytes:
+        """Encodes a numeric array in the active transfer format.
+
+        Args:
+            values (np.ndarray): The values to send.
+
+        Returns:
+            bytes: A comma separated list or an IEEE 488.2 definite-length block.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if self.data_format == "ASC":
+            return ",".join("%.12E" % value for value in values.tolist()).encode("latin-1")
+        byte_order = ">" if self.byte_order == "NORM" else "<"
+        size = "f4" if self.data_format == "REAL32" else "f8"
+        payload = values.astype(f"{byte_order}{size}").tobytes()
+        length = str(len(payload))
+        return f"#{len(length)}{length}".encode("latin-1") + payload
+
+    def decode_array(self, params:list) -> np.ndarray:
+        """Decodes the numeric array parameter of a command.
+
+        Args:
+            params (list): Parsed parameters; a single bytes block or a list of numbers.
+
+        Returns:
+            np.ndarray: The values as float64.
+        """
+        if len(params) == 1 and isinstance(params[0], bytes):
+            byte_order = ">" if self.byte_order == "NORM" else "<"
+            size = "f4" if self.data_format == "REAL32" else "f8"
+            return np.frombuffer(params[0], dtype=f"{byte_order}{size}").astype(np.float64)
+        return np.array([float(param) for param in params], dtype=np.float64)
+
+    def busy_time(self) -> float:
+        """Returns the time left until the sweep in progress, if any, is complete.
+
+        Returns:
+            float: Seconds; 0.0 when the instrument is idle.
+        """
+        return max(self.__busy_until - time.monotonic(), 0.0)
+
+    def wait_for_sweep(self):
+        """Blocks until the sweep in progress, if any, is complete."""
+        remaining = self.busy_time()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def sweep(self, number:int):
+        """Measures every trace of a channel using the device model.
+
+        Args:
+            number (int): The channel number.
+        """
+        channel = self.channel(number)
+        frequency = channel.stimulus()
+        channel.frequency = frequency
+        sparameters = self.dut.sparameters(frequency)
+        for trace_number in range(1, channel.trace_count + 1):
+            trace = channel.trace(trace_number)
+            data = np.array(sparameters.get(trace.sparam, sparameters["S11"]), dtype=np.complex128)
+            if self.noise > 0:
+                data = data + self.noise * (self.__rng.standard_normal(data.shape) + 1j * self.__rng.standard_normal(data.shape))
+            if trace.edelay_time or trace.phase_offset:
+                data = data * np.exp(1j * (2 * np.pi * frequency * trace.edelay_time + np.radians(trace.phase_offset)))
+            trace.data = data
+            trace.formatted = None
+        channel.dirty = False
+        duration = frequency.size * (self.point_duration + channel.point_time)
+        self.__busy_until = max(self.__busy_until, time.monotonic()) + duration
+
+    def measured(self, number:int, trace_number:int) -> _Trace:
+        """Returns a trace of a channel, sweeping first if its settings changed since the last sweep.
+
+        Args:
+            number (int): The channel number.
+            trace_number (int): The trace number.
+
+        Returns:
+            _Trace: The trace state with measured data.
+        """
+        channel = self.channel(number)
+        trace = channel.trace(trace_number)
+        if channel.dirty or trace.data is None or trace.data.size != channel.stimulus().size:
+            self.sweep(number)
+        self.wait_for_sweep()
+        return trace
+
+    def formatted(self, number:int, trace_number:int) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the formatted primary and secondary values of a trace.
+
+        Args:
+            number (int): The channel number.
+            trace_number (int): The trace number.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The primary and secondary values.
+        """
+        trace = self.measured(number, trace_number)
+        if trace.formatted is None:
+            trace.formatted = _format_trace(trace.data, self.channel(number).frequency, trace.format, self.channel(number).impedance)
+        return trace.formatted
+
+    def files(self) -> dict:
+        """Returns the simulated mass memory.
+
+        Returns:
+            dict: Saved states and segment tables keyed by file name.
+        """
+        return self.__files
+
+    def save_state(self, filename:str):
+        self.__files[filename] = copy.deepcopy((self.channels, self.trigger_source, self.trigger_scope))
+
+    def load_state(self, filename:str):
+        self.channels, self.trigger_source, self.trigger_scope = copy.deepcopy(self.__files[filename])
+        for channel in self.channels.values():
+            channel.dirty = True
+
+    def preset(self):
+        """Returns the simulated instrument to its preset state."""
+        self.__preset()
+
+
+class _Address():
+    """
+    The channel, trace and marker a command refers to, resolved from the numeric
+    suffixes of its header and the active trace of the channel.
+    """
+    def __init__(self, nodes:list, suffixes:dict, instrument:SimulatedInstrument):
+        self.nodes = nodes
+        self.channel_number = suffixes.get("CALC", suffixes.get("SENS", suffixes.get("WIND", suffixes.get("INIT", 1))))
+        self.channel = instrument.channel(self.channel_number)
+        self.trace_number = suffixes.get("TRAC", self.channel.active_trace)
+        if nodes and nodes[0] == "CALC" and "PAR" in suffixes:
+            self.trace_number = suffixes["PAR"]
+        self.trace = self.channel.trace(self.trace_number)
+        self.marker_number = suffixes.get("MARK", 1)
+        self.suffixes = suffixes
+
+    @property
+    def marker(self) -> _Marker:
+        return self.trace.marker(self.marker_number)
+
+
+def _split_program_message(message:bytes) -> list:
+    """Splits a program message into (header, parameters) units. Parameters are strings,
+    with quotes removed, or bytes for definite-length blocks.
+    """
+    units = []
+    position = 0
+    length = len(message)
+    while position < length:
+        while position < length and message[position] in b" \t\r\n;":
+            position += 1
+        if position >= length:
+            break
+        start = position
+        while position < length and message[position] not in b" \t\r\n;":
+            position += 1
+        header = message[start:position].decode("latin-1")
+        params = []
+        while position < length and message[position] in b" \t":
+            position += 1
+        while position < length and message[position] not in b";\r\n":
+            if message[position:position + 1] == b"#":
+                digits = int(message[position + 1:position + 2])
+                size = int(message[position + 2:position + 2 + digits])
+                offset = position + 2 + digits
+                params.append(bytes(message[offset:offset + size]))
+                position = offset + size
+            else:
+                start = position
+                quote = None
+                while position < length:
+                    char = message[position:position + 1]
+                    if quote is not None:
+                        if char == quote:
+                            quote = None
+                    elif char in (b'"', b"'"):
+                        quote = char
+                    elif char in (b",", b";", b"\r", b"\n"):
+                        break
+                    position += 1
+                text = message[start:position].decode("latin-1").strip()
+                if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+                    params.extend(item.strip() for item in text[1:-1].split(",") if item.strip())
+                else:
+                    params.append(text)
+            while position < length and message[position] in b" \t":
+                position += 1
+            if position < length and message[position:position + 1] == b",":
+                position += 1
+                while position < length and message[position] in b" \t":
+                    position += 1
+        units.append((header, params))
+    return units
+
+
+def _number(value:float) -> str:
+    return "%.12E" % float(value)
+
+
+def _boolean(param:str) -> int:
+    value = param.strip().upper()
+    if value in ("ON", "1"):
+        return 1
+    if value in ("OFF", "0"):
+        return 0
+    raise ValueError(param)
+
+
+def _interpolate(frequency:np.ndarray, values:np.ndarray, x:float) -> float:
+    return float(np.interp(x, frequency, values))
+
+
+def _crossings(frequency:np.ndarray, values:np.ndarray, level:float) -> np.ndarray:
+    """Returns the interpolated stimulus values where a trace crosses a level."""
+    above = values >= level
+    index = np.flatnonzero(above[1:] != above[:-1])
+    fraction = (level - values[index]) / (values[index + 1] - values[index])
+    return frequency[index] + fraction * (frequency[index + 1] - frequency[index])
+
+
+_HANDLERS = {}
+
+
+def _handler(key:str, query=None):
+    def register(function):
+        _HANDLERS[(key, query)] = function
+        return function
+    return register
+
+
+def _setting(key:str, getter, setter):
+    """Registers the set and query forms of a simple setting."""
+    _HANDLERS[(key, True)] = lambda inst, addr, params, q: getter(inst, addr)
+    _HANDLERS[(key, False)] = lambda inst, addr, params, q: setter(inst, addr, params[0])
+
+
+def _channel_setting(key:str, attribute:str, convert=float, dirty:bool=False, text=None):
+    def setter(inst, addr, value):
+        setattr(addr.channel, attribute, convert(value))
+        if dirty:
+            addr.channel.dirty = True
+    if text is None:
+        text = lambda value: _number(value) if convert is float else str(value)
+    _setting(key, lambda inst, addr: text(getattr(addr.channel, attribute)), setter)
+
+
+def _trace_setting(key:str, attribute:str, convert=float, text=None):
+    def setter(inst, addr, value):
+        setattr(addr.trace, attribute, convert(value))
+        addr.trace.formatted = None
+    if text is None:
+        text = lambda value: _number(value) if convert is float else str(value)
+    _setting(key, lambda inst, addr: text(getattr(addr.trace, attribute)), setter)
+
+
+def _upper(value:str) -> str:
+    return value.strip().upper()
+
+
+# Common commands ------------------------------------------------------------
+_handler("*IDN", True)(lambda inst, addr, params, q: "Bird,BNA1000,SIM00001,1.0")
+_handler("*OPC", True)(lambda inst, addr, params, q: (inst.wait_for_sweep(), "1")[1])
+_handler("*OPC", False)(lambda inst, addr, params, q: None)
+_handler("*CLS", False)(lambda inst, addr, params, q: inst.errors.clear())
+_handler("*WAI", False)(lambda inst, addr, params, q: inst.wait_for_sweep())
+_handler("*RST", False)(lambda inst, addr, params, q: inst.preset())
+_handler("SYST:PRES", False)(lambda inst, addr, params, q: inst.preset())
+_handler("SYST:ERR", True)(lambda inst, addr, params, q: inst.errors.pop(0) if inst.errors else '0,"No error"')
+_handler("ABOR", False)(lambda inst, addr, params, q: None)
+
+# Format ---------------------------------------------------------------------
+_setting("FORM:DATA", lambda inst, addr: inst.data_format,
+         lambda inst, addr, value: setattr(inst, "data_format", {"ASC": "ASC", "ASCII": "ASC", "REAL": "REAL", "REAL64": "REAL", "REAL32": "REAL32"}[_upper(value)]))
+_setting("FORM:BORD", lambda inst, addr: inst.byte_order,
+         lambda inst, addr, value: setattr(inst, "byte_order", {"NORM": "NORM", "NORMAL": "NORM", "SWAP": "SWAP", "SWAPPED": "SWAP"}[_upper(value)]))
+
+# Trigger and initiate -----------------------------------------------------------
+def _trigger(inst, addr, params, q):
+    channels = sorted(inst.channels) if inst.trigger_scope == "ALL" else [inst.active_channel]
+    for number in channels:
+        inst.sweep(number)
+
+
+_handler("TRIG", False)(_trigger)
+_handler("TRIG:IMM", False)(_trigger)
+_handler("TRIG:SING", False)(_trigger)
+_handler("INIT", False)(lambda inst, addr, params, q: inst.sweep(addr.channel_number))
+_handler("INIT:IMM", False)(lambda inst, addr, params, q: inst.sweep(addr.channel_number))
+_setting("TRIG:SOUR", lambda inst, addr: inst.trigger_source,
+         lambda inst, addr, value: setattr(inst, "trigger_source", _short_form(_upper(value))))
+_setting("TRIG:SCOP", lambda inst, addr: inst.trigger_scope,
+         lambda inst, addr, value: setattr(inst, "trigger_scope", _short_form(_upper(value))))
+_channel_setting("INIT:CONT", "continuous", _boolean)
+
+# Sense ------------------------------------------------------------------------------
+def _set_frequency(attribute:str):
+    def setter(inst, addr, value):
+        channel = addr.channel
+        value = float(value)
+        center, span = (channel.start + channel.stop) / 2, channel.stop - channel.start
+        if attribute == "start":
+            channel.start, channel.stop = value, max(value, channel.stop)
+        elif attribute == "stop":
+            channel.start, channel.stop = min(value, channel.start), value
+        elif attribute == "center":
+            channel.start, channel.stop = value - span / 2, value + span / 2
+        else:
+            channel.start, channel.stop = center - value / 2, center + value / 2
+        channel.dirty = True
+    return setter
+
+
+_setting("SENS:FREQ:STAR", lambda inst, addr: _number(addr.channel.start), _set_frequency("start"))
+_setting("SENS:FREQ:STOP", lambda inst, addr: _number(addr.channel.stop), _set_frequency("stop"))
+_setting("SENS:FREQ:CENT", lambda inst, addr: _number((addr.channel.start + addr.channel.stop) / 2), _set_frequency("center"))
+_setting("SENS:FREQ:SPAN", lambda inst, addr: _number(addr.channel.stop - addr.channel.start), _set_frequency("span"))
+_channel_setting("SENS:FREQ", "cw", float, dirty=True)
+_handler("SENS:FREQ:DATA", True)(lambda inst, addr, params, q: inst.encode_array(addr.channel.stimulus()))
+_channel_setting("SENS:SWE:POIN", "points", lambda value: max(2, min(16001, int(float(value)))), dirty=True)
+_channel_setting("SENS:SWE:POIN:TIME", "point_time", float)
+_channel_setting("SENS:SWE:TYPE", "sweep_type", lambda value: _short_form(_upper(value)), dirty=True)
+
+
+@_handler("SENS:SEGM:DATA", False)
+def _segment_data(inst, addr, params, q):
+    _, mode, ifbw_en, pwr_en, del_en, swp_en, time_en, count = (int(float(param)) for param in params[:8])
+    width = 3 + ifbw_en + pwr_en + del_en + swp_en + time_en
+    if len(params) != 8 + count * width:
+        raise ValueError("segment table")
+    segments = []
+    for index in range(count):
+        fields = params[8 + index * width:8 + (index + 1) * width]
+        segments.append((float(fields[0]), float(fields[1]), int(float(fields[2]))))
+    addr.channel.segments = segments
+    addr.channel.segment_enabled = [1] * count
+    addr.channel.dirty = True
+
+
+@_handler("SENS:SEGM:DATA", True)
+def _segment_data_query(inst, addr, params, q):
+    values = [5, 0, 0, 0, 0, 0, 0, len(addr.channel.segments)]
+    for segment in addr.channel.segments:
+        values.extend(segment)
+    return ",".join(str(value) for value in values)
+
+
+def _set_segment_enabled(inst, addr, params, q):
+    addr.channel.segment_enabled = [_boolean(param) for param in params]
+    addr.channel.dirty = True
+
+
+_handler("SENS:SEGM:LIST:CONT:DATA", False)(_set_segment_enabled)
+_handler("SENS:SEGM:LIST:CONT:DATA", True)(lambda inst, addr, params, q: ",".join(str(value) for value in addr.channel.segment_enabled))
+_handler("SENS:SEGM:SWE:POIN", True)(lambda inst, addr, params, q: str(sum(int(points) for (_, _, points), enabled in zip(addr.channel.segments, addr.channel.segment_enabled) if enabled)))
+_handler("SENS:SEGM:SWE:TIME", True)(lambda inst, addr, params, q: _number(
+    sum(int(points) for (_, _, points), enabled in zip(addr.channel.segments, addr.channel.segment_enabled) if enabled)
+    * (1.0 / addr.channel.segment_ifbw + addr.channel.point_time)))
+
+_channel_setting("SENS:CORR:IMP", "impedance", float)
+_channel_setting("SENS:CORR:STAT", "correction_state", _boolean)
+_channel_setting("SENS:CORR:COLL:CKIT", "calkit", lambda value: int(float(value)))
+for _collection in ("OPEN", "SHOR", "LOAD", "THRU", "METH:ERES", "METH:OPEN", "METH:SHOR", "METH:THRU", "METH:SOLT"):
+    _handler(f"SENS:CORR:COLL:{_collection}", False)(lambda inst, addr, params, q: None)
+_handler("SENS:CORR:COLL:SAVE", False)(lambda inst, addr, params, q: setattr(addr.channel, "correction_state", 1))
+_handler("SENS:CORR:COLL:ECAL:SOLT", False)(lambda inst, addr, params, q: setattr(addr.channel, "correction_state", 1))
+_handler("SENS:CORR:EXT:AUTO:MEAS", False)(lambda inst, addr, params, q: None)
+_setting("SENS:CORR:EXT:AUTO:PORT", lambda inst, addr: str(addr.channel.extension_ports.get(addr.suffixes.get("PORT", 1), 0)),
+         lambda inst, addr, value: addr.channel.extension_ports.__setitem__(addr.suffixes.get("PORT", 1), _boolean(value)))
+
+# Calculate ------------------------------------------------------------------------------------
+def _set_trace_count(inst, addr, value):
+    addr.channel.trace_count = max(1, min(16, int(float(value))))
+    addr.channel.active_trace = min(addr.channel.active_trace, addr.channel.trace_count)
+    addr.channel.dirty = True
+
+
+_setting("CALC:PAR:COUN", lambda inst, addr: str(addr.channel.trace_count), _set_trace_count)
+_handler("CALC:PAR:SEL", False)(lambda inst, addr, params, q: setattr(addr.channel, "active_trace", addr.trace_number))
+_handler("CALC:PAR:SEL", True)(lambda inst, addr, params, q: str(addr.channel.active_trace))
+
+
+def _set_sparam(inst, addr, value):
+    addr.trace.sparam = _upper(value)
+    addr.channel.dirty = True
+
+
+_setting("CALC:PAR:DEF", lambda inst, addr: addr.trace.sparam, _set_sparam)
+_trace_setting("CALC:FORM", "format", lambda value: _short_form(_upper(value)))
+_trace_setting("CALC:CORR:EDEL:TIME", "edelay_time", float)
+_trace_setting("CALC:CORR:EDEL:MED", "edelay_media", lambda value: _short_form(_upper(value)))
+_trace_setting("CALC:CORR:EDEL:DIST", "edelay_distance", float)
+_trace_setting("CALC:CORR:OFFS:PHAS", "phase_offset", float)
+_trace_setting("CALC:FILT:TIME:TYPE", "gate_type", lambda value: _short_form(_upper(value)))
+_trace_setting("CALC:FILT:TIME:CENT", "gate_center", float)
+_trace_setting("CALC:FILT:TIME:STAR", "gate_start", float)
+_trace_setting("CALC:FILT:TIME:SHAP", "gate_shape", lambda value: _short_form(_upper(value)))
+_trace_setting("CALC:FILT:TIME:STAT", "gate_state", _boolean)
+
+
+def _formatted_array(inst, addr):
+    primary, secondary = inst.formatted(addr.channel_number, addr.trace_number)
+    if addr.trace.data is not None and primary.size != addr.trace.data.size:
+        addr.trace.formatted = None
+        primary, secondary = inst.formatted(addr.channel_number, addr.trace_number)
+    return np.column_stack((primary, secondary))
+
+
+def _set_formatted(inst, addr, params, q):
+    values = inst.decode_array(params)
+    addr.trace.formatted = (values[0::2].copy(), values[1::2].copy())
+
+
+def _set_corrected(inst, addr, params, q):
+    values = inst.decode_array(params)
+    addr.trace.data = values[0::2] + 1j * values[1::2]
+    addr.trace.formatted = None
+
+
+def _complex_array(data:np.ndarray) -> np.ndarray:
+    return np.column_stack((data.real, data.imag))
+
+
+_handler("CALC:DATA:FDAT", True)(lambda inst, addr, params, q: inst.encode_array(_formatted_array(inst, addr)))
+_handler("CALC:DATA:FDAT", False)(_set_formatted)
+_handler("CALC:DATA:SDAT", False)(_set_corrected)
+_handler("CALC:DATA:FMEM", True)(lambda inst, addr, params, q: inst.encode_array(
+    addr.trace.formatted_memory if addr.trace.formatted_memory is not None else _formatted_array(inst, addr)))
+_handler("CALC:DATA:FMEM", False)(lambda inst, addr, params, q: setattr(addr.trace, "formatted_memory", inst.decode_array(params)))
+_handler("CALC:DATA:SMEM", True)(lambda inst, addr, params, q: inst.encode_array(_complex_array(
+    addr.trace.memory if addr.trace.memory is not None else inst.measured(addr.channel_number, addr.trace_number).data)))
+
+
+def _set_memory(inst, addr, params, q):
+    values = inst.decode_array(params)
+    addr.trace.memory = values[0::2] + 1j * values[1::2]
+
+
+_handler("CALC:DATA:SMEM", False)(_set_memory)
+_handler("CALC:DATA:XAX", True)(lambda inst, addr, params, q: inst.encode_array(
+    (inst.measured(addr.channel_number, addr.trace_number), inst.channel(addr.channel_number).frequency)[1]))
+
+
+def _trace_numbers(addr, params) -> list:
+    if params:
+        return [int(float(param)) for param in params]
+    return list(range(1, addr.channel.trace_count + 1))
+
+
+@_handler("CALC:DATA:MDAT", True)
+def _multiple_formatted(inst, addr, params, q):
+    arrays = []
+    for number in _trace_numbers(addr, params):
+        primary, secondary = inst.formatted(addr.channel_number, number)
+        arrays.append(np.column_stack((primary, secondary)))
+    return inst.encode_array(np.concatenate(arrays))
+
+
+@_handler("CALC:DATA:SDAT", True)
+def _multiple_corrected(inst, addr, params, q):
+    if "TRAC" in addr.suffixes:
+        return inst.encode_array(_complex_array(inst.measured(addr.channel_number, addr.trace_number).data))
+    arrays = [_complex_array(inst.measured(addr.channel_number, number).data) for number in _trace_numbers(addr, params)]
+    return inst.encode_array(np.concatenate(arrays))
+
+
+# Markers --------------------------------------------------------------------------------------------
+def _marker_x(inst, addr) -> float:
+    marker = addr.marker
+    inst.measured(addr.channel_number, addr.trace_number)
+    frequency = addr.channel.frequency
+    if marker.x is None:
+        marker.x = float(frequency[frequency.size // 2])
+    return marker.x
+
+
+def _set_marker_x(inst, addr, value):
+    addr.marker.state = 1
+    inst.measured(addr.channel_number, addr.trace_number)
+    frequency = addr.channel.frequency
+    addr.marker.x = float(np.clip(float(value), frequency.min(), frequency.max()))
+
+
+_setting("CALC:MARK", lambda inst, addr: str(addr.marker.state), lambda inst, addr, value: setattr(addr.marker, "state", _boolean(value)))
+_setting("CALC:MARK:X", lambda inst, addr: _number(_marker_x(inst, addr)), _set_marker_x)
+
+
+@_handler("CALC:MARK:Y", True)
+def _marker_y(inst, addr, params, q):
+    x = _marker_x(inst, addr)
+    primary, secondary = inst.formatted(addr.channel_number, addr.trace_number)
+    frequency = addr.channel.frequency
+    return f"{_number(_interpolate(frequency, primary, x))},{_number(_interpolate(frequency, secondary, x))}"
+
+
+@_handler("CALC:MARK:SET", False)
+def _marker_set(inst, addr, params, q):
+    inst.measured(addr.channel_number, addr.trace_number)
+    frequency = addr.channel.frequency
+    location = _short_form(_upper(params[0]))
+    if location == "STAR":
+        addr.marker.x = float(frequency[0])
+    elif location == "STOP":
+        addr.marker.x = float(frequency[-1])
+    elif location == "CENT":
+        addr.marker.x = float((frequency[0] + frequency[-1]) / 2)
+    elif location == "RMAR":
+        addr.marker.x = _marker_x(inst, _Address(["CALC", "MARK"], {"CALC": addr.channel_number, "TRAC": addr.trace_number, "MARK": 16}, inst))
+    addr.marker.state = 1
+
+
+_setting("CALC:MARK:FUNC:TYPE", lambda inst, addr: addr.marker.search_type,
+         lambda inst, addr, value: setattr(addr.marker, "search_type", _upper(value)))
+_setting("CALC:MARK:FUNC:TARG", lambda inst, addr: _number(addr.marker.target),
+         lambda inst, addr, value: setattr(addr.marker, "target", float(value)))
+
+
+def _search(frequency:np.ndarray, values:np.ndarray, search_type:str, x:float, target:float) -> float:
+    """Finds the new marker position for a marker search."""
+    if search_type == "MAX":
+        return float(frequency[np.argmax(values)])
+    if search_type == "MIN":
+        return float(frequency[np.argmin(values)])
+    if search_type in ("PEAK", "LPE", "RPE"):
+        peaks = np.flatnonzero((values[1:-1] > values[:-2]) & (values[1:-1] >= values[2:])) + 1
+        if search_type == "LPE":
+            peaks = peaks[frequency[peaks] < x]
+        elif search_type == "RPE":
+            peaks = peaks[frequency[peaks] > x]
+        if peaks.size == 0:
+            return x
+        if search_type == "PEAK":
+            return float(frequency[peaks[np.argmax(values[peaks])]])
+        return float(frequency[peaks[-1] if search_type == "LPE" else peaks[0]])
+    crossings = _crossings(frequency, values, target)
+    if search_type == "LTAR":
+        crossings = crossings[crossings < x]
+    elif search_type == "RTAR":
+        crossings = crossings[crossings > x]
+    if crossings.size == 0:
+        return x
+    return float(crossings[np.argmin(np.abs(crossings - x))])
+
+
+@_handler("CALC:MARK:FUNC:EXEC", False)
+def _marker_search(inst, addr, params, q):
+    x = _marker_x(inst, addr)
+    primary, _ = inst.formatted(addr.channel_number, addr.trace_number)
+    addr.marker.x = _search(addr.channel.frequency, primary, addr.marker.search_type, x, addr.marker.target)
+    addr.marker.state = 1
+
+
+_setting("CALC:MARK:BWID", lambda inst, addr: str(addr.trace.bw_state), lambda inst, addr, value: setattr(addr.trace, "bw_state", _boolean(value)))
+_setting("CALC:MARK:BWID:REF", lambda inst, addr: addr.trace.bw_reference,
+         lambda inst, addr, value: setattr(addr.trace, "bw_reference", _short_form(_upper(value))))
+_setting("CALC:MARK:BWID:TYPE", lambda inst, addr: addr.marker.bw_type,
+         lambda inst, addr, value: setattr(addr.marker, "bw_type", _short_form(_upper(value))))
+_setting("CALC:MARK:BWID:THR", lambda inst, addr: _number(addr.marker.bw_threshold),
+         lambda inst, addr, value: setattr(addr.marker, "bw_threshold", float(value)))
+
+
+@_handler("CALC:MARK:BWID:DATA", True)
+def _bandwidth_data(inst, addr, params, q):
+    primary, _ = inst.formatted(addr.channel_number, addr.trace_number)
+    frequency = addr.channel.frequency
+    if addr.trace.bw_reference == "MAX":
+        index = int(np.argmax(primary))
+    elif addr.trace.bw_reference == "MIN":
+        index = int(np.argmin(primary))
+    else:
+        index = int(np.argmin(np.abs(frequency - _marker_x(inst, addr))))
+    if addr.marker.bw_type == "NOTC":
+        reference = primary[index]
+        index = int(np.argmin(primary))
+        loss = primary[index]
+    else:
+        reference = loss = primary[index]
+    level = reference + addr.marker.bw_threshold
+    crossings = _crossings(frequency, primary, level)
+    lower, upper = crossings[crossings <= frequency[index]], crossings[crossings >= frequency[index]]
+    if lower.size == 0 or upper.size == 0:
+        return ",".join(_number(0.0) for _ in range(6))
+    low, high = float(lower[-1]), float(upper[0])
+    bandwidth, center = high - low, (high + low) / 2
+    return ",".join(_number(value) for value in (bandwidth, center, low, high, center / bandwidth if bandwidth else 0.0, loss))
+
+
+# Limit test -------------------------------------------------------------------------------
+@_handler("CALC:LIM:DATA", False)
+def _limit_data(inst, addr, params, q):
+    values = [float(param) for param in params]
+    count = int(values[0])
+    if len(values) != 1 + 5 * count:
+        raise ValueError("limit table")
+    lines = [values[1 + index * 5:6 + index * 5] for index in range(count)]
+    addr.channel.limit_lines = [(int(line[0]),) + tuple(line[1:]) for line in lines]
+
+
+@_handler("CALC:LIM:DATA", True)
+def _limit_data_query(inst, addr, params, q):
+    values = [len(addr.channel.limit_lines)]
+    for line in addr.channel.limit_lines:
+        values.extend(line)
+    return ",".join(str(value) for value in values)
+
+
+_channel_setting("CALC:LIM", "limit_state", _boolean)
+_channel_setting("CALC:LIM:DISP", "limit_display", _boolean)
+
+
+@_handler("CALC:LIM:FAIL", True)
+def _limit_fail(inst, addr, params, q):
+    primary, _ = inst.formatted(addr.channel_number, addr.channel.active_trace)
+    frequency = addr.channel.frequency
+    failed = False
+    for kind, start, stop, start_level, stop_level in addr.channel.limit_lines:
+        if kind == 3:
+            value = _interpolate(frequency, primary, start)
+            failed |= value > start_level or value < stop_level
+            continue
+        inside = (frequency >= min(start, stop)) & (frequency <= max(start, stop))
+        if kind == 0 or not inside.any():
+            continue
+        limit = start_level + (frequency[inside] - start) * ((stop_level - start_level) / (stop - start) if stop != start else 0.0)
+        if kind == 1:
+            failed |= bool(np.any(primary[inside] > limit))
+        elif kind == 2:
+            failed |= bool(np.any(primary[inside] < limit))
+    return "1" if failed else "0"
+
+
+# Display ----------------------------------------------------------------------------------------
+_setting("DISP:ENAB", lambda inst, addr: str(inst.display_enable), lambda inst, addr, value: setattr(inst, "display_enable", _boolean(value)))
+_handler("DISP:FSIG", False)(lambda inst, addr, params, q: setattr(inst, "fail_sign", _boolean(params[0])))
+_handler("DISP:FSIG", True)(lambda inst, addr, params, q: str(inst.fail_sign))
+_handler("DISP:COL:RES", False)(lambda inst, addr, params, q: None)
+_handler("DISP:COL:TRAC:DATA", False)(lambda inst, addr, params, q: None)
+_handler("DISP:COL:TRAC:MEM", False)(lambda inst, addr, params, q: None)
+_channel_setting("DISP:WIND:SPL", "layout", _upper)
+_channel_setting("DISP:WIND:MAX", "maximize", _boolean)
+
+
+def _window_trace(inst, addr) -> _Trace:
+    return addr.channel.trace(addr.suffixes.get("TRAC", addr.channel.active_trace))
+
+
+_setting("DISP:WIND:TRAC:Y:PDIV", lambda inst, addr: _number(_window_trace(inst, addr).scale),
+         lambda inst, addr, value: setattr(_window_trace(inst, addr), "scale", float(value)))
+
+
+@_handler("DISP:WIND:TRAC:Y:AUTO", False)
+def _autoscale(inst, addr, params, q):
+    number = addr.suffixes.get("TRAC", addr.channel.active_trace)
+    primary, _ = inst.formatted(addr.channel_number, number)
+    span = float(np.ptp(primary)) if primary.size else 0.0
+    addr.channel.trace(number).scale = max(span / 8.0, 1e-3)
+
+
+# Mass memory ----------------------------------------------------------------------------------------------
+def _filename(params:list) -> str:
+    return params[0].strip().strip("\"'")
+
+
+_setting("MMEM:STOR:STYP", lambda inst, addr: inst.state_type, lambda inst, addr, value: setattr(inst, "state_type", _upper(value)))
+_handler("MMEM:STOR", False)(lambda inst, addr, params, q: inst.save_state(_filename(params)))
+_handler("MMEM:LOAD", False)(lambda inst, addr, params, q: inst.load_state(_filename(params)))
+_handler("MMEM:STOR:SEGM", False)(lambda inst, addr, params, q: inst.files().__setitem__(
+    _filename(params), (list(inst.channel(inst.active_channel).segments), list(inst.channel(inst.active_channel).segment_enabled))))
+
+
+@_handler("MMEM:LOAD:SEGM", False)
+def _load_segments(inst, addr, params, q):
+    channel = inst.channel(inst.active_channel)
+    segments, enabled = inst.files()[_filename(params)]
+    channel.segments, channel.segment_enabled = list(segments), list(enabled)
+    channel.dirty = True
@@ -0,0 +1,208 @@
+"""
+Example Description:
+        This module provides the streaming acquisition loop behind
+        BirdVectorNetworkAnalyzer.stream(). Each iteration triggers one sweep
+        on the bus, waits for it to complete and reads the selected traces in
+        a single binary transfer, yielding a timestamped SweepRecord:
+
+            for sweep in bna1k.stream(channel=1, traces=(1, 2), count=100):
+                print(sweep.sweep, sweep.timestamp, sweep[1].min())
+
+        Every sweep costs two round trips: one compound message that triggers
+        the sweep and waits for *OPC?, and one that reads the trace data. The
+        frequency axis is read once when the stream starts. The trigger source,
+        continuous initiation, data format and byte order in effect before the
+        stream are restored when it ends.
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_stream.py
+
+"""
+import time
+
+import numpy as np
+
+
+class SweepRecord():
+    """
+    One sweep delivered by a SweepStream.
+
+    Attributes:
+        sweep (int): Sweep number within the stream, starting at 0.
+        timestamp (float): Wall-clock time (time.time()) at which the sweep completed.
+        elapsed (float): Seconds from the start of the stream to the completion of the sweep.
+        traces (tuple): The trace numbers, in the order of the rows of data.
+        frequency (numpy.ndarray): Stimulus frequency of each point, shared by all records of a stream.
+        data (numpy.ndarray): (traces, points) array of formatted primary values, or of complex
+            corrected values when the stream reads corrected data.
+        secondary (numpy.ndarray): (traces, points) array of formatted secondary values, or None
+            when the stream reads corrected data.
+    """
+    def __init__(self, sweep:int, timestamp:float, elapsed:float, traces:tuple, frequency:np.ndarray, data:np.ndarray,
+                 secondary:np.ndarray=None):
+        self.sweep = sweep
+        self.timestamp = timestamp
+        self.elapsed = elapsed
+        self.traces = traces
+        self.frequency = frequency
+        self.data = data
+        self.secondary = secondary
+
+    def __getitem__(self, trace:int) -> np.ndarray:
+        """Returns the data of one trace by its trace number."""
+        return self.data[self.traces.index(trace)]
+
+
+class SweepStream():
+    """
+    Iterator of SweepRecords returned by BirdVectorNetworkAnalyzer.stream().
+    Use it in a for loop or a with block; the instrument settings changed for
+    the stream are restored when it is exhausted or closed, so a loop that
+    breaks out early should run inside a with block.
+    """
+    def __init__(self, driver, channel:int=1, traces:tuple=(1,), data:str="formatted", count:int=None,
+                 data_format:str="real64"):
+        """
+        Args:
+            driver (BirdVectorNetworkAnalyzer): The connected driver.
+            channel (int, optional): The channel to sweep. Defaults to 1.
+            traces (tuple, optional): The trace numbers to read after each sweep. Defaults to (1,).
+            data (str, optional): "formatted" for the formatted primary values or "corrected" for
+                complex corrected data. Defaults to "formatted".
+            count (int, optional): Number of sweeps to deliver. Defaults to None, streaming until closed.
+            data_format (str, optional): Transfer format, "real64", "real32" or "ascii". Defaults to "real64".
+        """
+        data_dict = {'formatted': "format_data_traces",
+                     'corrected': "corrected_data_traces",
+                     }
+        self.__reader = data_dict[data]
+        self.driver = driver
+        self.channel = channel
+        self.traces = tuple(traces)
+        self.count = count
+        self.data_format = data_format
+        self.sweeps = 0
+        self.frequency = None
+        self.__restore = None
+        self.__started = None
+        self.__closed = False
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    @property
+    def rate(self) -> float:
+        """Sweeps delivered per second since the stream started."""
+        if not self.sweeps:
+            return 0.0
+        return self.sweeps / (time.monotonic() - self.__started)
+
+    def statistics(self) -> dict:
+        """Reports the progress of the stream.
+
+        Returns:
+            dict: Sweeps delivered, seconds elapsed and the achieved sweep rate in sweeps per second.
+        """
+        elapsed = time.monotonic() - self.__started if self.__started is not None else 0.0
+        return {"sweeps": self.sweeps, "elapsed": elapsed, "sweep_rate": self.sweeps / elapsed if elapsed > 0 else 0.0}
+
+    def __addressed(self):
+        """Points the driver at the streamed channel, returning the addressing to put back."""
+        previous = self.driver.channel
+        self.driver.channel = self.channel
+        return previous
+
+    def __start(self):
+        vna = self.driver
+        previous = self.__addressed()
+        try:
+            self.__restore = (vna.format.data, vna.format.border, vna.initiate.continuous, vna.trigger.source)
+            vna.format.data = self.data_format
+            vna.initiate.continuous = 0
+            vna.trigger.source = "bus"
+            self.frequency = vna.sense.frequency.data
+        finally:
+            vna.channel = previous
+        self.__started = time.monotonic()
+
+    def __next__(self) -> SweepRecord:
+        if self.__closed or (self.count is not None and self.sweeps >= self.count):
+            self.close()
+            raise StopIteration
+        if self.__started is None:
+            self.__start()
+        vna = self.driver
+        previous = self.__addressed()
+        try:
+            with vna.transaction() as txn:
+                vna.trigger.single()
+                done = txn.query(vna.opc_query)
+            done.result()
+            completed = time.monotonic()
+            timestamp = time.time()
+            data = getattr(vna.calculate.data, self.__reader)(self.traces)
+        finally:
+            vna.channel = previous
+        secondary = None
+        if isinstance(data, tuple):
+            data, secondary = data
+        record = SweepRecord(self.sweeps, timestamp, completed - self.__started, self.traces, self.frequency, data, secondary)
+        self.sweeps += 1
+        return record
+
+    def close(self):
+        """Stops the stream and restores the data format, byte order, continuous initiation and trigger source."""
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__restore is None:
+            return
+        vna = self.driver
+        data_format, border, continuous, source = self.__restore
+        source_dict = {'int': "internal",
+                       'ext': "external",
+                       'man': "manual",
+                       'bus': "bus",
+                       }
+        previous = self.__addressed()
+        try:
+            vna.format.data = data_format
+            # After the data format, whose setter picks the byte order of this computer.
+            vna.format.border = border
+            vna.initiate.continuous = continuous
+            vna.trigger.source = source_dict.get(source[:3], "internal")
+        finally:
+            vna.channel = previous
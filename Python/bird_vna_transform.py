@@ -0,0 +1,245 @@
+"""
+Example Description:
+        This module provides a host-side time-domain transform and gate that
+        mirror calculate.transform and calculate.filter.time. The analyzer
+        applies a transform or gate only to the sweep it is measuring, so
+        every change of gate means another sweep and another read; here the
+        corrected data already read (or archived with bird_vna_archive.py)
+        is transformed and gated as often as needed:
+
+            frequency = bna1k.sense.frequency.data
+            data = bna1k.calculate.data.corrected_data_traces((1,))[0]
+            transform = TimeDomainTransform(frequency, mode="bandpass", window="norm")
+            response = transform.transform(data)
+            gated = transform.gate(data, start=1.0e-9, stop=3.5e-9, shape="norm")
+
+        The window vectors, normalization and time axis of a transform are
+        computed once per point count and reused by every transform of that
+        size, so thousands of sweeps can be post-processed with little more
+        than the cost of their FFTs.
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_transform.py
+
+"""
+import functools
+
+import numpy as np
+
+# Kaiser window beta of the transform window shapes. A larger beta lowers the sidelobes of the
+# time-domain response at the cost of a wider main lobe.
+_WINDOWS = {'MIN': 0.0,
+            'NORM': 6.0,
+            'MAX': 13.0,
+            }
+
+# Fraction of the gate span taken up by its cosine-tapered edges, by gate shape.
+_GATE_SHAPES = {'MIN': 0.1,
+                'NORM': 0.25,
+                'WIDE': 0.5,
+                'MAX': 1.0,
+                }
+
+_MODES = ("BANDPASS", "LOWPASS_IMPULSE", "LOWPASS_STEP")
+
+
+def _shape_key(shape:str, shapes:dict) -> str:
+    """Reduces a shape name such as 'normal' or 'MAXimum' to its short form."""
+    name = shape.strip().upper()
+    for key in shapes:
+        if name.startswith(key):
+            return key
+    raise ValueError(f"{shape}: not one of the shapes {', '.join(shapes)}.")
+
+
+def _window_beta(window) -> float:
+    """Returns the Kaiser beta of a window given as 'min', 'norm', 'max' or a beta value."""
+    if isinstance(window, str):
+        return _WINDOWS[_shape_key(window, _WINDOWS)]
+    return float(window)
+
+
+@functools.lru_cache(maxsize=64)
+def _plan(points:int, length:int, mode:str, beta:float) -> tuple[np.ndarray, float]:
+    """Computes the window vector and impulse normalization of one transform size. Results are
+    cached, so every transform of the same size, mode and window shares them.
+
+    Returns:
+        tuple[np.ndarray, float]: The window applied to the points (including the DC point in the
+            lowpass modes) and the factor scaling a constant response to a unit impulse.
+    """
+    if mode == "BANDPASS":
+        window = np.kaiser(points, beta)
+        scale = length / window.sum()
+    else:
+        # The right half of a symmetric window centered on DC.
+        window = np.kaiser(2 * points + 1, beta)[points:]
+        scale = 1.0 / np.fft.irfft(window, length)[0]
+    window.setflags(write=False)
+    return window, scale
+
+
+@functools.lru_cache(maxsize=64)
+def _time_axis(length:int, step:float) -> np.ndarray:
+    """Returns the time of each sample of a transform of the given length, from -T/2 to T/2 where
+    T = 1/step is the alias-free time span of a sweep with the given frequency step."""
+    time = np.fft.fftshift(np.fft.fftfreq(length, step))
+    time.setflags(write=False)
+    return time
+
+
+def gate_window(time:np.ndarray, start:float, stop:float, shape:str="norm", type:str="bpas") -> np.ndarray:
+    """Computes a time gate: 1 between start and stop with cosine-tapered edges inside the gate,
+    and 0 outside it. A notch gate is the complement.
+
+    Args:
+        time (np.ndarray): Time of each sample in seconds.
+        start (float): Gate start time in seconds.
+        stop (float): Gate stop time in seconds.
+        shape (str, optional): MINimum, NORMal, WIDE or MAXimum; wider shapes taper more of the gate. Defaults to "norm".
+        type (str, optional): BPASs to keep the response within the gate, NOTCh to remove it. Defaults to "bpas".
+
+    Returns:
+        np.ndarray: The gate value at each time.
+    """
+    taper = _GATE_SHAPES[_shape_key(shape, _GATE_SHAPES)]
+    center = (start + stop) / 2
+    half_span = abs(stop - start) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = np.abs(time - center) / half_span
+        edge = 0.5 * (1 + np.cos(np.pi * (distance - (1 - taper)) / taper))
+    gate = np.where(distance <= 1 - taper, 1.0, np.where(distance <= 1, edge, 0.0))
+    if type.strip().upper().startswith("NOTC"):
+        return 1.0 - gate
+    if not type.strip().upper().startswith("BPAS"):
+        raise ValueError(f"{type}: a gate type is BPASs or NOTCh.")
+    return gate
+
+
+class TimeDomainTransform():
+    """
+    The time-domain transform of sweeps on one stimulus grid. The modes are
+    those of the analyzer:
+
+        bandpass         Complex impulse response of any sweep; the time
+                         resolution is 1 / span.
+        lowpass_impulse  Real impulse response. The sweep must be harmonic
+                         (start frequency = frequency step); the DC point is
+                         extrapolated in magnitude and phase from the
+                         first two points.
+        lowpass_step     Real step response of a harmonic sweep.
+
+    Impulse responses are normalized so a constant reflection coefficient
+    gives an impulse of the same height. All methods work along the last
+    axis, so one call transforms a whole (sweeps x points) batch.
+    """
+    def __init__(self, frequency:np.ndarray, mode:str="bandpass", window="norm", length:int=None):
+        """
+        Args:
+            frequency (np.ndarray): Stimulus frequency of each point in Hz, evenly spaced.
+            mode (str, optional): 'bandpass', 'lowpass_impulse' or 'lowpass_step'. Defaults to "bandpass".
+            window (optional): Transform window, 'min', 'norm' or 'max', or a Kaiser beta. Defaults to "norm".
+            length (int, optional): Transform length; the data is zero-padded to it to interpolate the
+                time response. Defaults to the next power of two of at least four times the points.
+        """
+        frequency = np.asarray(frequency, dtype=float)
+        points = len(frequency)
+        if points < 2:
+            raise ValueError("A time-domain transform needs at least two points.")
+        step = (frequency[-1] - frequency[0]) / (points - 1)
+        if not np.allclose(np.diff(frequency), step, rtol=1e-6, atol=0):
+            raise ValueError("A time-domain transform needs evenly spaced frequency points.")
+        self.mode = mode.strip().upper()
+        if self.mode not in _MODES:
+            raise ValueError(f"{mode}: the transform mode is bandpass, lowpass_impulse or lowpass_step.")
+        if self.mode != "BANDPASS" and not np.isclose(frequency[0], step, rtol=1e-6):
+            raise ValueError("The lowpass modes need a harmonic sweep whose start frequency equals its frequency step.")
+        self.frequency = frequency
+        self.step = step
+        self.beta = _window_beta(window)
+        minimum = 4 * (points if self.mode == "BANDPASS" else 2 * points)
+        self.length = int(length) if length is not None else 1 << (minimum - 1).bit_length()
+
+    @property
+    def window(self) -> np.ndarray:
+        """The transform window applied to the points."""
+        return _plan(len(self.frequency), self.length, self.mode, self.beta)[0]
+
+    @property
+    def time(self) -> np.ndarray:
+        """The time of each sample of the response in seconds, from -T/2 to T/2 where T = 1 / frequency step."""
+        return _time_axis(self.length, self.step)
+
+    def transform(self, data:np.ndarray) -> np.ndarray:
+        """Transforms complex frequency-domain data into its time-domain response.
+
+        Args:
+            data (np.ndarray): (..., points) complex corrected data.
+
+        Returns:
+            np.ndarray: (..., length) response at each time of the time property; complex in the
+                bandpass mode and real in the lowpass modes.
+        """
+        data = np.asarray(data)
+        window, scale = _plan(data.shape[-1], self.length, self.mode, self.beta)
+        if self.mode == "BANDPASS":
+            return np.fft.fftshift(np.fft.ifft(data * window, self.length, axis=-1) * scale, axes=-1)
+        # The DC point is extrapolated from the first two points in magnitude and unwrapped phase
+        # separately, since extrapolating the complex values cuts across the phase rotation between them.
+        magnitude = 2 * np.abs(data[..., :1]) - np.abs(data[..., 1:2])
+        phase = np.unwrap(np.angle(data[..., :2]), axis=-1)
+        dc = magnitude * np.cos(2 * phase[..., :1] - phase[..., 1:2])
+        spectrum = np.concatenate((dc, data), axis=-1) * window
+        impulse = np.fft.fftshift(np.fft.irfft(spectrum, self.length, axis=-1), axes=-1)
+        if self.mode == "LOWPASS_STEP":
+            return np.cumsum(impulse, axis=-1)
+        return impulse * scale
+
+    def gate(self, data:np.ndarray, start:float, stop:float, shape:str="norm", type:str="bpas") -> np.ndarray:
+        """Gates complex frequency-domain data in the time domain and returns the gated frequency
+        response, as calculate.filter.time does. The data is windowed and transformed, multiplied by
+        the gate and transformed back, and the window is divided out again. The gate is applied to
+        the bandpass response whatever the mode of the transform.
+
+        Args:
+            data (np.ndarray): (..., points) complex corrected data.
+            start (float): Gate start time in seconds; the gate center is (start + stop) / 2.
+            stop (float): Gate stop time in seconds.
+            shape (str, optional): MINimum, NORMal, WIDE or MAXimum. Defaults to "norm".
+            type (str, optional): BPASs to keep the response within the gate, NOTCh to remove it. Defaults to "bpas".
+
+        Returns:
+            np.ndarray: (..., points) gated complex data.
+        """
+        data = np.asarray(data)
+        points = data.shape[-1]
+        window, _ = _plan(points, self.length, "BANDPASS", self.beta)
+        gate = np.fft.ifftshift(gate_window(self.time, start, stop, shape, type))
+        response = np.fft.ifft(data * window, self.length, axis=-1) * gate
+        return np.fft.fft(response, axis=-1)[..., :points] / window
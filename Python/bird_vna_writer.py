@@ -0,0 +1,229 @@
+"""
+Example Description:
+        This module writes measurement results to a file from a background
+        thread, so that disk latency does not land in the sweep loop. Records
+        are handed over through a bounded queue and written in batches, with
+        the file flushed after every batch and synced to disk (fsync)
+        periodically. When the queue is full the measurement loop either
+        waits for the writer (backpressure) or, if chosen, the record is
+        dropped and counted:
+
+            with ResultWriter("loss_data.csv") as writer:
+                writer.write("M1_FREQ,M1_LOSS")
+                for sweep in bna1k.stream(count=8640):
+                    writer.write((sweep.timestamp, *sweep[1]))
+                print(writer.statistics())
+
+@verbatim
+
+
+The MIT License (MIT)
+
+Copyright (c) 2024 Bird
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+of the Software, and to permit persons to whom the Software is furnished to do
+so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@endverbatim
+
+@file bird_vna_writer.py
+
+"""
+import os
+import queue
+import threading
+import time
+
+# Queued in place of a record to make the writer thread finish.
+_CLOSE = object()
+
+
+def _format_record(record) -> bytes:
+    """Formats a record as one line of the output file.
+
+    Args:
+        record: A str written as is, bytes written as is, or a sequence of values (including a
+            NumPy array) written as comma-separated values.
+
+    Returns:
+        bytes: The line, terminated by a newline.
+    """
+    if isinstance(record, bytes):
+        line = record
+    elif isinstance(record, str):
+        line = record.encode("utf-8")
+    else:
+        line = ",".join(str(value) for value in record).encode("utf-8")
+    return line if line.endswith(b"\n") else line + b"\n"
+
+
+class ResultWriter():
+    """
+    Appends records to a file from a background thread. write() only queues
+    the record; close() writes everything still queued, syncs the file and
+    stops the thread.
+    """
+    def __init__(self, path:str, max_queue:int=1024, batch_size:int=256, flush_interval:float=0.5,
+                 fsync_interval:float=5.0, overflow:str="block", formatter=None, mode:str="a"):
+        """
+        Args:
+            path (str): The output file.
+            max_queue (int, optional): Records that can wait to be written. Defaults to 1024.
+            batch_size (int, optional): Largest number of records written in one file write. Defaults to 256.
+            flush_interval (float, optional): Seconds a record may wait for more records to share its
+                batch; a full batch is written at once. Defaults to 0.5.
+            fsync_interval (float, optional): Seconds between syncs of the file to disk; 0 syncs after
+                every batch. Defaults to 5.0.
+            overflow (str, optional): "block" to make write() wait while the queue is full, or "drop" to
+                discard the record and count it. Defaults to "block".
+            formatter (optional): Function turning a record into the bytes written. Defaults to one line
+                per record, with sequences written as comma-separated values.
+            mode (str, optional): "a" to append to the file or "w" to replace it. Defaults to "a".
+        """
+        overflow_dict = {'block': True,
+                         'drop': False,
+                         }
+        self.__block = overflow_dict[overflow]
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.__format = formatter or _format_record
+        self.__queue = queue.Queue(max_queue)
+        self.__batch_threshold = min(batch_size, max_queue) if max_queue > 0 else batch_size
+        self.__batch_ready = threading.Event()
+        self.__file = open(path, mode + "b")
+        self.__error = None
+        # Held while a record is queued and while the writer is closed, so that no record can be
+        # queued behind the close sentinel.
+        self.__state_lock = threading.Lock()
+        self.__closed = False
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self.__thread = threading.Thread(target=self.__run, name=f"vna-writer-{os.path.basename(path)}", daemon=True)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, record) -> bool:
+        """Queues a record for writing.
+
+        Args:
+            record: The record, see the formatter argument of ResultWriter.
+
+        Returns:
+            bool: True if the record was queued, False if it was dropped because the queue was full.
+        """
+        if self.__error is not None:
+            raise self.__error
+        with self.__state_lock:
+            if self.__closed:
+                raise ValueError(f"{self.path}: the writer is closed.")
+            try:
+                self.__queue.put(record, block=self.__block)
+            except queue.Full:
+                self.dropped += 1
+                self.__batch_ready.set()
+                return False
+            self.queued += 1
+        if self.__queue.qsize() >= self.__batch_threshold:
+            self.__batch_ready.set()
+        return True
+
+    def statistics(self) -> dict:
+        """Reports the progress of the writer.
+
+        Returns:
+            dict: Records queued, dropped, written and still pending, the bytes written, and the
+                number of batches and fsyncs.
+        """
+        return {"queued": self.queued,
+                "dropped": self.dropped,
+                "written": self.written,
+                "pending": self.__queue.qsize(),
+                "bytes": self.bytes,
+                "batches": self.batches,
+                "fsyncs": self.fsyncs,
+                }
+
+    def close(self):
+        """Writes the records still queued, syncs the file to disk and stops the writer thread.
+        write() raises ValueError once close() has begun."""
+        with self.__state_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__queue.put(_CLOSE)
+        self.__batch_ready.set()
+        self.__thread.join()
+        self.__file.close()
+        if self.__error is not None:
+            raise self.__error
+
+    def __run(self):
+        last_sync = time.monotonic()
+        unsynced = False
+        finished = False
+        while not finished:
+            try:
+                # While written data has not been synced, wake up in time to sync it even if no
+                # further records arrive.
+                timeout = max(last_sync + self.fsync_interval - time.monotonic(), 0.0) if unsynced else None
+                batch = [self.__queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            if batch and batch[0] is not _CLOSE and not self.__closed:
+                # Let a batch build up instead of waking for every record.
+                self.__batch_ready.wait(self.flush_interval)
+            self.__batch_ready.clear()
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch and batch[-1] is _CLOSE:
+                batch.pop()
+                finished = True
+            if self.__error is not None:
+                continue
+            try:
+                data = b"".join(self.__format(record) for record in batch)
+                if data:
+                    self.__file.write(data)
+                    self.__file.flush()
+                    self.written += len(batch)
+                    self.bytes += len(data)
+                    self.batches += 1
+                    unsynced = True
+                if unsynced and (finished or time.monotonic() - last_sync >= self.fsync_interval):
+                    os.fsync(self.__file.fileno())
+                    self.fsyncs += 1
+                    last_sync = time.monotonic()
+                    unsynced = False
+            except Exception as error:
+                # Reported to the measurement thread by the next write() or by close().
+                self.__error = error
@@ -41,6 +41,7 @@ SOFTWARE.
  
 """
 from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer
+from bird_vna_limits import LimitTable
 from time import sleep
 
 bna1k = BirdVectorNetworkAnalyzer()
@@ -100,10 +101,9 @@ bna1k.calculate.marker.function.seachexecute()
 print(bna1k.calculate.marker.x)
 val1, val2 = bna1k.calculate.marker.y()
 
-# clear existing limit lines
-bna1k.calculate.limit.clearlines()
-# add a limit line
-bna1k.calculate.limit.addline(1, 'maximum', 428e6, 438e6, -17.0, -17.0)
+# load the limit line, sending it only if the analyzer does not already hold this table
+limits = LimitTable([('maximum', 428e6, 438e6, -17.0, -17.0)])
+bna1k.calculate.limit.sync(limits)
 # enable the limit test
 bna1k.calculate.limit.teststate = 1
 # enable the limit line
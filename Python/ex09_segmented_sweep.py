@@ -43,14 +43,10 @@ SOFTWARE.
  
 """
 from bird_vector_network_analyzer import BirdVectorNetworkAnalyzer
+from bird_vna_scheduler import SweepScheduler
+from bird_vna_writer import ResultWriter
 import time
 
-def write_data_to_file(file_and_path, write_string):
-    ofile = open(output_data_path, "a")  # Open/create the target data
-    ofile.write(write_string)
-    ofile.close()                       # Close the data file.
-    return
-
 bna1k = BirdVectorNetworkAnalyzer()
 
 # Connect to the instrument and clear out any error conditions
@@ -122,37 +118,35 @@ bna1k.marker = 4
 bna1k.calculate.marker.state = 1
 bna1k.calculate.marker.x = 2.4e9
 
-# Create a file to save data to
+# Create a file to save data to. Rows are written by a background thread so that
+# disk latency does not delay the sweeps.
 output_data_path = time.strftime("loss_data_%Y-%m-%d_%H-%M-%S.csv")
+writer = ResultWriter(output_data_path)
 
 # Write the header info to file
-write_data_to_file(output_data_path, "M1_FREQ,M1_LOSS,M2_FREQ,M2_LOSS,M3_FREQ,M3_LOSS,M4_FREQ,M4_LOSS,")
+writer.write("M1_FREQ,M1_LOSS,M2_FREQ,M2_LOSS,M3_FREQ,M3_LOSS,M4_FREQ,M4_LOSS")
 
-# Trigger a sweep every 10 s, capturing data from all four markers and log to file for 24 hr
-t1 = time.time()
-for j in range(8640):
+# Trigger a sweep every 10 s, capturing data from all four markers and log to file for 24 hr.
+# The scheduler sleeps until each deadline and keeps the 10 s period on the monotonic clock.
+def log_markers(vna):
         # Trigger the sweep
-        bna1k.trigger.immediate()
-        bna1k.opc_query()
-        
-        # Collect measurements from all markers
-        readings_string = ""
-        for k in range(1, 5):
-                bna1k.marker = k
-                val1 = ""
-                val2 = ""
-                val1, val2 = bna1k.calculate.marker.y()
-                readings_string += f"{val1},{val2},"
-
-        # Write to file
-        write_data_to_file(output_data_path, readings_string)
+        vna.trigger.immediate()
+        vna.opc_query()
         
-        flag_j = 0
-        while flag_j == 0:
-                t2 = time.time()
-                if (t2-t1 >= 10.0):
-                       flag_j = 1
-        t2 = t1
+        # Collect measurements from all markers in one query
+        markers = vna.calculate.marker.readout(traces=(1,), markers=(1, 2, 3, 4))
+        readings = [value for marker in markers for value in (marker['y1'], marker['y2'])]
+
+        # Queue the row for the file
+        writer.write(readings)
+
+scheduler = SweepScheduler()
+scheduler.add(log_markers, period=10.0, instrument=bna1k, count=8640)
+scheduler.run()
+print(scheduler.statistics())
+
+writer.close()
+print(writer.statistics())
 
 bna1k.close()
 
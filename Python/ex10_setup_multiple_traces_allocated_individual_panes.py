@@ -98,11 +98,15 @@ for freq in mkr_freqs:
     bna1k.marker += 1
     st = bna1k.opc_query()
 
-for trace in range(1, 5):
-    bna1k.trace = trace
-    for j in range(1, 13):
-        bna1k.marker = j
-        val1, val2 = bna1k.calculate.marker.y()
-        print(f"Trace{bna1k.trace}, Marker{bna1k.marker}: {val1}, {val2}")
+# Read all 48 marker values in one compound query rather than one round trip each
+readings = bna1k.calculate.marker.readout(traces=(1, 2, 3, 4), markers=range(1, 13))
+for reading in readings:
+    print(f"Trace{reading['trace']}, Marker{reading['marker']}: {reading['y1']}, {reading['y2']}")
+
+# Read out the corrected data of all four traces in a single transfer,
+# giving one row per trace and one column per measurement point.
+bna1k.format.data = 'real64'
+smatrix = bna1k.calculate.data.corrected_data_traces((1, 2, 3, 4))
+print(smatrix.shape)
 
 bna1k.close()